@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Request classifier benchmark
+
+Compares the original classify_request_type (keyword tables rebuilt and one
+regex search per keyword on every call) with the precompiled single-pass
+classifier, both called directly and through /classify-request and
+POST /request (add_request).
+
+Usage (from the backend directory):
+    python benchmarks/bench_classifier.py [calls]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.main.utils as utils
+from src.main.app import create_app
+from src.test.test_classifier import SAMPLE_DESCRIPTIONS, reference_classify_request_type
+
+DESCRIPTIONS = [d for d in SAMPLE_DESCRIPTIONS if d]
+
+def time_calls(function, calls):
+    """Best-of-5 seconds per call of function over the sample descriptions."""
+    def run():
+        for i in range(calls):
+            function(DESCRIPTIONS[i % len(DESCRIPTIONS)])
+    return min(timeit.repeat(run, number=1, repeat=5)) / calls
+
+def endpoint_caller(client, path, key):
+    def call(description):
+        response = client.post(f'/api/seniorsmartassist{path}', data=json.dumps({key: description}),
+                               content_type='application/json')
+        assert response.status_code in (200, 201)
+    return call
+
+def main(calls):
+    app, _ = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'GEOCODING_ENABLED': False
+    })
+    compiled_classify = utils.classify_request_type
+    with app.app_context():
+        client = app.test_client()
+        targets = [
+            ('classify_request_type()', lambda: (lambda d: utils.classify_request_type(d))),
+            ('POST /classify-request', lambda: endpoint_caller(client, '/classify-request', 'description')),
+            ('POST /request', lambda: endpoint_caller(client, '/request', 'description')),
+        ]
+        for label, make_caller in targets:
+            # Routes import classify_request_type from utils on each call, so swapping it swaps the engine
+            utils.classify_request_type = reference_classify_request_type
+            original = time_calls(make_caller(), calls)
+            utils.classify_request_type = compiled_classify
+            compiled = time_calls(make_caller(), calls)
+            print(f"{label:<26} original {original * 1e6:8.1f} us/call | "
+                  f"compiled {compiled * 1e6:8.1f} us/call | speedup {original / compiled:5.1f}x")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
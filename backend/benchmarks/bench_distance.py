@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Distance filtering benchmark
+
+Compares the per-request geodesic() loop the volunteer feed used to run with
+the vectorized haversine pass in utils.distances_within_radius.
+
+Usage (from the backend directory):
+    python benchmarks/bench_distance.py [count ...]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from geopy.distance import geodesic
+from src.main.utils import distances_within_radius
+
+ORIGIN = (37.7749, -122.4194)  # San Francisco
+
+def loop_filter(points):
+    """Original approach: one geodesic() call per request."""
+    result = []
+    for latitude, longitude in points:
+        miles = round(geodesic((latitude, longitude), ORIGIN).kilometers * 0.621371, 2)
+        if miles <= 100:
+            result.append(miles)
+    return result
+
+def main(counts):
+    rng = np.random.default_rng(42)
+    for count in counts:
+        latitudes = rng.uniform(32, 42, count)
+        longitudes = rng.uniform(-124, -114, count)
+
+        runs = 20
+        vectorized = min(timeit.repeat(
+            lambda: distances_within_radius(latitudes, longitudes, *ORIGIN, 100),
+            number=1, repeat=runs))
+
+        loop_count = min(count, 10_000)  # geodesic() is too slow to run on everything
+        points = list(zip(latitudes[:loop_count].tolist(), longitudes[:loop_count].tolist()))
+        loop = min(timeit.repeat(lambda: loop_filter(points), number=1, repeat=3)) * count / loop_count
+
+        print(f"{count:>9,} requests: vectorized {vectorized * 1000:8.2f} ms | "
+              f"geodesic loop {loop * 1000:10.1f} ms (extrapolated from {loop_count:,}) | "
+              f"speedup {loop / vectorized:,.0f}x")
+
+if __name__ == '__main__':
+    main([int(c) for c in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Volunteer scoring benchmark
+
+Compares the per-volunteer score_volunteer() loop with VolunteerFeatures,
+which scores every volunteer for a request in a few NumPy array operations.
+As in matching.candidate_features, the arrays are built once for every
+volunteer, and each request selects its candidates' rows, refreshes their
+availability and workload and ranks the top 10. Reports the one-off build
+separately, and the speedup both per request and including one build.
+
+Usage (from the backend directory):
+    python benchmarks/bench_scoring.py [count ...]
+"""
+import heapq
+import os
+import random
+import sys
+import timeit
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main.utils import MIN_MATCH_SCORE, VolunteerFeatures, address_fingerprint, score_volunteer
+
+STREETS = ['Main St', 'Oak Ave', 'Pine St', 'Market Street', 'Mission St', 'Elm Rd', 'Lake Dr', 'Park Blvd']
+CITIES = ['San Francisco, CA', 'Oakland, CA', 'San Jose, CA', 'Los Angeles, CA', 'Seattle, WA', 'Austin, TX']
+SKILLS = ['shopping', 'groceries', 'errands', 'driving', 'medical', 'nursing', 'plumbing', 'repair',
+          'technology', 'computer', 'companionship', 'cooking', 'gardening', 'moving', 'tutoring']
+REQUEST_ADDRESS = '100 Main St, San Francisco, CA'
+REQUEST_TYPE = 'Groceries'
+REQUEST_FINGERPRINT = address_fingerprint(REQUEST_ADDRESS)
+
+def make_volunteers(count, rng):
+    """Volunteer stand-ins with the attributes the scorers read (ORM objects would dominate the memory)."""
+    addresses = [f'{rng.randint(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}' for _ in range(count)]
+    return [SimpleNamespace(
+        address=address,
+        address_fingerprint=address_fingerprint(address),
+        skill_set=[SimpleNamespace(name=name) for name in rng.sample(SKILLS, rng.randint(0, 3))],
+        availability=rng.choice(['available', 'available', 'busy', 'unavailable']),
+        active_request_count=rng.randint(0, 4)
+    ) for address in addresses]
+
+def loop_rank(volunteers, k=10):
+    """Original approach: score_volunteer() per volunteer, then keep the k best."""
+    scored = ((index,) + score_volunteer(REQUEST_ADDRESS, REQUEST_TYPE, volunteer, REQUEST_FINGERPRINT)
+              for index, volunteer in enumerate(volunteers))
+    best = heapq.nlargest(k, scored, key=lambda match: match[1])
+    return [match for match in best if match[1] > MIN_MATCH_SCORE]
+
+def main(counts):
+    rng = random.Random(42)
+    for count in counts:
+        volunteers = make_volunteers(count, rng)
+        # Each request's candidates: a different half of all volunteers, as the SQL filters would pick
+        rows = sorted(rng.sample(range(count), count // 2))
+        candidates = [volunteers[row] for row in rows]
+        
+        build = min(timeit.repeat(lambda: VolunteerFeatures.from_volunteers(volunteers), number=1, repeat=3))
+        features = VolunteerFeatures.from_volunteers(volunteers)
+        
+        def vectorized_rank():
+            return features.select(rows).with_status(candidates).rank(REQUEST_ADDRESS, REQUEST_TYPE, 10,
+                                                                       REQUEST_FINGERPRINT)
+        vectorized_rank()  # Scores the skill vocabulary once
+        vectorized = min(timeit.repeat(vectorized_rank, number=1, repeat=5))
+        
+        loop_count = min(len(candidates), 100_000)  # The loop is too slow to run on everything
+        sample = candidates[:loop_count]
+        loop = min(timeit.repeat(lambda: loop_rank(sample), number=1, repeat=3)) * len(candidates) / loop_count
+        if loop_count == len(candidates):
+            assert vectorized_rank() == loop_rank(candidates)
+        
+        print(f"{count:>9,} volunteers ({len(candidates):,} candidates): build features {build * 1000:8.1f} ms | "
+              f"select + rank {vectorized * 1000:7.1f} ms | "
+              f"score_volunteer loop {loop * 1000:9.1f} ms"
+              f"{'' if loop_count == len(candidates) else f' (extrapolated from {loop_count:,})'} | "
+              f"speedup {loop / vectorized:,.1f}x per request, {loop / (build + vectorized):.1f}x with build")
+
+if __name__ == '__main__':
+    main([int(c) for c in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+HTTP server throughput benchmark
+
+Starts the backend with the development server (python run.py) and with the
+production entry point (gunicorn -c gunicorn.conf.py wsgi:app), each on a
+scratch SQLite database, and measures requests per second and latency under
+concurrent keep-alive clients.
+
+Usage (from the backend directory):
+    python benchmarks/bench_server.py [--clients 50] [--seconds 10] [--path /api/seniorsmartassist/health]
+    WEB_CONCURRENCY=4 python benchmarks/bench_server.py --servers gunicorn
+"""
+import argparse
+import http.client
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'dev': [sys.executable, 'run.py'],
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+}
+
+def start_server(name, port, database_dir):
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', GEOCODING_ENABLED='false',
+               DATABASE_URL=f"sqlite:///{os.path.join(database_dir, f'{name}.db')}",
+               GUNICORN_LOG_LEVEL='warning')
+    env.pop('FLASK_ENV', None)  # No debug reloader
+    subprocess.run([sys.executable, 'migrate_db.py'], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    process = subprocess.Popen(SERVERS[name], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/seniorsmartassist/health')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{name} server did not start on port {port}')
+
+def load(port, path, clients, seconds):
+    """Run clients keep-alive loops for seconds; return (requests, errors, sorted latencies)."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+    
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        mine = []
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise OSError(response.status)
+                mine.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        with lock:
+            latencies.extend(mine)
+    
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), errors[0], sorted(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=['dev', 'gunicorn'])
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--path', default='/api/seniorsmartassist/health')
+    parser.add_argument('--port', type=int, default=5057)
+    args = parser.parse_args()
+    
+    database_dir = tempfile.mkdtemp()
+    try:
+        for name in args.servers:
+            process = start_server(name, args.port, database_dir)
+            try:
+                load(args.port, args.path, args.clients, 1)  # Warm up
+                count, errors, latencies = load(args.port, args.path, args.clients, args.seconds)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            if not latencies:
+                print(f"{name:<9} no successful requests ({errors} errors)")
+                continue
+            print(f"{name:<9} {count / args.seconds:8.0f} req/s | "
+                  f"p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms | "
+                  f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms | "
+                  f"errors {errors} ({args.clients} clients, {args.path})")
+    finally:
+        shutil.rmtree(database_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Gunicorn settings for serving SeniorSmartAssist in production
+
+Usage (from the backend directory):
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment:
+    PORT / HOST                    Address to listen on (default 0.0.0.0:5000)
+    WEB_CONCURRENCY                Worker processes (default 1; see below)
+    GUNICORN_WORKER_CLASS          eventlet (default) or gevent; both serve WebSockets
+    GUNICORN_WORKER_CONNECTIONS    Green threads, i.e. concurrent connections, per worker (default 1000)
+    GUNICORN_KEEPALIVE             Seconds to keep idle HTTP connections open (default 5)
+    GUNICORN_TIMEOUT               Seconds a silent worker may block before it is restarted (default 60)
+    GUNICORN_GRACEFUL_TIMEOUT      Seconds workers get to finish requests on shutdown/restart (default 30)
+
+Socket.IO rooms live in the worker a client is connected to, so more than one
+worker needs SOCKETIO_MESSAGE_QUEUE, and clients that fall back to HTTP
+long-polling need every request to reach the same worker (sticky sessions),
+which Gunicorn cannot do. Scale out with one worker per container behind a
+sticky load balancer, or with several workers when clients use WebSockets only.
+"""
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'eventlet')
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+# The green worker monkey-patches the standard library when it starts; loading the
+# app before that (preload_app) would leave its sockets and locks unpatched
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    if workers > 1 and not os.getenv('SOCKETIO_MESSAGE_QUEUE'):
+        server.log.warning('WEB_CONCURRENCY=%s without SOCKETIO_MESSAGE_QUEUE: Socket.IO emits '
+                           'only reach clients of the worker that sends them', workers)
+
+
+def post_worker_init(worker):
+    # psycopg2 blocks the whole worker while it waits on PostgreSQL unless it yields to the hub
+    if worker_class == 'eventlet':
+        try:
+            from eventlet.support import psycopg2_patcher
+            psycopg2_patcher.make_psycopg_green()
+        except ImportError:
+            pass
@@ -1,139 +1,75 @@
 #!/usr/bin/env python3
 """
 Database Migration Script
-Adds missing columns to existing database tables
+Upgrades the database (SQLite or PostgreSQL, from DATABASE_URL) to the latest schema
+using the versioned migrations in migrations/versions.
+
+Usage:
+    python migrate_db.py                  # Upgrade to the latest revision
+    python migrate_db.py upgrade 0002     # Upgrade to a specific revision
+    python migrate_db.py downgrade 0001   # Step back to an earlier revision
+    python migrate_db.py current          # Show the database's revision
+    python migrate_db.py revision -m "Add foo" --autogenerate
+    python migrate_db.py backfill         # Geocode rows stored without coordinates
 """
+import argparse
 import sys
 import os
-import sqlite3
 
-def migrate_database():
-    """Add missing columns to the database."""
-    # Find the database file
-    db_path = None
-    
-    # Check common locations
-    possible_paths = [
-        'seniorsmartassist.db',
-        'instance/seniorsmartassist.db',
-        'instance/seniorsmartassist_dev.db',
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            db_path = path
-            break
-    
-    if not db_path:
-        # Try to find it (also check old name for migration)
-        for root, dirs, files in os.walk('.'):
-            for file in files:
-                if file.endswith('.db') and ('seniorsmartassist' in file or 'elderassist' in file):
-                    db_path = os.path.join(root, file)
-                    break
-            if db_path:
-                break
-    
-    if not db_path:
-        print("❌ Database file not found.")
-        print("The database will be created automatically when you start the server.")
-        return
-    
-    print(f"📊 Found database at: {db_path}")
-    print("🔄 Migrating database...")
-    
-    # Connect to SQLite database directly
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    try:
-        # Check if gender column exists
-        cursor.execute("PRAGMA table_info(volunteer)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'gender' not in columns:
-            print("  ✓ Adding 'gender' column to volunteer table...")
-            cursor.execute("ALTER TABLE volunteer ADD COLUMN gender VARCHAR(20)")
-            conn.commit()
-        else:
-            print("  ✓ 'gender' column already exists")
-        
-        if 'has_car' not in columns:
-            print("  ✓ Adding 'has_car' column to volunteer table...")
-            cursor.execute("ALTER TABLE volunteer ADD COLUMN has_car BOOLEAN DEFAULT 0")
-            conn.commit()
-        else:
-            print("  ✓ 'has_car' column already exists")
-        
-        # Check if chat_message table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chat_message'")
-        if not cursor.fetchone():
-            print("  ✓ Creating 'chat_message' table...")
-            cursor.execute("""
-                CREATE TABLE chat_message (
-                    id INTEGER NOT NULL PRIMARY KEY,
-                    request_id INTEGER NOT NULL,
-                    sender_id INTEGER NOT NULL,
-                    sender_type VARCHAR(20) NOT NULL,
-                    message VARCHAR(1000) NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(request_id) REFERENCES help_request (id)
-                )
-            """)
-            conn.commit()
-        else:
-            print("  ✓ 'chat_message' table already exists")
-        
-        # Check help_request table for rating columns
-        cursor.execute("PRAGMA table_info(help_request)")
-        help_request_columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'rating' not in help_request_columns:
-            print("  ✓ Adding 'rating' column to help_request table...")
-            cursor.execute("ALTER TABLE help_request ADD COLUMN rating INTEGER")
-            conn.commit()
-        else:
-            print("  ✓ 'rating' column already exists in help_request table")
-        
-        if 'rating_comment' not in help_request_columns:
-            print("  ✓ Adding 'rating_comment' column to help_request table...")
-            cursor.execute("ALTER TABLE help_request ADD COLUMN rating_comment VARCHAR(500)")
-            conn.commit()
-        else:
-            print("  ✓ 'rating_comment' column already exists in help_request table")
-        
-        # Check if reward table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='reward'")
-        if not cursor.fetchone():
-            print("  ✓ Creating 'reward' table...")
-            cursor.execute("""
-                CREATE TABLE reward (
-                    id INTEGER NOT NULL PRIMARY KEY,
-                    request_id INTEGER NOT NULL,
-                    volunteer_id INTEGER NOT NULL,
-                    amount FLOAT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(request_id) REFERENCES help_request (id),
-                    FOREIGN KEY(volunteer_id) REFERENCES volunteer (id)
-                )
-            """)
-            conn.commit()
-        else:
-            print("  ✓ 'reward' table already exists")
-        
-        conn.close()
-        print("\n✅ Database migration completed successfully!")
-        print("You can now start the server with: python run.py")
-        
-    except Exception as e:
-        conn.rollback()
-        conn.close()
-        print(f"\n❌ Error during migration: {e}")
-        print("\n💡 Alternative solution:")
-        print(f"   1. Backup your data (if needed)")
-        print(f"   2. Delete the database file: {db_path}")
-        print(f"   3. Restart the server - it will create a new database with all tables")
-        sys.exit(1)
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, backend_dir)
+
+def load_app():
+    """Create the Flask app against DATABASE_URL without starting background work."""
+    from src.main.app import create_app
+    app, _ = create_app()
+    worker = app.extensions.get('geocoding_worker')
+    if worker:
+        worker.start_thread = False  # backfill_coordinates() drains the queue itself
+    return app
+
+def backfill_geocodes():
+    """Store coordinates for rows created before they were geocoded at write time."""
+    from src.main.geocoding import backfill_coordinates, backfill_geo_cells
+    print("  ✓ Geocoding existing addresses (this may take a while)...")
+    print(f"  ✓ Stored coordinates for {backfill_coordinates()} rows")
+    print(f"  ✓ Indexed {backfill_geo_cells()} requests by grid cell")
+
+def migrate_database(argv=None):
+    """Run a migration command against the configured database."""
+    parser = argparse.ArgumentParser(description='Manage the SeniorSmartAssist database schema.')
+    subparsers = parser.add_subparsers(dest='command')
+    upgrade_parser = subparsers.add_parser('upgrade', help='Upgrade to a later revision (default: head)')
+    upgrade_parser.add_argument('revision', nargs='?', default='head')
+    downgrade_parser = subparsers.add_parser('downgrade', help='Revert to an earlier revision')
+    downgrade_parser.add_argument('revision')
+    subparsers.add_parser('current', help="Show the database's current revision")
+    revision_parser = subparsers.add_parser('revision', help='Create a new revision file')
+    revision_parser.add_argument('-m', '--message', required=True)
+    revision_parser.add_argument('--autogenerate', action='store_true')
+    subparsers.add_parser('backfill', help='Geocode rows stored without coordinates')
+    args = parser.parse_args(argv)
+
+    import flask_migrate
+    from src.main.models import db
+    app = load_app()
+
+    with app.app_context():
+        print(f"📊 Database: {db.engine.url.render_as_string(hide_password=True)}")
+        command = args.command or 'upgrade'
+        if command == 'upgrade':
+            print("🔄 Migrating database...")
+            flask_migrate.upgrade(revision=getattr(args, 'revision', 'head'))
+            print("\n✅ Database migration completed successfully!")
+        elif command == 'downgrade':
+            flask_migrate.downgrade(revision=args.revision)
+        elif command == 'current':
+            flask_migrate.current()
+        elif command == 'revision':
+            flask_migrate.revision(message=args.message, autogenerate=args.autogenerate)
+        elif command == 'backfill':
+            backfill_geocodes()
 
 if __name__ == '__main__':
     migrate_database()
@@ -0,0 +1,125 @@
+"""Baseline schema
+
+Brings any database created by db.create_all() or the old migrate_db.py script up
+to the schema of the first versioned release: missing tables are created and
+missing columns added, existing data is left untouched.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+import sqlalchemy as sa
+from src.main.schema import create_or_update_table
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_or_update_table(
+        'elder',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('address', sa.String(length=200), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('age', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    create_or_update_table(
+        'volunteer',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('address', sa.String(length=200), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('skills', sa.String(length=500), nullable=True),
+        sa.Column('gender', sa.String(length=20), nullable=True),
+        sa.Column('has_car', sa.Boolean(), server_default=sa.false(), nullable=True),
+        sa.Column('availability', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    create_or_update_table(
+        'help_request',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('elder_id', sa.Integer(), nullable=True),
+        sa.Column('volunteer_id', sa.Integer(), nullable=True),
+        sa.Column('request_type', sa.String(length=50), nullable=True),
+        sa.Column('description', sa.String(length=500), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('address', sa.String(length=200), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('geo_cell', sa.String(length=20), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('assigned_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('rating', sa.Integer(), nullable=True),
+        sa.Column('rating_comment', sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(['elder_id'], ['elder.id']),
+        sa.ForeignKeyConstraint(['volunteer_id'], ['volunteer.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    create_or_update_table(
+        'contribution',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('contributor_name', sa.String(length=100), nullable=False),
+        sa.Column('contributor_email', sa.String(length=120), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('volunteer_id', sa.Integer(), nullable=True),
+        sa.Column('message', sa.String(length=500), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['volunteer_id'], ['volunteer.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    create_or_update_table(
+        'chat_message',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('request_id', sa.Integer(), nullable=False),
+        sa.Column('sender_id', sa.Integer(), nullable=False),
+        sa.Column('sender_type', sa.String(length=20), nullable=False),
+        sa.Column('message', sa.String(length=1000), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['request_id'], ['help_request.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    create_or_update_table(
+        'reward',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('request_id', sa.Integer(), nullable=False),
+        sa.Column('volunteer_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['request_id'], ['help_request.id']),
+        sa.ForeignKeyConstraint(['volunteer_id'], ['volunteer.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    create_or_update_table(
+        'geocode_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('address_key', sa.String(length=255), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('address_key')
+    )
+
+
+def downgrade():
+    # Intentionally a no-op: the baseline adopts tables that may predate versioning, so
+    # downgrading to base only removes the revision stamp and never drops tables or data
+    pass
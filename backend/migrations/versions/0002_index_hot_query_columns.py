@@ -0,0 +1,40 @@
+"""Index hot query columns
+
+Indexes are built online (CREATE INDEX CONCURRENTLY on PostgreSQL) so deploying
+this revision does not block writes to the tables being indexed.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:05:00.000000
+
+"""
+from src.main.schema import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_help_request_status_geo_cell', 'help_request', ['status', 'geo_cell']),
+    ('ix_help_request_status_timestamp', 'help_request', ['status', 'timestamp']),
+    ('ix_help_request_timestamp', 'help_request', ['timestamp']),
+    ('ix_help_request_elder_id', 'help_request', ['elder_id']),
+    ('ix_help_request_volunteer_status', 'help_request', ['volunteer_id', 'status']),
+    ('ix_contribution_volunteer_timestamp', 'contribution', ['volunteer_id', 'timestamp']),
+    ('ix_chat_message_request_timestamp', 'chat_message', ['request_id', 'timestamp']),
+    ('ix_reward_request_id', 'reward', ['request_id']),
+    ('ix_reward_volunteer_id', 'reward', ['volunteer_id']),
+]
+
+
+def upgrade():
+    for index_name, table_name, columns in INDEXES:
+        create_index_online(index_name, table_name, columns)
+
+
+def downgrade():
+    for index_name, table_name, _ in reversed(INDEXES):
+        drop_index_online(index_name, table_name)
@@ -0,0 +1,43 @@
+"""Donation ledger
+
+Adds the running-balance row for the general donation pool, seeded with SQL SUM()
+over the existing contributions and rewards.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from src.main.schema import create_or_update_table
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_or_update_table(
+        'donation_ledger',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('total_donations', sa.Float(), nullable=False),
+        sa.Column('total_rewards', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("""
+        INSERT INTO donation_ledger (id, total_donations, total_rewards, updated_at)
+        SELECT 1,
+               (SELECT COALESCE(SUM(amount), 0) FROM contribution WHERE volunteer_id IS NULL),
+               (SELECT COALESCE(SUM(amount), 0) FROM reward),
+               CURRENT_TIMESTAMP
+        WHERE NOT EXISTS (SELECT 1 FROM donation_ledger WHERE id = 1)
+    """)
+
+
+def downgrade():
+    op.drop_table('donation_ledger')
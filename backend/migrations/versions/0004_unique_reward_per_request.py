@@ -0,0 +1,33 @@
+"""Unique reward per request
+
+Replaces the plain index on reward.request_id with a unique one so a request can
+never be rewarded twice. Duplicates left by earlier concurrent completions are
+removed first (keeping the earliest reward) and the ledger's reward total is
+recomputed to match.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+from src.main.schema import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DELETE FROM reward WHERE id NOT IN (SELECT MIN(id) FROM reward GROUP BY request_id)")
+    op.execute("UPDATE donation_ledger SET total_rewards = (SELECT COALESCE(SUM(amount), 0) FROM reward) WHERE id = 1")
+    create_index_online('uq_reward_request_id', 'reward', ['request_id'], unique=True)
+    drop_index_online('ix_reward_request_id', 'reward')
+
+
+def downgrade():
+    create_index_online('ix_reward_request_id', 'reward', ['request_id'])
+    drop_index_online('uq_reward_request_id', 'reward')
@@ -0,0 +1,68 @@
+"""Persist request priority
+
+Adds help_request.priority, backfills it from each description with the same
+calculate_request_priority() the app uses, and indexes it with status for the
+request feed.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from src.main.classifier import calculate_request_priority
+from src.main.schema import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+help_request = sa.table(
+    'help_request',
+    sa.column('id', sa.Integer),
+    sa.column('description', sa.String),
+    sa.column('priority', sa.String),
+)
+
+
+def backfill_priorities():
+    """Calculate priority for every request that has none, in batches."""
+    connection = op.get_bind()
+    update = (help_request.update()
+              .where(help_request.c.id == sa.bindparam('request_id'))
+              .values(priority=sa.bindparam('new_priority')))
+    last_id = 0
+    while True:
+        # Keyset pages: only one batch of descriptions is held in memory at a time
+        rows = connection.execute(
+            sa.select(help_request.c.id, help_request.c.description)
+            .where(help_request.c.priority.is_(None), help_request.c.id > last_id)
+            .order_by(help_request.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(update, [
+            {'request_id': row.id, 'new_priority': calculate_request_priority(row.description)}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade():
+    op.add_column('help_request', sa.Column('priority', sa.String(length=10), nullable=True))
+    if not context.is_offline_mode():  # Offline SQL scripts are generated for an empty database
+        backfill_priorities()
+    create_index_online('ix_help_request_status_priority', 'help_request', ['status', 'priority'])
+
+
+def downgrade():
+    drop_index_online('ix_help_request_status_priority', 'help_request')
+    with op.batch_alter_table('help_request') as batch_op:
+        batch_op.drop_column('priority')
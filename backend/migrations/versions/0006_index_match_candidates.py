@@ -0,0 +1,26 @@
+"""Index match candidates
+
+Indexes volunteers by (availability, latitude) so smart matching can read the
+available volunteers inside a bounding box without scanning the table.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from src.main.schema import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index_online('ix_volunteer_availability_latitude', 'volunteer', ['availability', 'latitude'])
+
+
+def downgrade():
+    drop_index_online('ix_volunteer_availability_latitude', 'volunteer')
@@ -0,0 +1,36 @@
+"""Volunteer active request count
+
+Adds volunteer.active_request_count, the number of pending, assigned and
+in-progress requests assigned to each volunteer, seeded with SQL COUNT() over
+the existing requests. The app keeps it up to date from then on.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('volunteer', sa.Column('active_request_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute("""
+        UPDATE volunteer SET active_request_count = (
+            SELECT COUNT(*) FROM help_request
+            WHERE help_request.volunteer_id = volunteer.id
+              AND help_request.status IN ('pending', 'assigned', 'in_progress')
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('volunteer') as batch_op:
+        batch_op.drop_column('active_request_count')
@@ -0,0 +1,68 @@
+"""Skill taxonomy
+
+Normalizes volunteer.skills into a skill table and a volunteer_skill
+association (indexed by skill), filled by parsing every volunteer's skills text
+the same way the app does. volunteer.skills stays the editable source.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from src.main.utils import parse_skills
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def backfill_volunteer_skills():
+    """Create a skill row per distinct skill name and link every volunteer to theirs."""
+    connection = op.get_bind()
+    volunteer_skills = {
+        volunteer_id: set(parse_skills(skills))
+        for volunteer_id, skills in connection.execute(sa.text("SELECT id, skills FROM volunteer"))
+    }
+    names = sorted(set().union(*volunteer_skills.values()))
+    if not names:
+        return
+    skill = sa.table('skill', sa.column('id', sa.Integer), sa.column('name', sa.String))
+    connection.execute(skill.insert(), [{'name': name} for name in names])
+    skill_ids = dict(connection.execute(sa.select(skill.c.name, skill.c.id)).all())
+    link = sa.table('volunteer_skill', sa.column('volunteer_id', sa.Integer), sa.column('skill_id', sa.Integer))
+    rows = [{'volunteer_id': volunteer_id, 'skill_id': skill_ids[name]}
+            for volunteer_id, skills in volunteer_skills.items() for name in skills]
+    if rows:
+        connection.execute(link.insert(), rows)
+
+
+def upgrade():
+    op.create_table(
+        'skill',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=500), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_table(
+        'volunteer_skill',
+        sa.Column('volunteer_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['skill_id'], ['skill.id']),
+        sa.ForeignKeyConstraint(['volunteer_id'], ['volunteer.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('volunteer_id', 'skill_id')
+    )
+    op.create_index('ix_volunteer_skill_skill_id', 'volunteer_skill', ['skill_id'])
+    if not context.is_offline_mode():  # Offline SQL scripts are generated for an empty database
+        backfill_volunteer_skills()
+
+
+def downgrade():
+    op.drop_index('ix_volunteer_skill_skill_id', table_name='volunteer_skill')
+    op.drop_table('volunteer_skill')
+    op.drop_table('skill')
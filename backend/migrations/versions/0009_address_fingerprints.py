@@ -0,0 +1,81 @@
+"""Address fingerprints
+
+Adds address_fingerprint (the normalized words of the address) to elder,
+volunteer and help_request, plus indexed address_city/address_state keys on
+volunteer, and backfills them with the same address_fingerprint() the app uses.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from src.main.schema import create_index_online, drop_index_online
+from src.main.utils import address_area_keys, address_fingerprint
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+TABLES = ('elder', 'volunteer', 'help_request')
+
+
+def backfill_fingerprints(table_name):
+    """Fingerprint every address in a table, in batches."""
+    keyed = table_name == 'volunteer'
+    columns = [sa.column('id', sa.Integer), sa.column('address', sa.String), sa.column('address_fingerprint', sa.Text)]
+    values = {'address_fingerprint': sa.bindparam('fingerprint')}
+    if keyed:
+        columns += [sa.column('address_city', sa.Text), sa.column('address_state', sa.Text)]
+        values.update(address_city=sa.bindparam('city'), address_state=sa.bindparam('state'))
+    table = sa.table(table_name, *columns)
+    connection = op.get_bind()
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values(**values)
+    last_id = 0
+    while True:
+        # Keyset pages: only one batch of addresses is held in memory at a time
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.address)
+            .where(table.c.address.isnot(None), table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            fingerprint = address_fingerprint(row.address)
+            params.append({'row_id': row.id, 'fingerprint': fingerprint})
+            if keyed:
+                params[-1]['city'], params[-1]['state'] = address_area_keys(fingerprint)
+        connection.execute(update, params)
+        last_id = rows[-1].id
+
+
+def upgrade():
+    for table_name in TABLES:
+        op.add_column(table_name, sa.Column('address_fingerprint', sa.Text(), nullable=True))
+    op.add_column('volunteer', sa.Column('address_city', sa.Text(), nullable=True))
+    op.add_column('volunteer', sa.Column('address_state', sa.Text(), nullable=True))
+    if not context.is_offline_mode():  # Offline SQL scripts are generated for an empty database
+        for table_name in TABLES:
+            backfill_fingerprints(table_name)
+    create_index_online('ix_volunteer_address_state', 'volunteer', ['address_state'])
+    create_index_online('ix_volunteer_address_city', 'volunteer', ['address_city'])
+
+
+def downgrade():
+    drop_index_online('ix_volunteer_address_city', 'volunteer')
+    drop_index_online('ix_volunteer_address_state', 'volunteer')
+    with op.batch_alter_table('volunteer') as batch_op:
+        batch_op.drop_column('address_state')
+        batch_op.drop_column('address_city')
+    for table_name in TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column('address_fingerprint')
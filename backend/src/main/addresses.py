@@ -0,0 +1,83 @@
+from typing import Optional
+from sqlalchemy import bindparam, event, select
+from src.main.models import Elder, HelpRequest, Volunteer, db
+from src.main.utils import address_area_keys, address_fingerprint
+
+def _update_fingerprint(target, value, oldvalue, initiator):
+    """Fingerprint an address as it is written, so scoring never re-tokenizes it."""
+    target.address_fingerprint = address_fingerprint(value)
+    if isinstance(target, Volunteer):
+        target.address_city, target.address_state = address_area_keys(target.address_fingerprint)
+
+for _model in (Elder, Volunteer, HelpRequest):
+    event.listen(_model.address, 'set', _update_fingerprint)
+
+def request_fingerprint(help_request: HelpRequest) -> Optional[str]:
+    """Fingerprint of the address a request is matched on: its own, or its elder's."""
+    if help_request.address:
+        return help_request.address_fingerprint
+    if help_request.elder:
+        return help_request.elder.address_fingerprint
+    return None
+
+# Words that end street addresses rather than name an area ('1 Main St' has no city or state)
+STREET_WORDS = frozenset({
+    'st', 'street', 'ave', 'avenue', 'rd', 'road', 'blvd', 'boulevard', 'dr', 'drive', 'ln', 'lane',
+    'way', 'ct', 'court', 'pl', 'place', 'ter', 'terrace', 'cir', 'circle', 'pkwy', 'parkway',
+    'hwy', 'highway', 'sq', 'square', 'trl', 'trail', 'apt', 'unit', 'ste', 'suite'
+})
+
+def _is_area_word(word: str) -> bool:
+    """Whether an address word can be a city or state (or ZIP code), not a street suffix or number."""
+    word = word.rstrip('.')
+    if word.isdigit():
+        return len(word) == 5  # ZIP codes; shorter numbers are house or unit numbers
+    return bool(word) and word not in STREET_WORDS
+
+def volunteers_in_area(fingerprint: Optional[str]):
+    """SQL condition for volunteers sharing an address' city and state words.
+    
+    Only addresses of three or more words whose last two are plausibly a city and
+    a state get a condition; '1 Main St' would otherwise match everyone on a
+    street ending in 'St'. Reads the volunteer address_city/address_state
+    indexes, so it never scans volunteers.
+    
+    Args:
+        fingerprint: Address fingerprint (see utils.address_fingerprint)
+        
+    Returns:
+        Condition on Volunteer, or None if the address names no recognizable area
+    """
+    if not fingerprint or len(fingerprint.split(' ')) < 3:
+        return None
+    city, state = address_area_keys(fingerprint)
+    if not (_is_area_word(city) and _is_area_word(state)):
+        return None
+    return (Volunteer.address_city == city) & (Volunteer.address_state == state)
+
+def rebuild_address_fingerprints() -> int:
+    """Recompute every stored address fingerprint (e.g. after bulk updates that bypass the ORM) and commit.
+    
+    Returns:
+        Number of rows processed
+    """
+    count = 0
+    for model in (Elder, Volunteer, HelpRequest):
+        table = model.__table__
+        keyed = model is Volunteer
+        values = {'address_fingerprint': bindparam('fingerprint')}
+        if keyed:
+            values.update(address_city=bindparam('city'), address_state=bindparam('state'))
+        update = table.update().where(table.c.id == bindparam('row_id')).values(**values)
+        params = []
+        for row_id, address in db.session.execute(select(table.c.id, table.c.address)):
+            fingerprint = address_fingerprint(address)
+            row = {'row_id': row_id, 'fingerprint': fingerprint}
+            if keyed:
+                row['city'], row['state'] = address_area_keys(fingerprint)
+            params.append(row)
+        if params:
+            db.session.execute(update, params)
+        count += len(params)
+    db.session.commit()
+    return count
@@ -1,9 +1,15 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_socketio import SocketIO
+from flask_migrate import Migrate
+from sqlalchemy.exc import IntegrityError
 from src.main.models import db, Volunteer, Elder
+from src.main.schema import MIGRATIONS_DIR, ensure_schema
+from src.main.database import configure_sqlite, engine_options
 from src.main.routes import bp as api_bp
 from src.main.events import register_socket_events
+from src.main.geocoding import GeocodingWorker, NominatimGeocoder
+from src.main.realtime import client_manager_options
 import os
 from dotenv import load_dotenv
 
@@ -17,6 +23,16 @@ def create_app(test_config=None):
         # Use PostgreSQL if DATABASE_URL is set, otherwise default to SQLite
         app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///seniorsmartassist.db')
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        # Connection pool sizing, pre-ping, recycling and statement timeout (DB_POOL_* variables)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+        app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+        app.config['SQLITE_WAL'] = os.getenv('SQLITE_WAL', 'true').lower() == 'true'
+        # Geocode addresses with Nominatim in the background when they are written
+        app.config['GEOCODING_ENABLED'] = os.getenv('GEOCODING_ENABLED', 'true').lower() == 'true'
+        # Worker processes for large /classify-request/batch calls (0 = classify in the request process)
+        app.config['CLASSIFY_PROCESSES'] = int(os.getenv('CLASSIFY_PROCESSES', '0'))
+        # Message queue shared by all server processes, so Socket.IO rooms span them (e.g. redis://redis:6379/0)
+        app.config['SOCKETIO_MESSAGE_QUEUE'] = os.getenv('SOCKETIO_MESSAGE_QUEUE')
     else:
         app.config.update(test_config)
     
@@ -28,16 +44,33 @@ def create_app(test_config=None):
         CORS(app, origins=cors_origins.split(','))
     
     db.init_app(app)
+    with app.app_context():
+        configure_sqlite(db.engine, app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000), app.config.get('SQLITE_WAL', True))
+    # SQLite can't ALTER most things in place; batch mode rebuilds the table instead
+    Migrate(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
+    
+    # Addresses are geocoded by a background worker, never on the request path
+    if app.config.get('GEOCODING_ENABLED', True):
+        app.extensions['geocoding_worker'] = GeocodingWorker(
+            app,
+            geocoder=app.config.get('GEOCODER') or NominatimGeocoder(),
+            min_interval=app.config.get('GEOCODE_MIN_INTERVAL', 1.0),  # Nominatim allows 1 request/s
+            max_retries=app.config.get('GEOCODE_MAX_RETRIES', 3),
+            backoff_seconds=app.config.get('GEOCODE_BACKOFF_SECONDS', 2.0),
+            start_thread=app.config.get('GEOCODE_WORKER_THREAD', True)
+        )
     
-    socketio = SocketIO(app, cors_allowed_origins=cors_origins.split(',') if cors_origins != '*' else '*')
+    socketio = SocketIO(app, cors_allowed_origins=cors_origins.split(',') if cors_origins != '*' else '*',
+                        **client_manager_options(app.config.get('SOCKETIO_MESSAGE_QUEUE')))
     app.extensions['socketio'] = socketio
     register_socket_events(socketio)
     app.register_blueprint(api_bp, url_prefix='/api/seniorsmartassist')
     
     with app.app_context():
-        db.create_all()
+        # Schema changes are applied by `python migrate_db.py`, not on every boot
+        schema_ready = ensure_schema()
         # Initialize with sample data only if not in testing mode and database is empty
-        if not app.config.get('TESTING', False):
+        if schema_ready and not app.config.get('TESTING', False):
             if Volunteer.query.count() == 0:
                 volunteers = [
                     Volunteer(name="Alice Chen", email="alice@example.com", phone="555-0101", address="123 Main St, San Francisco, CA", skills="Groceries, Transportation, Companionship", availability="available"),
@@ -60,8 +93,12 @@ def create_app(test_config=None):
                 db.session.add_all(elders)
                 print(f"✅ Loaded {len(elders)} sample elders")
             
-            db.session.commit()
-            print("✅ Sample data initialized successfully")
+            try:
+                db.session.commit()
+                print("✅ Sample data initialized successfully")
+            except IntegrityError:
+                # Another server worker starting at the same time loaded it first
+                db.session.rollback()
     
     return app, socketio
 
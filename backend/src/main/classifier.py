@@ -0,0 +1,313 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# Phrases that decide the type outright, checked in this order
+HIGH_PRIORITY_PHRASES = {
+    "Medical Assistance": [
+        "buy medicine", "get medicine", "pick up medicine", "pickup medicine",
+        "buy medication", "get medication", "pick up medication", "pickup medication",
+        "get prescription", "pick up prescription", "pickup prescription",
+        "medical appointment", "doctor appointment", "hospital visit",
+        "medical emergency", "health emergency", "need medical"
+    ],
+    "Transportation": [
+        "need a ride", "need ride", "pick me up", "drop me off",
+        "take me to", "drive me to", "give me a ride"
+    ],
+    "Groceries": [
+        "buy groceries", "get groceries", "grocery shopping", "food shopping",
+        "buy food", "get food", "pick up food", "pickup food"
+    ]
+}
+
+# Keyword patterns for each request type with weights
+TYPE_PATTERNS = {
+    "Groceries": {
+        "keywords": ["grocery", "groceries", "shopping", "food", "store", "market", "supermarket",
+                    "milk", "bread", "vegetables", "fruits", "eggs", "meat", "items", "supplies"],
+        "weight": 1.0,
+        "exclude_keywords": ["medicine", "medication", "prescription", "medical", "doctor", "hospital"]  # Exclude medical contexts
+    },
+    "Medical Assistance": {
+        "keywords": ["medical", "doctor", "hospital", "medicine", "medication", "prescription", "health", "healthcare",
+                    "appointment", "clinic", "nurse", "treatment", "symptoms", "pain", "illness", "sick", "unwell",
+                    "emergency", "ambulance", "first aid", "injury", "pharmacy", "pharmacist"],
+        "weight": 1.5,  # Higher weight for medical keywords
+        "priority_keywords": ["medicine", "medication", "prescription", "medical", "doctor", "hospital", "pharmacy"]  # These get extra boost
+    },
+    "Transportation": {
+        "keywords": ["transport", "transportation", "ride", "drive", "car", "vehicle", "taxi", "uber", "lyft",
+                    "airport", "station", "pickup", "drop", "destination", "location", "travel"],
+        "weight": 1.0
+    },
+    "Commute Assistance": {
+        "keywords": ["commute", "commuting", "work", "office", "job", "daily", "routine", "regular", "everyday"],
+        "weight": 0.8
+    },
+    "House Shifting": {
+        "keywords": ["moving", "move", "shift", "shifting", "relocate", "relocation", "pack", "packing", "boxes",
+                    "furniture", "belongings", "new home", "new house", "apartment", "heavy", "lifting"],
+        "weight": 1.0
+    },
+    "Home Maintenance": {
+        "keywords": ["repair", "fix", "maintenance", "broken", "leak", "plumbing", "electrical", "carpentry",
+                    "handyman", "install", "installation", "appliance", "heating", "cooling", "ac", "heater",
+                    "door", "window", "roof", "wall", "painting", "cleaning", "yard", "garden"],
+        "weight": 1.0
+    },
+    "Companionship": {
+        "keywords": ["companion", "companionship", "visit", "visiting", "talk", "conversation", "chat", "social",
+                    "lonely", "loneliness", "friend", "friendship", "spend time", "company", "someone to talk"],
+        "weight": 1.0
+    },
+    "Technology Help": {
+        "keywords": ["computer", "laptop", "phone", "smartphone", "tablet", "internet", "wifi", "email", "app",
+                    "software", "device", "tech", "technology", "digital", "online", "website", "password",
+                    "account", "setup", "configure", "troubleshoot", "help with", "how to"],
+        "weight": 1.0
+    }
+}
+
+# Request priorities, most urgent first. Urgent is only ever set explicitly.
+PRIORITY_LEVELS = ['Urgent', 'High', 'Medium', 'Normal']
+
+# High priority keywords (urgent/emergency situations)
+HIGH_PRIORITY_KEYWORDS = ['urgent', 'emergency', 'asap', 'as soon as possible', 'immediately',
+                          'critical', 'need help now', 'quickly', 'right away', 'right now',
+                          'urgently', 'immediate']
+
+# Medium priority keywords (time-sensitive but not emergency)
+MEDIUM_PRIORITY_KEYWORDS = ['soon', 'today', 'needed', 'please help', 'as soon as',
+                            'when possible', 'need assistance']
+
+def calculate_request_priority(description: Optional[str]) -> str:
+    """Calculate request priority based on description keywords.
+
+    Stored in HelpRequest.priority when a request is created or its description
+    changes; read the column rather than calling this per row.
+    """
+    if not description:
+        return 'Normal'
+    
+    desc_lower = description.lower()
+    
+    # Check for high priority first (most critical)
+    if any(keyword in desc_lower for keyword in HIGH_PRIORITY_KEYWORDS):
+        return 'High'
+    
+    # Check for medium priority
+    if any(keyword in desc_lower for keyword in MEDIUM_PRIORITY_KEYWORDS):
+        return 'Medium'
+    
+    return 'Normal'
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as the re module's \\w for str patterns."""
+    return char.isalnum() or char == '_'
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every occurrence of a fixed set of strings.
+
+    Built once; scan() then reports all matches, overlapping ones included, in a
+    single left-to-right pass over the text, however many strings there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.outputs: List[Tuple[str, ...]] = [()]
+        for keyword in dict.fromkeys(keywords):
+            if keyword:
+                self._add(keyword)
+        self._link_failures()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions.append({})
+                self.outputs.append(())
+                self.transitions[state][char] = next_state
+            state = next_state
+        self.outputs[state] += (keyword,)
+
+    def _link_failures(self) -> None:
+        """Add failure links (breadth first), folding them into the transition tables.
+
+        Afterwards every state has an entry for every character it can continue
+        with, so scanning never follows failure links at run time.
+        """
+        failure = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            # Inherit the fallback state's transitions for characters this state lacks
+            fallback = self.transitions[failure[state]]
+            for char, next_state in list(self.transitions[state].items()):
+                failure[next_state] = fallback.get(char, 0) if state else 0
+                self.outputs[next_state] += self.outputs[failure[next_state]]
+                queue.append(next_state)
+            for char, next_state in fallback.items():
+                self.transitions[state].setdefault(char, next_state)
+
+    def scan(self, text: str) -> List[Tuple[int, str]]:
+        """Return (end index, keyword) for every occurrence of every keyword in text."""
+        transitions = self.transitions
+        outputs = self.outputs
+        root = transitions[0]
+        state = 0
+        matches = []
+        for index, char in enumerate(text):
+            state = transitions[state].get(char) or root.get(char, 0)
+            if outputs[state]:
+                matches.extend((index, keyword) for keyword in outputs[state])
+        return matches
+
+class RequestClassifier:
+    """Keyword classifier for help request descriptions, compiled once.
+
+    Every phrase and keyword of every type is found in one Aho-Corasick pass
+    over the lowercased description. Scoring then only does set lookups, in the
+    same order and with the same arithmetic as the original per-keyword regex
+    scans, so the scores (and results) are identical.
+    """
+
+    def __init__(self, high_priority_phrases=HIGH_PRIORITY_PHRASES, type_patterns=TYPE_PATTERNS):
+        self.high_priority_phrases = [(req_type, frozenset(phrases))
+                                      for req_type, phrases in high_priority_phrases.items()]
+        self.type_patterns = []
+        # keyword -> [(type index, position in that type's keyword list)]
+        self.keyword_slots: Dict[str, List[Tuple[int, int]]] = {}
+        for index, (req_type, pattern_data) in enumerate(type_patterns.items()):
+            self.type_patterns.append((
+                req_type,
+                pattern_data["weight"],
+                frozenset(pattern_data.get("exclude_keywords", [])),
+                frozenset(pattern_data.get("priority_keywords", []))
+            ))
+            for position, keyword in enumerate(pattern_data["keywords"]):
+                self.keyword_slots.setdefault(keyword, []).append((index, position))
+        strings = [phrase for phrases in high_priority_phrases.values() for phrase in phrases]
+        for pattern_data in type_patterns.values():
+            strings += pattern_data["keywords"]
+            strings += pattern_data.get("exclude_keywords", [])
+            strings += pattern_data.get("priority_keywords", [])
+        self.automaton = KeywordAutomaton(strings)
+
+    def find(self, text: str) -> Tuple[Set[str], Set[str]]:
+        """Find which keywords occur in text.
+
+        Returns:
+            Tuple of (keywords occurring anywhere, keywords occurring as a whole
+            word, i.e. where re's r'\\bkeyword\\b' would match)
+        """
+        substrings = set()
+        words = set()
+        length = len(text)
+        for end, keyword in self.automaton.scan(text):
+            substrings.add(keyword)
+            if keyword in words:
+                continue
+            start = end - len(keyword) + 1
+            # \b holds where exactly one side of the position is a word character
+            before = start > 0 and _is_word_char(text[start - 1])
+            after = end + 1 < length and _is_word_char(text[end + 1])
+            if before != _is_word_char(text[start]) and after != _is_word_char(text[end]):
+                words.add(keyword)
+        return substrings, words
+
+    def classify(self, description) -> str:
+        """Classify a description into one of the request types, or "Other"."""
+        if not description:
+            return "Other"
+
+        substrings, words = self.find(description.lower())
+
+        # Check for high-priority phrases first (these override keyword matching)
+        for req_type, phrases in self.high_priority_phrases:
+            if not phrases.isdisjoint(substrings):
+                return req_type
+
+        # Keywords found, per type, in the order they are listed for that type
+        found = [[] for _ in self.type_patterns]
+        for keyword in substrings:
+            for index, position in self.keyword_slots.get(keyword, ()):
+                found[index].append((position, keyword))
+
+        # Calculate scores for each type
+        type_scores = {}
+        for (req_type, weight, exclude_keywords, priority_keywords), matched in zip(self.type_patterns, found):
+            score = 0.0
+
+            # Check for exclude keywords (if present, reduce score significantly)
+            if req_type == "Groceries" and not exclude_keywords.isdisjoint(substrings):
+                # If medical keywords are present, heavily penalize Groceries
+                score -= 10.0
+
+            # Check for priority keywords (these get extra boost)
+            if not priority_keywords.isdisjoint(substrings):
+                score += 5.0 * weight  # Significant boost for priority keywords
+
+            # Count keyword matches; absent keywords add nothing, so only found ones are
+            # visited, in list order so the float additions happen in the original order
+            matched.sort()
+            for _, keyword in matched:
+                # Exact word match (higher weight)
+                if keyword in words:
+                    score += 2.0 * weight
+                # Partial match (lower weight)
+                else:
+                    score += 1.0 * weight
+
+            # Boost score for multiple keyword matches
+            matches = len(matched)
+            if matches > 1:
+                score *= (1 + matches * 0.1)  # 10% boost per additional match
+
+            type_scores[req_type] = score
+
+        # Find the type with highest score
+        if type_scores:
+            best_type = max(type_scores.items(), key=lambda x: x[1])
+            # Only return if score is above threshold, otherwise return "Other"
+            if best_type[1] > 0.5:
+                return best_type[0]
+
+        return "Other"
+
+# Built once at import; classify_request_type() in utils uses it
+request_classifier = RequestClassifier()
+
+def _classify(description: Optional[str]) -> str:
+    # Module-level so process pool workers can unpickle it
+    return request_classifier.classify(description)
+
+def classify_many(descriptions: Iterable[Optional[str]], processes: int = 0,
+                  chunksize: int = 256) -> Iterator[str]:
+    """Classify many descriptions, yielding each result as soon as it is ready.
+
+    Results come back in input order. With processes > 1 the work is spread
+    over a pool of worker processes, which pays off only for very large inputs
+    on multi-core machines (starting the pool costs far more than classifying a
+    few thousand descriptions). The pool reads all of descriptions up front.
+
+    Args:
+        descriptions: Descriptions to classify (None or empty gives "Other")
+        processes: Number of worker processes; 0 or 1 classifies in this process
+        chunksize: Descriptions sent to a worker at a time
+
+    Returns:
+        Iterator of request type strings, aligned with descriptions
+    """
+    if processes <= 1:
+        for description in descriptions:
+            yield request_classifier.classify(description)
+        return
+
+    # spawn, not fork: the server process has background threads and open sockets
+    # A worker that dies raises BrokenProcessPool instead of being silently replaced
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+        yield from pool.map(_classify, descriptions, chunksize=chunksize)
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from typing import Mapping, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+_stats_lock = threading.Lock()
+_pool_stats = {}
+
+def reset_pool_stats() -> None:
+    """Zero the connection pool counters."""
+    with _stats_lock:
+        _pool_stats.update(checkouts=0, checked_out=0, max_checked_out=0, waits=0,
+                           wait_seconds_total=0.0, wait_seconds_max=0.0, timeouts=0)
+
+reset_pool_stats()
+
+def _record_wait(seconds: float, timed_out: bool = False) -> None:
+    with _stats_lock:
+        _pool_stats['waits'] += 1
+        _pool_stats['wait_seconds_total'] += seconds
+        _pool_stats['wait_seconds_max'] = max(_pool_stats['wait_seconds_max'], seconds)
+        if timed_out:
+            _pool_stats['timeouts'] += 1
+
+class MeasuredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection (see get_pool_stats)."""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            _record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        _record_wait(time.perf_counter() - started)
+        return connection
+
+@event.listens_for(MeasuredQueuePool, 'checkout')
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    with _stats_lock:
+        _pool_stats['checkouts'] += 1
+        _pool_stats['checked_out'] += 1
+        _pool_stats['max_checked_out'] = max(_pool_stats['max_checked_out'], _pool_stats['checked_out'])
+
+@event.listens_for(MeasuredQueuePool, 'checkin')
+def _count_checkin(dbapi_connection, connection_record):
+    with _stats_lock:
+        _pool_stats['checked_out'] -= 1
+
+def get_pool_stats(engine: Optional[Engine] = None) -> dict:
+    """Return connection pool counters, for sizing the pool to the server's concurrency.
+    
+    Waits include opening new connections. If max_checked_out reaches
+    pool_size + max_overflow, or timeouts grow, requests are queuing for
+    connections.
+    
+    Args:
+        engine: Engine whose pool's current configuration to include
+        
+    Returns:
+        Dictionary of checkout, wait and timeout counters since startup
+    """
+    with _stats_lock:
+        stats = dict(_pool_stats)
+    stats['wait_seconds_avg'] = stats['wait_seconds_total'] / stats['waits'] if stats['waits'] else 0.0
+    if engine is not None and isinstance(engine.pool, QueuePool):
+        stats.update(pool_size=engine.pool.size(), overflow=engine.pool.overflow(), pool_timeout=engine.pool.timeout())
+    return stats
+
+def _flag(value: str) -> bool:
+    return value.lower() in ('1', 'true', 'yes')
+
+def engine_options(database_uri: str, environ: Mapping[str, str] = os.environ) -> dict:
+    """Build SQLALCHEMY_ENGINE_OPTIONS from environment variables.
+    
+    DB_POOL_SIZE (default 10), DB_MAX_OVERFLOW (20), DB_POOL_TIMEOUT (seconds, 30),
+    DB_POOL_PRE_PING (true), DB_POOL_RECYCLE (seconds, 1800) and, on PostgreSQL,
+    DB_STATEMENT_TIMEOUT_MS (0 = no limit; migrations/env.py lifts it for
+    migrations). In-memory SQLite keeps its single shared connection.
+    
+    Args:
+        database_uri: SQLAlchemy database URL
+        environ: Environment to read
+        
+    Returns:
+        Keyword arguments for create_engine
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    options = {
+        'poolclass': MeasuredQueuePool,
+        'pool_size': int(environ.get('DB_POOL_SIZE', '10')),
+        'max_overflow': int(environ.get('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': float(environ.get('DB_POOL_TIMEOUT', '30')),
+        'pool_pre_ping': _flag(environ.get('DB_POOL_PRE_PING', 'true')),
+        'pool_recycle': int(environ.get('DB_POOL_RECYCLE', '1800')),
+    }
+    statement_timeout = int(environ.get('DB_STATEMENT_TIMEOUT_MS', '0'))
+    if statement_timeout and url.get_backend_name() == 'postgresql':
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+def configure_sqlite(engine: Engine, busy_timeout_ms: int = 5000, wal: bool = True) -> None:
+    """Set up each new SQLite connection for concurrent use: WAL journal and a busy timeout.
+    
+    With WAL, readers no longer block the writer (or the other way round), and
+    a writer waits up to busy_timeout_ms for another to finish instead of failing
+    with "database is locked". A SAVEPOINT is always nested in an explicit
+    transaction: left to pysqlite, one issued before any other write becomes the
+    outer transaction, so releasing it commits. Does nothing for other databases.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA busy_timeout = {int(busy_timeout_ms)}')
+        if wal and engine.url.database not in (None, '', ':memory:'):
+            cursor.execute('PRAGMA journal_mode = WAL')
+        cursor.close()
+    
+    @event.listens_for(engine, 'savepoint')
+    def _begin_before_savepoint(connection, name):
+        # pysqlite only sends BEGIN ahead of INSERT/UPDATE/DELETE, so reads stay outside the
+        # write lock and a writer waits on busy_timeout; SQLAlchemy's recipe of BEGIN on every
+        # transaction would make read-then-write transactions fail with "database is locked"
+        # under WAL. Only a SAVEPOINT needs a transaction opened for it.
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql('BEGIN')
@@ -1,10 +1,72 @@
-from flask_socketio import SocketIO, emit, join_room, leave_room
+from typing import List
+from flask import request
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
 from src.main.models import HelpRequest, Volunteer, db
-from src.main.utils import smart_match_volunteer
+from src.main.utils import MATCHING_SKILLS, covering_geo_cells, geo_cell, smart_match_volunteer
+from src.main.geocoding import request_coordinates, update_request_coordinates
+from src.main.matching import MATCH_RADIUS_MILES
+
+# New requests are sent to rooms named "requests:<region>:<type>". The region is a
+# geo_cell, "unknown" for requests without a location yet, or "any" for volunteers
+# without one (they get every region); the type is a lowercase request type or "other".
+REQUEST_ROOM_PREFIX = 'requests:'
+
+def _type_key(request_type) -> str:
+    request_lower = (request_type or '').lower()
+    return request_lower if request_lower in MATCHING_SKILLS else 'other'
+
+def request_rooms(help_request: HelpRequest) -> List[str]:
+    """Rooms of the volunteers to notify about a new request: those nearby whose skills fit its type."""
+    type_key = _type_key(help_request.request_type)
+    coordinates = request_coordinates(help_request)
+    region = geo_cell(*coordinates) if coordinates else 'unknown'
+    return [f'{REQUEST_ROOM_PREFIX}{region}:{type_key}', f'{REQUEST_ROOM_PREFIX}any:{type_key}']
+
+def volunteer_rooms(volunteer: Volunteer) -> List[str]:
+    """Rooms a volunteer listens to for new requests.
+    
+    Covers every cell within MATCH_RADIUS_MILES of the volunteer (plus requests
+    not located yet), for the request types their skills match. Volunteers
+    whose skills match no type hear about every type, like matching falls back
+    to them; everyone hears about "other" requests.
+    """
+    skills = {skill.name for skill in volunteer.skill_set}
+    type_keys = [key for key, names in MATCHING_SKILLS.items() if not names.isdisjoint(skills)]
+    if not type_keys:
+        type_keys = list(MATCHING_SKILLS)
+    type_keys.append('other')
+    
+    regions = None
+    if volunteer.latitude is not None and volunteer.longitude is not None:
+        regions = covering_geo_cells(volunteer.latitude, volunteer.longitude, MATCH_RADIUS_MILES)
+    regions = regions + ['unknown'] if regions is not None else ['any']
+    return [f'{REQUEST_ROOM_PREFIX}{region}:{type_key}' for region in regions for type_key in type_keys]
+
+def _subscribe_volunteer(volunteer_id) -> None:
+    """Move the current connection into a volunteer's new-request rooms."""
+    volunteer = Volunteer.query.get(volunteer_id) if volunteer_id else None
+    if volunteer is None:
+        return
+    for room in rooms():
+        if room.startswith(REQUEST_ROOM_PREFIX):
+            leave_room(room)
+    for room in volunteer_rooms(volunteer):
+        join_room(room)
 
 def register_socket_events(socketio: SocketIO):
     """Register WebSocket event handlers."""
     
+    @socketio.on('connect')
+    def handle_connect(auth=None):
+        """Subscribe volunteers to new requests near them, from auth {'volunteer_id'} or ?volunteer_id=."""
+        volunteer_id = auth.get('volunteer_id') if isinstance(auth, dict) else None
+        _subscribe_volunteer(volunteer_id or request.args.get('volunteer_id', type=int))
+    
+    @socketio.on('subscribe_requests')
+    def handle_subscribe_requests(data):
+        """Subscribe to new requests as a volunteer (after logging in, or after editing the profile)."""
+        _subscribe_volunteer(data.get('volunteer_id'))
+    
     @socketio.on('new_request')
     def handle_new_request(data):
         """Handle new help request - create request but don't auto-assign volunteer."""
@@ -25,16 +87,17 @@ def register_socket_events(socketio: SocketIO):
             elder_id=data.get('elder_id'),
             status='pending'  # Set to pending, waiting for volunteer to accept
         )
+        update_request_coordinates(r)
         db.session.add(r)
         db.session.commit()
 
-        # Emit request created event (not assigned - volunteers need to accept)
+        # Emit request created event (not assigned - volunteers need to accept) to the relevant volunteers only
         emit('request_created', {
             'request_id': r.id,
             'request_type': r.request_type,
             'description': r.description,
             'status': r.status
-        }, broadcast=True)
+        }, to=request_rooms(r))
     
     @socketio.on('join_chat')
     def handle_join_chat(data):
@@ -0,0 +1,383 @@
+from typing import Dict, Optional, Set, Tuple
+from abc import ABC, abstractmethod
+from datetime import datetime
+import heapq
+import itertools
+import threading
+import time
+from flask import current_app
+from geopy.geocoders import Nominatim
+from sqlalchemy import event, inspect, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.main.models import Elder, Volunteer, HelpRequest, GeocodeCache, db
+from src.main.utils import geo_cell, normalize_address
+
+Coordinates = Tuple[float, float]
+
+# Models whose rows receive coordinates, by name (jobs only carry names and ids)
+GEOCODED_MODELS = {model.__name__: model for model in (Elder, Volunteer, HelpRequest)}
+
+_geolocator = None
+
+def get_geolocator() -> Nominatim:
+    """Return the process-wide Nominatim client, creating it on first use."""
+    global _geolocator
+    if _geolocator is None:
+        _geolocator = Nominatim(user_agent="senior_smartassist")
+    return _geolocator
+
+class Geocoder(ABC):
+    """Interface for turning an address into coordinates.
+
+    geocode() returns None when the address has no match, and raises when the
+    lookup itself failed (network error, rate limit) so the caller can retry.
+    """
+
+    @abstractmethod
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        """Return (latitude, longitude) for address, or None if it has no match."""
+
+class NominatimGeocoder(Geocoder):
+    """Geocoder backed by the public Nominatim (OpenStreetMap) service."""
+
+    def __init__(self, timeout: float = 5):
+        self.timeout = timeout
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        location = get_geolocator().geocode(address, timeout=self.timeout)
+        if not location:
+            return None
+        return (location.latitude, location.longitude)
+
+class StaticGeocoder(Geocoder):
+    """Offline geocoder that answers from a fixed address table (tests, local development)."""
+
+    def __init__(self, locations: Optional[Dict[str, Coordinates]] = None):
+        self.locations = {normalize_address(a): c for a, c in (locations or {}).items()}
+        self.calls = 0
+
+    def add(self, address: str, coordinates: Coordinates) -> None:
+        self.locations[normalize_address(address)] = coordinates
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        self.calls += 1
+        return self.locations.get(normalize_address(address))
+
+def lookup_cached_coordinates(address: Optional[str]) -> Optional[Coordinates]:
+    """Look up coordinates in the geocode cache table only (never hits the network).
+
+    Args:
+        address: Address string
+
+    Returns:
+        (latitude, longitude) tuple, or None if unknown or not geocodable
+    """
+    key = normalize_address(address)
+    if not key:
+        return None
+    entry = GeocodeCache.query.filter_by(address_key=key).first()
+    if entry and entry.latitude is not None and entry.longitude is not None:
+        return (entry.latitude, entry.longitude)
+    return None
+
+def store_geocode(address: str, coordinates: Optional[Coordinates]) -> None:
+    """Record a geocoding result (or a miss, if coordinates is None) in the cache table.
+
+    Args:
+        address: Address that was geocoded
+        coordinates: (latitude, longitude), or None if the geocoder found no match
+    """
+    entry = GeocodeCache(
+        address_key=normalize_address(address),
+        latitude=coordinates[0] if coordinates else None,
+        longitude=coordinates[1] if coordinates else None,
+        updated_at=datetime.utcnow()
+    )
+    try:
+        with db.session.begin_nested():
+            db.session.add(entry)
+    except IntegrityError:
+        # Another writer cached this address first
+        pass
+
+def set_coordinates(obj, latitude: Optional[float], longitude: Optional[float]) -> None:
+    """Set coordinates on a model instance, keeping a HelpRequest's geo_cell in sync."""
+    obj.latitude, obj.longitude = latitude, longitude
+    if isinstance(obj, HelpRequest):
+        obj.geo_cell = geo_cell(latitude, longitude)
+
+def _coordinate_values(model, latitude: Optional[float], longitude: Optional[float]) -> dict:
+    """Column values for a bulk coordinate UPDATE on model."""
+    values = {model.latitude: latitude, model.longitude: longitude}
+    if model is HelpRequest:
+        values[HelpRequest.geo_cell] = geo_cell(latitude, longitude)
+    return values
+
+def _queue_geocode(obj, address: str) -> None:
+    """Remember that obj needs geocoding once the current transaction commits."""
+    db.session.info.setdefault('geocode_targets', []).append((obj, address))
+
+def update_coordinates(obj, address: Optional[str]) -> None:
+    """Set latitude/longitude on an Elder, Volunteer or HelpRequest from an address.
+
+    Uses the geocode cache table only. Addresses that are not cached yet are
+    handed to the background geocoding worker after the transaction commits,
+    and the worker fills in the coordinates later.
+
+    Args:
+        obj: Model instance with latitude and longitude columns
+        address: Address to geocode; clears the coordinates if empty
+    """
+    set_coordinates(obj, None, None)
+    if not normalize_address(address):
+        return
+
+    entry = GeocodeCache.query.filter_by(address_key=normalize_address(address)).first()
+    if entry:
+        set_coordinates(obj, entry.latitude, entry.longitude)
+    else:
+        _queue_geocode(obj, address)
+
+def update_request_coordinates(help_request: HelpRequest) -> None:
+    """Set coordinates on a HelpRequest from its address, or its elder's location.
+
+    Args:
+        help_request: HelpRequest object
+    """
+    if help_request.address:
+        update_coordinates(help_request, help_request.address)
+        return
+
+    # Requests without an address use the elder's location. If the elder is
+    # still being geocoded, the worker copies it over when it finishes.
+    elder = Elder.query.get(help_request.elder_id) if help_request.elder_id else None
+    if elder is not None:
+        set_coordinates(help_request, elder.latitude, elder.longitude)
+    else:
+        set_coordinates(help_request, None, None)
+
+def request_coordinates(help_request: HelpRequest) -> Optional[Coordinates]:
+    """Return stored (latitude, longitude) for a request, falling back to its elder's location."""
+    if help_request.latitude is not None and help_request.longitude is not None:
+        return (help_request.latitude, help_request.longitude)
+    elder = help_request.elder
+    if not help_request.address and elder and elder.latitude is not None and elder.longitude is not None:
+        return (elder.latitude, elder.longitude)
+    return None
+
+@event.listens_for(Session, 'after_commit')
+def _enqueue_geocode_jobs(session):
+    """Hand addresses of committed rows to the background geocoding worker."""
+    targets = session.info.pop('geocode_targets', None)
+    if not targets:
+        return
+    worker = current_app.extensions.get('geocoding_worker')
+    if worker is None:
+        return
+    for obj, address in targets:
+        # The identity key is known after commit without reloading the row
+        identity = inspect(obj).identity
+        if identity:
+            worker.enqueue(address, type(obj).__name__, identity[0])
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_geocode_jobs(session):
+    """Forget addresses of rows that were never committed."""
+    session.info.pop('geocode_targets', None)
+
+class GeocodingWorker:
+    """Background worker that geocodes addresses off the request path.
+
+    - Jobs are keyed by normalized address, so an address queued many times is
+      geocoded once and its coordinates are written to every waiting row.
+    - Calls to the geocoder are spaced at least min_interval seconds apart
+      (Nominatim's usage policy allows one request per second).
+    - Failed lookups are retried with exponential backoff, up to max_retries times.
+
+    With start_thread=False nothing runs in the background; call drain() to
+    process the queue (used by tests and by migrate_db.py).
+    """
+
+    def __init__(self, app, geocoder: Geocoder, min_interval: float = 1.0,
+                 max_retries: int = 3, backoff_seconds: float = 2.0, start_thread: bool = True):
+        self.app = app
+        self.geocoder = geocoder
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.start_thread = start_thread
+
+        self._jobs: Dict[str, dict] = {}    # address key -> {'address', 'targets', 'attempts'}
+        self._schedule = []                 # heap of (ready_at, seq, address key)
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._last_call = 0.0
+
+    def enqueue(self, address: str, model_name: str, obj_id: int) -> None:
+        """Queue an address for geocoding and remember which row it belongs to.
+
+        Args:
+            address: Address as stored on the row
+            model_name: 'Elder', 'Volunteer' or 'HelpRequest'
+            obj_id: Primary key of the row
+        """
+        key = normalize_address(address)
+        if not key:
+            return
+        with self._condition:
+            job = self._jobs.get(key)
+            if job is None:
+                job = {'address': address, 'targets': set(), 'attempts': 0}
+                self._jobs[key] = job
+                heapq.heappush(self._schedule, (time.monotonic(), next(self._seq), key))
+            job['targets'].add((model_name, obj_id, address))
+            self._condition.notify()
+
+        if self.start_thread:
+            self._ensure_thread()
+
+    def pending(self) -> int:
+        """Number of distinct addresses waiting to be geocoded."""
+        with self._condition:
+            return len(self._jobs)
+
+    def drain(self) -> None:
+        """Process every queued job now, ignoring retry delays (blocks until empty)."""
+        while True:
+            with self._condition:
+                if not self._schedule:
+                    return
+                _, _, key = heapq.heappop(self._schedule)
+            self._process(key)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='geocoding-worker', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._schedule or self._schedule[0][0] > time.monotonic():
+                    timeout = self._schedule[0][0] - time.monotonic() if self._schedule else None
+                    self._condition.wait(timeout)
+                _, _, key = heapq.heappop(self._schedule)
+            try:
+                self._process(key)
+            except Exception as e:
+                print(f"Geocoding worker error for '{key}': {e}")
+
+    def _throttle(self) -> None:
+        wait = self._last_call + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_call = time.monotonic()
+
+    def _process(self, key: str) -> None:
+        with self._condition:
+            job = self._jobs.get(key)
+        if job is None:
+            return
+
+        with self.app.app_context():
+            try:
+                entry = GeocodeCache.query.filter_by(address_key=key).first()
+                if entry:
+                    coordinates = (entry.latitude, entry.longitude) if entry.latitude is not None else None
+                else:
+                    self._throttle()
+                    try:
+                        coordinates = self.geocoder.geocode(job['address'])
+                    except Exception as e:
+                        self._retry_later(key, job, e)
+                        return
+                    store_geocode(job['address'], coordinates)
+
+                # Targets queued while we were geocoding are picked up here too
+                with self._condition:
+                    targets = set(job['targets'])
+                self._apply(coordinates, targets)
+                db.session.commit()
+            except Exception as e:
+                # Database unavailable: keep the job (and every target) and try again later
+                db.session.rollback()
+                self._retry_later(key, job, e)
+                return
+
+            with self._condition:
+                job['targets'] -= targets
+                if job['targets']:
+                    # Queued while we were writing: the cached geocode answers them straight away
+                    heapq.heappush(self._schedule, (time.monotonic(), next(self._seq), key))
+                    self._condition.notify()
+                else:
+                    self._jobs.pop(key, None)
+
+    def _retry_later(self, key: str, job: dict, error: Exception) -> None:
+        with self._condition:
+            job['attempts'] += 1
+            if job['attempts'] > self.max_retries:
+                print(f"Giving up geocoding '{job['address']}' after {job['attempts']} attempts: {error}")
+                self._jobs.pop(key, None)
+                return
+            delay = self.backoff_seconds * (2 ** (job['attempts'] - 1))
+            heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._seq), key))
+            self._condition.notify()
+
+    def _apply(self, coordinates: Optional[Coordinates], targets: Set[Tuple[str, int, str]]) -> None:
+        latitude, longitude = coordinates if coordinates else (None, None)
+        for model_name, obj_id, address in targets:
+            model = GEOCODED_MODELS[model_name]
+            # Skip rows whose address changed after the job was queued
+            model.query.filter(model.id == obj_id, model.address == address).update(
+                _coordinate_values(model, latitude, longitude), synchronize_session=False)
+            if model is Elder:
+                # Requests without their own address use the elder's location
+                HelpRequest.query.filter(
+                    HelpRequest.elder_id == obj_id,
+                    or_(HelpRequest.address.is_(None), HelpRequest.address == '')
+                ).update(_coordinate_values(HelpRequest, latitude, longitude),
+                         synchronize_session=False)
+
+def get_geocoding_worker() -> Optional[GeocodingWorker]:
+    """Return the current app's geocoding worker, if geocoding is enabled."""
+    return current_app.extensions.get('geocoding_worker')
+
+def backfill_coordinates() -> int:
+    """Queue every Elder, Volunteer and HelpRequest that has an address but no coordinates.
+
+    Runs the worker until the queue is empty (about one second per distinct
+    uncached address with Nominatim).
+
+    Returns:
+        Number of rows queued
+    """
+    worker = get_geocoding_worker()
+    if worker is None:
+        return 0
+
+    queued = 0
+    for model in GEOCODED_MODELS.values():
+        rows = model.query.filter(model.address.isnot(None), model.address != '',
+                                  model.latitude.is_(None)).all()
+        for obj in rows:
+            worker.enqueue(obj.address, model.__name__, obj.id)
+            queued += 1
+    worker.drain()
+    return queued
+
+def backfill_geo_cells() -> int:
+    """Fill geo_cell for requests that have coordinates but no cell yet.
+
+    Returns:
+        Number of requests updated
+    """
+    rows = HelpRequest.query.filter(HelpRequest.latitude.isnot(None),
+                                    HelpRequest.longitude.isnot(None),
+                                    HelpRequest.geo_cell.is_(None)).all()
+    for help_request in rows:
+        help_request.geo_cell = geo_cell(help_request.latitude, help_request.longitude)
+    db.session.commit()
+    return len(rows)
@@ -0,0 +1,154 @@
+from typing import Dict, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.main.models import Contribution, Reward, DonationLedger, db
+
+# The ledger is a single row
+LEDGER_ID = 1
+
+# Amounts are shown in cents; float sums may drift below zero by less than this
+BALANCE_TOLERANCE = 0.005
+
+class InsufficientBalance(Exception):
+    """The general donation pool can't cover a reward."""
+
+_ledger = DonationLedger.__table__
+
+def _pool_amount(obj, values) -> float:
+    """How much a Contribution or Reward adds to its ledger total, given its column values."""
+    amount = values['amount'] or 0.0
+    if isinstance(obj, Contribution) and values['volunteer_id'] is not None:
+        return 0.0  # Contributions for a specific volunteer don't fund the general pool
+    return amount
+
+def _current_values(obj) -> dict:
+    return {'amount': obj.amount, 'volunteer_id': obj.volunteer_id}
+
+def _committed_values(session, obj) -> dict:
+    """Column values as stored in the database, before the pending changes on obj."""
+    state = inspect(obj)
+    values = {}
+    for key in ('amount', 'volunteer_id'):
+        history = state.attrs[key].history
+        if not history.deleted and not history.unchanged:
+            # Changed after being expired (e.g. by a commit): the old values are only in the database
+            table = type(obj).__table__
+            row = session.connection().execute(
+                select(table.c.amount, table.c.volunteer_id).where(table.c.id == state.identity[0])
+            ).one()
+            return {'amount': row.amount, 'volunteer_id': row.volunteer_id}
+        values[key] = (history.deleted or history.unchanged)[0]
+    return values
+
+def _flush_deltas(session) -> Tuple[float, float]:
+    """Net change to (total_donations, total_rewards) from the objects about to be flushed."""
+    deltas = {Contribution: 0.0, Reward: 0.0}
+    for obj in session.new:
+        if type(obj) in deltas:
+            deltas[type(obj)] += _pool_amount(obj, _current_values(obj))
+    for obj in session.deleted:
+        if type(obj) in deltas:
+            deltas[type(obj)] -= _pool_amount(obj, _committed_values(session, obj))
+    for obj in session.dirty:
+        if type(obj) in deltas and session.is_modified(obj):
+            deltas[type(obj)] += (_pool_amount(obj, _current_values(obj))
+                                  - _pool_amount(obj, _committed_values(session, obj)))
+    return deltas[Contribution], deltas[Reward]
+
+def _sum_totals(connection) -> Tuple[float, float]:
+    """Compute (total_donations, total_rewards) from scratch with SQL SUM()."""
+    total_donations = connection.execute(
+        select(func.coalesce(func.sum(Contribution.amount), 0.0)).where(Contribution.volunteer_id.is_(None))
+    ).scalar()
+    total_rewards = connection.execute(select(func.coalesce(func.sum(Reward.amount), 0.0))).scalar()
+    return float(total_donations), float(total_rewards)
+
+def _write_totals(connection, total_donations: float, total_rewards: float) -> None:
+    """Create or overwrite the ledger row."""
+    values = {'total_donations': total_donations, 'total_rewards': total_rewards, 'updated_at': datetime.utcnow()}
+    updated = connection.execute(_ledger.update().where(_ledger.c.id == LEDGER_ID).values(**values))
+    if updated.rowcount == 0:
+        connection.execute(_ledger.insert().values(id=LEDGER_ID, **values))
+
+@event.listens_for(Session, 'before_flush')
+def _collect_ledger_changes(session, flush_context, instances):
+    """Work out how this flush changes the ledger while the old rows are still readable."""
+    session.info['ledger_deltas'] = _flush_deltas(session)
+
+@event.listens_for(Session, 'after_flush')
+def _update_ledger(session, flush_context):
+    """Apply contributions and rewards written in this flush to the ledger, in the same transaction."""
+    donations, rewards = session.info.pop('ledger_deltas', (0.0, 0.0))
+    if not donations and not rewards:
+        return
+    connection = session.connection()
+    # Increment in SQL so concurrent writers never overwrite each other's totals
+    updated = connection.execute(
+        _ledger.update().where(_ledger.c.id == LEDGER_ID).values(
+            total_donations=_ledger.c.total_donations + donations,
+            total_rewards=_ledger.c.total_rewards + rewards,
+            updated_at=datetime.utcnow()
+        )
+    )
+    if updated.rowcount == 0:
+        # No ledger yet: the flushed rows are already visible to SUM()
+        _write_totals(connection, *_sum_totals(connection))
+
+def rebuild_ledger() -> DonationLedger:
+    """Recompute the ledger from the Contribution and Reward tables and commit it."""
+    connection = db.session.connection()
+    _write_totals(connection, *_sum_totals(connection))
+    db.session.commit()
+    return db.session.get(DonationLedger, LEDGER_ID, populate_existing=True)
+
+def get_balance() -> Dict[str, float]:
+    """Return the general donation pool totals from the ledger row (O(1)).
+
+    Returns:
+        Dict with total_donations, total_rewards_given and available_balance
+    """
+    ledger = db.session.get(DonationLedger, LEDGER_ID, populate_existing=True)
+    if ledger is None:
+        ledger = rebuild_ledger()
+    return {
+        'total_donations': ledger.total_donations,
+        'total_rewards_given': ledger.total_rewards,
+        'available_balance': ledger.total_donations - ledger.total_rewards
+    }
+
+def assign_reward(request_id: int, volunteer_id: int, amount: float) -> Optional[Reward]:
+    """Pay a reward for a request out of the general pool, at most once per request.
+
+    Safe under concurrent completions: the Reward insert increments the ledger
+    row in SQL (see _update_ledger), which holds the row's write lock until the
+    transaction ends, and the balance is checked after that increment. If the
+    pool is overdrawn the savepoint is rolled back. The unique index on
+    Reward.request_id stops a second reward for the same request.
+
+    Args:
+        request_id: HelpRequest being completed
+        volunteer_id: Volunteer receiving the reward
+        amount: Reward amount in dollars
+
+    Returns:
+        The request's Reward (new or already existing), or None if the pool can't cover it
+    """
+    existing = Reward.query.filter_by(request_id=request_id).first()
+    if existing:
+        return existing
+    try:
+        with db.session.begin_nested():
+            reward = Reward(request_id=request_id, volunteer_id=volunteer_id, amount=amount)
+            db.session.add(reward)
+            db.session.flush()
+            ledger = db.session.get(DonationLedger, LEDGER_ID, populate_existing=True)
+            if ledger is None or ledger.total_donations - ledger.total_rewards < -BALANCE_TOLERANCE:
+                raise InsufficientBalance()
+    except InsufficientBalance:
+        return None
+    except IntegrityError:
+        # Another completion rewarded this request first
+        return Reward.query.filter_by(request_id=request_id).first()
+    return reward
@@ -0,0 +1,210 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.orm import selectinload
+from src.main.addresses import request_fingerprint, volunteers_in_area
+from src.main.geocoding import request_coordinates
+from src.main.models import HelpRequest, Skill, Volunteer, volunteer_skill, db
+from src.main.skills import volunteers_with_skill_for
+from src.main.utils import (VECTORIZED_SCORING_MIN, BoundedCache, VolunteerFeatures, bounding_box,
+                            rank_volunteers)
+
+# Volunteers farther than this from a request are only considered when nobody closer qualifies
+MATCH_RADIUS_MILES = 25
+
+# Rankings kept per request, and for how long (volunteers' workloads drift in the meantime)
+MATCH_RANKING_SIZE = 10
+MATCH_RANKING_TTL_SECONDS = 60
+_ranking_cache = BoundedCache(maxsize=1_000, ttl=MATCH_RANKING_TTL_SECONDS)
+
+# Feature arrays of every volunteer, from which long candidate lists are selected; rebuilt
+# after this long in case another process edited addresses or skills
+VOLUNTEER_FEATURES_TTL_SECONDS = 300
+_features_cache = BoundedCache(maxsize=1, ttl=VOLUNTEER_FEATURES_TTL_SECONDS)
+
+def _skill_filter(request_type: Optional[str]):
+    """SQL condition for volunteers listing the request type or a skill related to it."""
+    volunteer_ids = volunteers_with_skill_for(request_type)
+    if volunteer_ids is None:
+        return None
+    return Volunteer.id.in_(volunteer_ids)
+
+def _area_filter(help_request: HelpRequest):
+    """SQL condition for volunteers near the request, or None if it has no location.
+    
+    Uses a box around the request's coordinates; a request not geocoded yet falls
+    back to volunteers sharing its address' city and state words, if it names them.
+    """
+    coordinates = request_coordinates(help_request)
+    if coordinates is None:
+        return volunteers_in_area(request_fingerprint(help_request))
+    box = bounding_box(coordinates[0], coordinates[1], MATCH_RADIUS_MILES)
+    if box is None:
+        return None
+    min_latitude, max_latitude, min_longitude, max_longitude = box
+    return Volunteer.latitude.between(min_latitude, max_latitude) & \
+        Volunteer.longitude.between(min_longitude, max_longitude)
+
+def find_match_candidates(help_request: HelpRequest, exclude: Iterable[int] = ()) -> List[Volunteer]:
+    """Narrow the volunteers worth scoring for a request, in SQL.
+    
+    Only available volunteers are candidates. Among them, those near the request
+    with a matching skill are preferred; if there are none, the skill and then the
+    area condition are dropped, so a request is never left unmatched just because
+    nobody nearby lists the right skill. Excluded volunteers are left out of every
+    stage, so when all of one stage has declined the next stage is tried.
+    
+    Args:
+        help_request: HelpRequest to match
+        exclude: Volunteer ids to leave out, e.g. volunteers who already declined
+        
+    Returns:
+        Candidate volunteers (empty if no volunteer is available)
+    """
+    available = Volunteer.query.options(selectinload(Volunteer.skill_set)).filter(
+        Volunteer.availability == 'available')
+    exclude = set(exclude)
+    if exclude:
+        available = available.filter(Volunteer.id.notin_(exclude))
+    skill_filter = _skill_filter(help_request.request_type)
+    area_filter = _area_filter(help_request)
+    stages = []
+    if skill_filter is not None and area_filter is not None:
+        stages.append((skill_filter, area_filter))
+    if area_filter is not None:
+        stages.append((area_filter,))
+    if skill_filter is not None:
+        stages.append((skill_filter,))
+    stages.append(())
+    for conditions in stages:
+        candidates = available.filter(*conditions).all()
+        if candidates:
+            return candidates
+    return []
+
+def _build_volunteer_features() -> Tuple[VolunteerFeatures, Dict[int, int]]:
+    """Features of every volunteer, read straight from the tables, and each volunteer id's row."""
+    rows = db.session.execute(select(Volunteer.id, Volunteer.address, Volunteer.address_fingerprint,
+                                     Volunteer.availability, Volunteer.active_request_count)).all()
+    row_of = {row.id: i for i, row in enumerate(rows)}
+    skill_names = [[] for _ in rows]
+    for volunteer_id, name in db.session.execute(
+            select(volunteer_skill.c.volunteer_id, Skill.name).join(Skill, Skill.id == volunteer_skill.c.skill_id)):
+        if volunteer_id in row_of:
+            skill_names[row_of[volunteer_id]].append(name)
+    features = VolunteerFeatures([row.address for row in rows], skill_names,
+                                 [row.availability for row in rows], [row.active_request_count for row in rows],
+                                 [row.address_fingerprint for row in rows])
+    return features, row_of
+
+def candidate_features(candidates: List[Volunteer]) -> Optional[VolunteerFeatures]:
+    """VolunteerFeatures of a long candidate list, selected from arrays built for every volunteer.
+    
+    The arrays are built once and shared by every request, whatever its
+    candidates; only availability and workload are re-read from candidates.
+    Editing a volunteer's address or skills clears them, and a candidate who
+    registered after they were built triggers a rebuild.
+    
+    Args:
+        candidates: Candidate volunteers (see find_match_candidates)
+        
+    Returns:
+        Features of candidates, in order, or None if the list is too short to be worth vectorizing
+    """
+    if len(candidates) < VECTORIZED_SCORING_MIN:
+        return None
+    cached = _features_cache.get('volunteers')
+    rows = None
+    if cached is not None:
+        features, row_of = cached
+        rows = [row_of.get(volunteer.id) for volunteer in candidates]
+    if rows is None or None in rows:
+        features, row_of = _build_volunteer_features()
+        _features_cache.set('volunteers', (features, row_of))
+        rows = [row_of[volunteer.id] for volunteer in candidates]
+    return features.select(rows).with_status(candidates)
+
+def _rank_candidates(help_request: HelpRequest, candidates: List[Volunteer], k: int) -> List[Tuple[Volunteer, float, dict]]:
+    """rank_volunteers, with cached features for long candidate lists."""
+    return rank_volunteers(help_request, candidates, k, candidate_features(candidates))
+
+def rank_matches(help_request: HelpRequest, k: int = MATCH_RANKING_SIZE,
+                 exclude: Iterable[int] = ()) -> List[Tuple[Volunteer, float, dict]]:
+    """Return the k best volunteers for a request, best first.
+    
+    The top MATCH_RANKING_SIZE ranking is cached per request for a short time, so
+    asking again (e.g. for the next volunteer after one declines) only reloads
+    the ranked volunteers by id. Changing any volunteer's availability clears the
+    cache.
+    
+    Args:
+        help_request: HelpRequest to match
+        k: Number of matches to return (at most MATCH_RANKING_SIZE are cached)
+        exclude: Volunteer ids to leave out, e.g. volunteers who already declined
+        
+    Returns:
+        Up to k tuples of (volunteer, total_score, score_breakdown)
+    """
+    exclude = set(exclude)
+    key = (help_request.id, help_request.request_type, help_request.address)
+    ranking = _ranking_cache.get(key)
+    if ranking is None:
+        ranked = _rank_candidates(help_request, find_match_candidates(help_request), MATCH_RANKING_SIZE)
+        ranking = [(volunteer.id, score, breakdown) for volunteer, score, breakdown in ranked]
+        _ranking_cache.set(key, ranking)
+        volunteers = {volunteer.id: volunteer for volunteer, _, _ in ranked}
+    else:
+        # Reload the ranked volunteers; one that became unavailable elsewhere drops out
+        volunteer_ids = [volunteer_id for volunteer_id, _, _ in ranking if volunteer_id not in exclude]
+        volunteers = {}
+        if volunteer_ids:
+            query = Volunteer.query.filter(Volunteer.id.in_(volunteer_ids), Volunteer.availability == 'available')
+            volunteers = {volunteer.id: volunteer for volunteer in query}
+    
+    matches = [(volunteers[volunteer_id], score, dict(breakdown)) for volunteer_id, score, breakdown in ranking
+               if volunteer_id not in exclude and volunteer_id in volunteers]
+    if len(matches) < k and (len(ranking) == MATCH_RANKING_SIZE or exclude):
+        # Too few cached matches left after exclusions: rank the remaining candidates afresh,
+        # which may fall back to a wider stage than the cached ranking came from
+        return _rank_candidates(help_request, find_match_candidates(help_request, exclude), k)
+    return matches[:k]
+
+def get_cache_stats() -> dict:
+    """Return hit/miss/eviction counters for the in-memory ranking and volunteer feature caches."""
+    return {
+        'rankings': _ranking_cache.stats(),
+        'features': _features_cache.stats()
+    }
+
+def clear_match_rankings() -> None:
+    """Forget every cached ranking and candidate feature array."""
+    _ranking_cache.clear()
+    _features_cache.clear()
+
+@event.listens_for(Volunteer.availability, 'set')
+def _availability_changed(target, value, oldvalue, initiator):
+    # Cached features re-read availability on every use, so only rankings go stale
+    if value != oldvalue:
+        _ranking_cache.clear()
+
+@event.listens_for(Volunteer, 'after_insert')
+def _volunteer_added(mapper, connection, target):
+    _ranking_cache.clear()
+
+@event.listens_for(Volunteer.address, 'set')
+@event.listens_for(Volunteer.skills, 'set')
+def _profile_changed(target, value, oldvalue, initiator):
+    if value != oldvalue:
+        clear_match_rankings()
+
+def match_volunteer(help_request: HelpRequest, exclude: Iterable[int] = ()) -> Optional[Tuple[Volunteer, float, dict]]:
+    """Find the best volunteer for a request: SQL candidate filtering, then weighted scoring.
+    
+    Args:
+        help_request: HelpRequest to match
+        exclude: Volunteer ids to leave out
+        
+    Returns:
+        Tuple of (best_volunteer, total_score, score_breakdown) or None if no suitable match
+    """
+    ranked = rank_matches(help_request, 1, exclude)
+    return ranked[0] if ranked else None
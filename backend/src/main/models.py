@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from src.main.classifier import calculate_request_priority
 
 db = SQLAlchemy()
 
@@ -9,6 +10,9 @@ class Elder(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     phone = db.Column(db.String(20))
     address = db.Column(db.String(200))
+    address_fingerprint = db.Column(db.Text)  # Normalized address words, maintained by addresses.py
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
     age = db.Column(db.Integer, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -18,11 +22,46 @@ class Volunteer(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     phone = db.Column(db.String(20))
     address = db.Column(db.String(200))
+    address_fingerprint = db.Column(db.Text)  # Normalized address words, maintained by addresses.py
+    # Last two address words (usually city and state), for finding volunteers in a request's area
+    address_city = db.Column(db.Text)
+    address_state = db.Column(db.Text)
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
     skills = db.Column(db.String(500))
     gender = db.Column(db.String(20))  # Male, Female, Other
     has_car = db.Column(db.Boolean, default=False)
     availability = db.Column(db.String(20), default='available')  # available, busy, unavailable
+    # Pending/assigned/in-progress requests assigned to this volunteer, maintained by workload.py
+    active_request_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Parsed from skills, maintained by skills.py
+    skill_set = db.relationship('Skill', secondary='volunteer_skill', viewonly=True)
+    
+    __table_args__ = (
+        # Matching candidates: available volunteers inside a bounding box
+        db.Index('ix_volunteer_availability_latitude', 'availability', 'latitude'),
+        # Area keys to volunteers, for requests without coordinates
+        db.Index('ix_volunteer_address_state', 'address_state'),
+        db.Index('ix_volunteer_address_city', 'address_city'),
+    )
+
+class Skill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(500), unique=True, nullable=False)  # Lowercase, as parsed by utils.parse_skills
+
+# Which volunteers list which skills
+volunteer_skill = db.Table(
+    'volunteer_skill',
+    db.Column('volunteer_id', db.Integer, db.ForeignKey('volunteer.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True),
+    # "Volunteers who can do X": skill to volunteers
+    db.Index('ix_volunteer_skill_skill_id', 'skill_id'),
+)
+
+def _description_priority(context):
+    # Column default: priority from the description being inserted
+    return calculate_request_priority(context.get_current_parameters().get('description'))
 
 class HelpRequest(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -31,9 +70,12 @@ class HelpRequest(db.Model):
     request_type = db.Column(db.String(50))
     description = db.Column(db.String(500))
     status = db.Column(db.String(20), default='pending')  # pending, assigned, in_progress, completed, cancelled
+    priority = db.Column(db.String(10), default=_description_priority)  # Urgent, High, Medium, Normal; recomputed when the description changes
     address = db.Column(db.String(200))
+    address_fingerprint = db.Column(db.Text)  # Normalized address words, maintained by addresses.py
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    geo_cell = db.Column(db.String(20))  # Grid cell of (latitude, longitude), see utils.geo_cell
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     assigned_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
@@ -41,6 +83,19 @@ class HelpRequest(db.Model):
     rating_comment = db.Column(db.String(500))  # Optional comment with rating
     elder = db.relationship('Elder', backref='requests')
     volunteer = db.relationship('Volunteer', backref='assigned_requests')
+    
+    __table_args__ = (
+        # Spatial index for "requests near me" radius queries
+        db.Index('ix_help_request_status_geo_cell', 'status', 'geo_cell'),
+        # Request feed: filter by status, newest first
+        db.Index('ix_help_request_status_timestamp', 'status', 'timestamp'),
+        db.Index('ix_help_request_timestamp', 'timestamp'),
+        # Request feed filtered by priority
+        db.Index('ix_help_request_status_priority', 'status', 'priority'),
+        # Elder history and volunteer dashboards
+        db.Index('ix_help_request_elder_id', 'elder_id'),
+        db.Index('ix_help_request_volunteer_status', 'volunteer_id', 'status'),
+    )
 
 class Contribution(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -51,6 +106,11 @@ class Contribution(db.Model):
     message = db.Column(db.String(500))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     volunteer = db.relationship('Volunteer', backref='contributions')
+    
+    __table_args__ = (
+        # Per-volunteer contribution history, newest first; also serves the general pool (volunteer_id IS NULL)
+        db.Index('ix_contribution_volunteer_timestamp', 'volunteer_id', 'timestamp'),
+    )
 
 class ChatMessage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -60,6 +120,11 @@ class ChatMessage(db.Model):
     message = db.Column(db.String(1000), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     request = db.relationship('HelpRequest', backref='chat_messages')
+    
+    __table_args__ = (
+        # Chat history for a request in order
+        db.Index('ix_chat_message_request_timestamp', 'request_id', 'timestamp'),
+    )
 
 class Reward(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -69,3 +134,22 @@ class Reward(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     request = db.relationship('HelpRequest', backref='rewards')
     volunteer = db.relationship('Volunteer', backref='rewards')
+    
+    __table_args__ = (
+        db.Index('uq_reward_request_id', 'request_id', unique=True),  # At most one reward per request
+        db.Index('ix_reward_volunteer_id', 'volunteer_id'),
+    )
+
+class DonationLedger(db.Model):
+    # Running totals of the general donation pool (a single row), maintained by src.main.ledger
+    id = db.Column(db.Integer, primary_key=True)
+    total_donations = db.Column(db.Float, nullable=False, default=0.0)  # Contributions without a volunteer
+    total_rewards = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class GeocodeCache(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    address_key = db.Column(db.String(255), unique=True, nullable=False)  # Normalized address
+    latitude = db.Column(db.Float)  # Null when the geocoder found no match
+    longitude = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
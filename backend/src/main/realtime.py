@@ -0,0 +1,74 @@
+import json
+import os
+from typing import Optional
+from urllib.parse import urlparse
+import socketio
+
+class FileQueueManager(socketio.PubSubManager):
+    """Socket.IO message queue stand-in that shares emits through an append-only file.
+    
+    Every process using the same file:// URL sees every emit, like with a Redis
+    queue, so local development and tests can run several workers without a
+    broker. Each message is one JSON line. The file is never truncated, so this
+    is not meant for production.
+    """
+    name = 'file'
+    
+    def __init__(self, url: str = 'file:///tmp/seniorsmartassist-socketio', channel: str = 'socketio',
+                 write_only: bool = False, logger=None, poll_interval: float = 0.05):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        directory = urlparse(url).path
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f'{channel}.jsonl')
+        self.poll_interval = poll_interval
+    
+    def initialize(self):
+        # Start reading at the current end of the file now, not when the listener first runs:
+        # with green threads that is only at the next yield, and emits published in between
+        # (even by this process) would be skipped
+        fd = os.open(self.path, os.O_RDONLY | os.O_CREAT, 0o644)
+        try:
+            self._offset = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        super().initialize()
+    
+    def _publish(self, data):
+        # A single O_APPEND write lands whole at the end of the file, whichever process writes it
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(data) + '\n').encode('utf-8'))
+        finally:
+            os.close(fd)
+    
+    def _listen(self):
+        # Only messages published since initialize(): earlier ones were for clients of processes before us
+        with open(self.path, 'rb') as queue:
+            queue.seek(self._offset)
+            pending = b''
+            while True:
+                chunk = queue.read()
+                if not chunk:
+                    self.server.sleep(self.poll_interval)
+                    continue
+                pending += chunk
+                *lines, pending = pending.split(b'\n')
+                for line in lines:
+                    self._offset += len(line) + 1  # A restarted listener resumes after this line
+                    yield line.decode('utf-8')
+
+def client_manager_options(message_queue: Optional[str]) -> dict:
+    """SocketIO() options for sharing emits and rooms between worker processes through a message queue.
+    
+    Args:
+        message_queue: Queue URL: redis://, amqp:// (Kombu) or kafka:// for production,
+            file:///some/dir for a broker-less local stand-in; empty for a single process
+            
+    Returns:
+        Keyword arguments for SocketIO
+    """
+    if not message_queue:
+        return {}
+    if message_queue.startswith('file://'):
+        return {'client_manager': FileQueueManager(message_queue)}
+    return {'message_queue': message_queue}
@@ -1,7 +1,17 @@
-from flask import Blueprint, request, jsonify
+import base64
+import heapq
+import json
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from src.main.models import HelpRequest, Volunteer, Elder, Contribution, ChatMessage, Reward, db
+from src.main.classifier import PRIORITY_LEVELS, calculate_request_priority
+from src.main.database import get_pool_stats
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, case, update
+from sqlalchemy.orm import joinedload, selectinload
+from src.main.geocoding import request_coordinates, update_coordinates, update_request_coordinates
+from src.main.ledger import assign_reward, get_balance
+from src.main.matching import MATCH_RANKING_SIZE, get_cache_stats, match_volunteer, rank_matches
+from src.main.workload import adjust_active_request_count
 
 bp = Blueprint('api', __name__)
 
@@ -14,6 +24,16 @@ def health_check():
         'timestamp': datetime.utcnow().isoformat()
     }), 200
 
+@bp.route('/metrics/db-pool', methods=['GET'])
+def db_pool_metrics():
+    """Database connection pool checkout, wait and timeout counters."""
+    return jsonify(get_pool_stats(db.engine)), 200
+
+@bp.route('/metrics/caches', methods=['GET'])
+def cache_metrics():
+    """In-memory match ranking and feature cache counters."""
+    return jsonify(get_cache_stats()), 200
+
 @bp.route('/register/<user_type>', methods=['POST'])
 def register_user(user_type):
     try:
@@ -46,6 +66,7 @@ def register_user(user_type):
                 address=data.get('address'),
                 age=age
             )
+            update_coordinates(elder, elder.address)
             db.session.add(elder)
             db.session.commit()
             return jsonify({'id': elder.id, 'name': elder.name, 'email': elder.email, 'age': elder.age}), 201
@@ -71,6 +92,7 @@ def register_user(user_type):
                 has_car=data.get('has_car', False),
                 availability=data.get('availability', 'available')
             )
+            update_coordinates(volunteer, volunteer.address)
             db.session.add(volunteer)
             db.session.commit()
             return jsonify({'id': volunteer.id, 'name': volunteer.name, 'email': volunteer.email}), 201
@@ -111,79 +133,263 @@ def login_user(user_type):
     user_data['type'] = user_type
     return jsonify(user_data)
 
+MAX_PAGE_SIZE = 200
+MAX_REQUEST_DISTANCE_MILES = 100
+MAX_CLASSIFY_BATCH = 100_000
+CLASSIFY_PARALLEL_MIN_BATCH = 20_000  # Smaller batches finish before a process pool starts
+
+def _encode_cursor(timestamp: datetime, request_id: int) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque cursor string."""
+    raw = f"{timestamp.isoformat()}|{request_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str):
+    """Decode a cursor produced by _encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, request_id = raw.split('|')
+        return datetime.fromisoformat(timestamp), int(request_id)
+    except Exception as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+def _feed_distances(rows, current_volunteer, max_distance):
+    """Compute distances from the viewing volunteer to every pending request in one pass.
+    
+    Distance is only calculated for pending requests when a volunteer is viewing
+    available requests. It is skipped for elders viewing their requests and for
+    assigned requests, where it is not needed.
+    
+    Args:
+        rows: HelpRequest objects, with elders loaded
+        current_volunteer: Volunteer viewing the feed, or None
+        max_distance: Maximum distance in miles for pending requests
+        
+    Returns:
+        (distances, keep) lists aligned with rows: distance in miles (or None)
+        and whether the row is within max_distance
+    """
+    from src.main.utils import distances_within_radius
+    
+    distances = [None] * len(rows)
+    keep = [True] * len(rows)
+    if (current_volunteer is None or current_volunteer.latitude is None
+            or current_volunteer.longitude is None):
+        return distances, keep
+    
+    # Coordinates are stored at write time, so this never waits on a geocoder
+    indexes, latitudes, longitudes = [], [], []
+    for i, r in enumerate(rows):
+        if r.status != 'pending':
+            continue
+        coordinates = request_coordinates(r)
+        if coordinates:
+            indexes.append(i)
+            latitudes.append(coordinates[0])
+            longitudes.append(coordinates[1])
+    
+    if indexes:
+        miles, in_range = distances_within_radius(
+            latitudes, longitudes,
+            current_volunteer.latitude, current_volunteer.longitude,
+            max_distance
+        )
+        for i, distance, within in zip(indexes, miles.tolist(), in_range.tolist()):
+            distances[i] = distance
+            keep[i] = within
+    return distances, keep
+
+def _serialize_feed_request(r: HelpRequest, distance):
+    """Serialize a request for the feed.
+
+    Args:
+        r: HelpRequest with elder, volunteer and rewards already loaded
+        distance: Distance in miles from the viewing volunteer, or None
+
+    Returns:
+        Dictionary for the JSON response
+    """
+    request_data = {
+        'id': r.id,
+        'type': r.request_type,
+        'request_type': r.request_type,
+        'description': r.description,
+        'status': r.status,
+        'address': r.address,
+        'elder_id': r.elder_id,
+        'volunteer_id': r.volunteer_id,
+        'priority': r.priority,
+        'timestamp': r.timestamp.isoformat() if r.timestamp else None,
+        'assigned_at': r.assigned_at.isoformat() if r.assigned_at else None,
+        'completed_at': r.completed_at.isoformat() if r.completed_at else None,
+        'rating': getattr(r, 'rating', None),
+        'rating_comment': getattr(r, 'rating_comment', None)
+    }
+    # Include volunteer information if assigned
+    if r.volunteer_id and r.volunteer:
+        request_data['volunteer_name'] = r.volunteer.name
+        request_data['volunteer_gender'] = getattr(r.volunteer, 'gender', None)
+    # Include elder information
+    if r.elder_id and r.elder:
+        request_data['elder_name'] = r.elder.name
+    
+    # Include reward information if request is completed
+    if r.status == 'completed' and r.volunteer_id:
+        if r.rewards:
+            request_data['reward_amount'] = r.rewards[0].amount
+        else:
+            request_data['reward_amount'] = None
+    
+    request_data['distance_miles'] = distance
+    return request_data
+
 @bp.route('/requests', methods=['GET'])
 def get_requests():
-    """Get all help requests."""
-    from src.main.utils import calculate_distance_miles
-    
+    """Get help requests, optionally filtered and paginated.
+    
+    Query parameters (all optional):
+        status: Comma-separated list of statuses to include
+        request_type: Only requests of this type
+        priority: Comma-separated list of priorities to include (Urgent, High, Medium, Normal)
+        sort: "priority" to list the most urgent requests first (newest first within a
+            priority); not supported with limit
+        elder_id: Only requests created by this senior citizen
+        assigned_volunteer_id: Only requests assigned to this volunteer
+        volunteer_id: Volunteer viewing the feed; distances are calculated for pending requests
+        max_distance: Skip pending requests farther than this many miles (capped at 100)
+        radius_miles: Only pending requests within this many miles of volunteer_id,
+            read through the geo_cell spatial index (requests without a location are left out)
+        nearest: Return only the N pending requests closest to volunteer_id, nearest first
+            (within radius_miles, default 100)
+        limit: Page size. When given, the response is {"requests": [...], "next_cursor": ...}
+        cursor: The next_cursor value returned by the previous page
+    
+    Without limit, all matching requests are returned as a list (newest first).
+    """
     # Get optional volunteer_id from query parameter (for distance calculation)
     volunteer_id_param = request.args.get('volunteer_id', type=int)
     current_volunteer = None
     if volunteer_id_param:
         current_volunteer = Volunteer.query.get(volunteer_id_param)
     
-    reqs = HelpRequest.query.order_by(HelpRequest.timestamp.desc()).all()
-    result = []
-    for r in reqs:
-        # Calculate priority for existing requests
-        priority = calculate_request_priority(r.description or '')
-        request_data = {
-            'id': r.id,
-            'type': r.request_type,
-            'request_type': r.request_type,
-            'description': r.description,
-            'status': r.status,
-            'address': r.address,
-            'elder_id': r.elder_id,
-            'volunteer_id': r.volunteer_id,
-            'priority': priority,
-            'timestamp': r.timestamp.isoformat() if r.timestamp else None,
-            'assigned_at': r.assigned_at.isoformat() if r.assigned_at else None,
-            'completed_at': r.completed_at.isoformat() if r.completed_at else None,
-            'rating': getattr(r, 'rating', None),
-            'rating_comment': getattr(r, 'rating_comment', None)
-        }
-        # Include volunteer information if assigned
-        if r.volunteer_id and r.volunteer:
-            request_data['volunteer_name'] = r.volunteer.name
-            request_data['volunteer_gender'] = getattr(r.volunteer, 'gender', None)
-        # Include elder information
-        if r.elder_id and r.elder:
-            request_data['elder_name'] = r.elder.name
-        
-        # Include reward information if request is completed
-        if r.status == 'completed' and r.volunteer_id:
-            reward = Reward.query.filter_by(request_id=r.id).first()
-            if reward:
-                request_data['reward_amount'] = reward.amount
-            else:
-                request_data['reward_amount'] = None
-        
-        # Calculate distance ONLY for pending requests when volunteer is viewing available requests
-        # This is needed for distance filtering. Skip distance calculation for:
-        # - Elders viewing their requests (not needed)
-        # - Volunteers viewing "My Requests" (already assigned, distance not needed)
-        # - Assigned requests (distance already known or not relevant)
-        distance = None
-        if r.status == 'pending' and current_volunteer and current_volunteer.address:
-            # Only calculate distance for pending requests when volunteer_id is provided
-            # This means a volunteer is viewing available requests and needs distance for filtering
-            if r.elder_id and r.elder:
-                elder_address = r.address or r.elder.address
-                if elder_address:
-                    try:
-                        distance = calculate_distance_miles(elder_address, current_volunteer.address)
-                        # Don't include request if distance is more than 100 miles
-                        if distance and distance > 100:
-                            continue  # Skip this request, don't add it to result
-                    except Exception as e:
-                        print(f"Distance calculation skipped for request {r.id}: {e}")
-                        # If distance calculation fails, don't show the request to be safe
-                        continue
-        
-        request_data['distance_miles'] = distance
-        result.append(request_data)
-    return jsonify(result)
+    max_distance = request.args.get('max_distance', type=float)
+    if max_distance is None or max_distance > MAX_REQUEST_DISTANCE_MILES:
+        max_distance = MAX_REQUEST_DISTANCE_MILES
+    
+    radius_miles = request.args.get('radius_miles', type=float)
+    nearest = request.args.get('nearest', type=int)
+    near_me = radius_miles is not None or nearest is not None
+    if near_me:
+        if current_volunteer is None or current_volunteer.latitude is None or current_volunteer.longitude is None:
+            return jsonify({'error': 'radius_miles and nearest require a volunteer_id with a known location'}), 400
+        if nearest is not None and nearest < 1:
+            return jsonify({'error': 'nearest must be a positive integer'}), 400
+        if radius_miles is not None:
+            max_distance = min(max_distance, radius_miles)
+    
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    if limit is not None:
+        limit = min(limit, MAX_PAGE_SIZE)
+    
+    sort = request.args.get('sort')
+    if sort not in (None, 'priority'):
+        return jsonify({'error': 'sort must be priority'}), 400
+    if sort and limit is not None:
+        return jsonify({'error': 'sort=priority cannot be combined with limit'}), 400
+    
+    position = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            position = _decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    # Load elder/volunteer in the same query and all rewards in one extra query,
+    # so serializing the feed never issues per-row lazy loads
+    query = HelpRequest.query.options(joinedload(HelpRequest.elder),
+                                      joinedload(HelpRequest.volunteer),
+                                      selectinload(HelpRequest.rewards))
+    
+    status_param = request.args.get('status')
+    if status_param:
+        statuses = [s.strip() for s in status_param.split(',') if s.strip()]
+        query = query.filter(HelpRequest.status.in_(statuses))
+    request_type = request.args.get('request_type')
+    if request_type:
+        query = query.filter(HelpRequest.request_type == request_type)
+    priority_param = request.args.get('priority')
+    if priority_param:
+        priorities = [p.strip() for p in priority_param.split(',') if p.strip()]
+        query = query.filter(HelpRequest.priority.in_(priorities))
+    elder_id = request.args.get('elder_id', type=int)
+    if elder_id:
+        query = query.filter(HelpRequest.elder_id == elder_id)
+    assigned_volunteer_id = request.args.get('assigned_volunteer_id', type=int)
+    if assigned_volunteer_id:
+        query = query.filter(HelpRequest.volunteer_id == assigned_volunteer_id)
+    
+    if near_me:
+        from src.main.utils import covering_geo_cells
+        # Read only requests in the grid cells around the volunteer; the exact
+        # distance mask below then drops the corners of the covered area
+        query = query.filter(HelpRequest.status == 'pending')
+        cells = covering_geo_cells(current_volunteer.latitude, current_volunteer.longitude, max_distance)
+        if cells is not None:
+            query = query.filter(HelpRequest.geo_cell.in_(cells))
+        else:
+            query = query.filter(HelpRequest.geo_cell.isnot(None))
+    
+    if sort == 'priority':
+        query = query.order_by(case({p: rank for rank, p in enumerate(PRIORITY_LEVELS)},
+                                    value=HelpRequest.priority, else_=len(PRIORITY_LEVELS)))
+    query = query.order_by(HelpRequest.timestamp.desc(), HelpRequest.id.desc())
+    
+    if nearest is not None:
+        rows = query.all()
+        distances, keep = _feed_distances(rows, current_volunteer, max_distance)
+        in_range = [(distance, r) for r, distance, within in zip(rows, distances, keep)
+                    if within and distance is not None]
+        closest = heapq.nsmallest(nearest, in_range, key=lambda item: item[0])
+        return jsonify([_serialize_feed_request(r, distance) for distance, r in closest])
+    
+    if limit is None:
+        rows = query.all()
+        distances, keep = _feed_distances(rows, current_volunteer, max_distance)
+        return jsonify([_serialize_feed_request(r, distance)
+                        for r, distance, within in zip(rows, distances, keep) if within])
+    
+    # Keyset pagination on (timestamp, id). Requests dropped by the distance
+    # filter still advance the cursor, so keep reading until the page is full.
+    page = []
+    exhausted = False
+    while len(page) < limit and not exhausted:
+        batch_query = query
+        if position:
+            timestamp, last_id = position
+            batch_query = batch_query.filter(or_(
+                HelpRequest.timestamp < timestamp,
+                and_(HelpRequest.timestamp == timestamp, HelpRequest.id < last_id)
+            ))
+        batch = batch_query.limit(limit).all()
+        exhausted = len(batch) < limit
+        distances, keep = _feed_distances(batch, current_volunteer, max_distance)
+        for r, distance, within in zip(batch, distances, keep):
+            position = (r.timestamp, r.id)
+            if within:
+                page.append(_serialize_feed_request(r, distance))
+            if len(page) == limit:
+                break
+    
+    next_cursor = None
+    if len(page) == limit and position:
+        next_cursor = _encode_cursor(*position)
+    
+    return jsonify({
+        'requests': page,
+        'next_cursor': next_cursor
+    })
 
 @bp.route('/classify-request', methods=['POST'])
 def classify_request():
@@ -199,6 +405,31 @@ def classify_request():
         'description': description
     }), 200
 
+@bp.route('/classify-request/batch', methods=['POST'])
+def classify_request_batch():
+    """Classify many descriptions at once, streaming results as newline-delimited JSON.
+    
+    Each output line is {"index": i, "request_type": ...} in input order. Batches of
+    CLASSIFY_PARALLEL_MIN_BATCH or more use a process pool when CLASSIFY_PROCESSES > 1.
+    """
+    data = request.json or {}
+    descriptions = data.get('descriptions')
+    if not isinstance(descriptions, list) or not all(d is None or isinstance(d, str) for d in descriptions):
+        return jsonify({'error': 'descriptions must be a list of strings'}), 400
+    if len(descriptions) > MAX_CLASSIFY_BATCH:
+        return jsonify({'error': f'At most {MAX_CLASSIFY_BATCH} descriptions per batch'}), 400
+    
+    processes = current_app.config.get('CLASSIFY_PROCESSES', 0)
+    if len(descriptions) < CLASSIFY_PARALLEL_MIN_BATCH:
+        processes = 0
+    
+    from src.main.classifier import classify_many
+    def generate():
+        for index, request_type in enumerate(classify_many(descriptions, processes=processes)):
+            yield json.dumps({'index': index, 'request_type': request_type}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @bp.route('/request', methods=['POST'])
 def add_request():
     """Create a new help request."""
@@ -210,9 +441,7 @@ def add_request():
         from src.main.utils import classify_request_type
         request_type = classify_request_type(description)
     
-    # Calculate priority based on description keywords
-    priority = calculate_request_priority(description)
-    
+    # Priority is calculated from the description by the column default
     r = HelpRequest(
         elder_id=data.get('elder_id'),
         request_type=request_type or 'Other',
@@ -220,6 +449,7 @@ def add_request():
         address=data.get('address'),
         status='pending'  # Set to pending, waiting for volunteer to accept
     )
+    update_request_coordinates(r)
     db.session.add(r)
     db.session.commit()
     
@@ -228,7 +458,7 @@ def add_request():
         'status': r.status,
         'request_type': r.request_type,
         'description': r.description,
-        'priority': priority
+        'priority': r.priority
     }), 201
 
 def calculate_reward_amount(request: HelpRequest) -> float:
@@ -241,7 +471,7 @@ def calculate_reward_amount(request: HelpRequest) -> float:
         Reward amount in dollars
     """
     # Base reward by priority
-    priority = calculate_request_priority(request.description or '')
+    priority = request.priority or calculate_request_priority(request.description)
     priority_rewards = {
         'Urgent': 50.0,
         'High': 30.0,
@@ -271,18 +501,12 @@ def calculate_reward_amount(request: HelpRequest) -> float:
 @bp.route('/contributions/balance', methods=['GET'])
 def get_donation_balance():
     """Get total donation balance (contributions without specific volunteer assignment)."""
-    # Sum all contributions that are not assigned to a specific volunteer
-    general_contributions = Contribution.query.filter_by(volunteer_id=None).all()
-    total_balance = sum(c.amount for c in general_contributions)
-    
-    # Also subtract rewards already given
-    total_rewards = sum(r.amount for r in Reward.query.all())
-    available_balance = total_balance - total_rewards
+    balance = get_balance()
     
     return jsonify({
-        'total_donations': round(total_balance, 2),
-        'total_rewards_given': round(total_rewards, 2),
-        'available_balance': round(max(0, available_balance), 2)  # Don't go negative
+        'total_donations': round(balance['total_donations'], 2),
+        'total_rewards_given': round(balance['total_rewards_given'], 2),
+        'available_balance': round(max(0, balance['available_balance']), 2)  # Don't go negative
     }), 200
 
 @bp.route('/request/<int:request_id>/accept', methods=['POST'])
@@ -296,51 +520,31 @@ def accept_request(request_id):
     if not volunteer_id:
         return jsonify({'error': 'Volunteer ID is required'}), 400
     
-    help_request = HelpRequest.query.get(request_id)
-    if not help_request:
-        return jsonify({'error': 'Request not found'}), 404
-    
-    if help_request.status != 'pending':
-        return jsonify({'error': 'Request is not available for assignment'}), 400
-    
-    # Assign volunteer to request (rewards will be assigned when request is completed)
-    help_request.volunteer_id = volunteer_id
-    help_request.status = 'assigned'
-    help_request.assigned_at = datetime.utcnow()
+    # Compare-and-set: the UPDATE only matches while the request is still pending,
+    # so when many volunteers accept at once exactly one of them wins
+    result = db.session.execute(
+        update(HelpRequest)
+        .where(HelpRequest.id == request_id, HelpRequest.status == 'pending')
+        .values(volunteer_id=volunteer_id, status='assigned', assigned_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        # The bulk UPDATE bypasses the ORM, so count the new assignment here, in the same transaction
+        adjust_active_request_count(volunteer_id, 1)
     db.session.commit()
     
+    if result.rowcount == 0:
+        status = db.session.query(HelpRequest.status).filter_by(id=request_id).scalar()
+        if status is None:
+            return jsonify({'error': 'Request not found'}), 404
+        return jsonify({'error': 'Request is not available for assignment', 'status': status}), 409
+    
     return jsonify({
-        'id': help_request.id,
-        'status': help_request.status,
-        'volunteer_id': help_request.volunteer_id
+        'id': request_id,
+        'status': 'assigned',
+        'volunteer_id': volunteer_id
     }), 200
 
-def calculate_request_priority(description: str) -> str:
-    """Calculate request priority based on description keywords."""
-    if not description:
-        return 'Normal'
-    
-    desc_lower = description.lower()
-    
-    # High priority keywords (urgent/emergency situations)
-    high_priority_keywords = ['urgent', 'emergency', 'asap', 'as soon as possible', 'immediately', 
-                             'critical', 'need help now', 'quickly', 'right away', 'right now',
-                             'urgently', 'immediate']
-    
-    # Medium priority keywords (time-sensitive but not emergency)
-    medium_priority_keywords = ['soon', 'today', 'needed', 'please help', 'as soon as',
-                               'when possible', 'need assistance']
-    
-    # Check for high priority first (most critical)
-    if any(keyword in desc_lower for keyword in high_priority_keywords):
-        return 'High'
-    
-    # Check for medium priority
-    if any(keyword in desc_lower for keyword in medium_priority_keywords):
-        return 'Medium'
-    
-    return 'Normal'
-
 @bp.route('/request/<int:request_id>/assign', methods=['POST'])
 def assign_volunteer(request_id):
     """Assign a volunteer to a help request. If no volunteer_id provided, uses smart matching."""
@@ -351,11 +555,12 @@ def assign_volunteer(request_id):
     if not help_request:
         return jsonify({'error': 'Request not found'}), 404
     
-    # If no volunteer_id provided, use smart matching
+    # If no volunteer_id provided, use smart matching, skipping volunteers who already declined
     if not volunteer_id:
-        from src.main.utils import smart_match_volunteer
-        volunteers = Volunteer.query.all()
-        match_result = smart_match_volunteer(help_request, volunteers)
+        exclude = data.get('exclude_volunteer_ids') or []
+        if not isinstance(exclude, list):
+            return jsonify({'error': 'exclude_volunteer_ids must be a list'}), 400
+        match_result = match_volunteer(help_request, exclude=exclude)
         
         if not match_result:
             return jsonify({'error': 'No suitable volunteer found'}), 404
@@ -382,31 +587,44 @@ def assign_volunteer(request_id):
         'assigned_at': help_request.assigned_at.isoformat()
     }), 200
 
+def _serialize_match(volunteer, score, breakdown):
+    """Serialize a scored volunteer match to a dictionary."""
+    return {
+        'volunteer_id': volunteer.id,
+        'volunteer_name': volunteer.name,
+        'volunteer_email': volunteer.email,
+        'volunteer_phone': volunteer.phone,
+        'volunteer_address': volunteer.address,
+        'match_score': round(score, 3),
+        'match_breakdown': breakdown
+    }
+
 @bp.route('/request/<int:request_id>/smart-match', methods=['POST'])
 def smart_match_request(request_id):
-    """Find the best matching volunteer for a request using AI-like smart matching."""
+    """Find the best matching volunteer for a request using AI-like smart matching.
+    
+    With ?top=N, returns the N best matches (at most MATCH_RANKING_SIZE) instead.
+    """
     help_request = HelpRequest.query.get(request_id)
     if not help_request:
         return jsonify({'error': 'Request not found'}), 404
     
-    from src.main.utils import smart_match_volunteer
-    volunteers = Volunteer.query.all()
-    match_result = smart_match_volunteer(help_request, volunteers)
+    top = request.args.get('top', type=int)
+    if top is not None:
+        if top < 1:
+            return jsonify({'error': 'top must be a positive integer'}), 400
+        matches = rank_matches(help_request, min(top, MATCH_RANKING_SIZE))
+        return jsonify({
+            'request_id': help_request.id,
+            'matches': [_serialize_match(*match) for match in matches]
+        }), 200
+    
+    match_result = match_volunteer(help_request)
     
     if not match_result:
         return jsonify({'error': 'No suitable volunteer found'}), 404
     
-    best_volunteer, score, breakdown = match_result
-    
-    return jsonify({
-        'volunteer_id': best_volunteer.id,
-        'volunteer_name': best_volunteer.name,
-        'volunteer_email': best_volunteer.email,
-        'volunteer_phone': best_volunteer.phone,
-        'volunteer_address': best_volunteer.address,
-        'match_score': round(score, 3),
-        'match_breakdown': breakdown
-    }), 200
+    return jsonify(_serialize_match(*match_result)), 200
 
 @bp.route('/request/<int:request_id>', methods=['PUT'])
 def update_request(request_id):
@@ -429,6 +647,7 @@ def update_request(request_id):
         if not description:
             return jsonify({'error': 'Description cannot be empty'}), 400
         help_request.description = description
+        help_request.priority = calculate_request_priority(description)
         # Reclassify request type if description changed and type not explicitly provided
         if 'type' not in data:
             from src.main.utils import classify_request_type
@@ -437,6 +656,7 @@ def update_request(request_id):
     # Update address if provided
     if 'address' in data:
         help_request.address = data.get('address', '').strip() or None
+        update_request_coordinates(help_request)
     
     # Update request type if explicitly provided
     if 'type' in data:
@@ -444,29 +664,22 @@ def update_request(request_id):
         if request_type:
             help_request.request_type = request_type
     
-    # Priority is calculated from description, but can be overridden
-    # If priority is provided, we'll use it; otherwise calculate from description
-    priority = None
+    # Priority is calculated from the description, but can be overridden
     if 'priority' in data:
         priority = data.get('priority', '').strip()
-        if priority not in ['Urgent', 'High', 'Medium', 'Normal']:
+        if priority not in PRIORITY_LEVELS:
             return jsonify({'error': 'Priority must be Urgent, High, Medium, or Normal'}), 400
-    else:
-        # Calculate priority from description if not provided
-        priority = calculate_request_priority(help_request.description or '')
+        help_request.priority = priority
     
     try:
         db.session.commit()
         
-        # Use provided priority or calculated one
-        final_priority = priority if priority else calculate_request_priority(help_request.description or '')
-        
         return jsonify({
             'id': help_request.id,
             'description': help_request.description,
             'request_type': help_request.request_type,
             'address': help_request.address,
-            'priority': final_priority,
+            'priority': help_request.priority,
             'status': help_request.status,
             'timestamp': help_request.timestamp.isoformat() if help_request.timestamp else None
         }), 200
@@ -496,27 +709,10 @@ def update_request_status(request_id):
     if new_status == 'completed' and wants_reward and help_request.volunteer_id:
         reward_amount = calculate_reward_amount(help_request)
         
-        # Check if we have enough balance
-        general_contributions = Contribution.query.filter_by(volunteer_id=None).all()
-        total_balance = sum(c.amount for c in general_contributions)
-        total_rewards = sum(r.amount for r in Reward.query.all())
-        available_balance = total_balance - total_rewards
-        
-        # Check if reward already exists for this request
-        existing_reward = Reward.query.filter_by(request_id=request_id).first()
-        
-        if not existing_reward and available_balance >= reward_amount:
-            # Create reward record
-            reward = Reward(
-                request_id=request_id,
-                volunteer_id=help_request.volunteer_id,
-                amount=reward_amount
-            )
-            db.session.add(reward)
-            reward_assigned = True
-        elif existing_reward:
-            # Reward already exists
-            reward_amount = existing_reward.amount
+        # Checks the balance and creates the reward atomically; None if the pool can't cover it
+        reward = assign_reward(request_id, help_request.volunteer_id, reward_amount)
+        if reward is not None:
+            reward_amount = reward.amount
             reward_assigned = True
     
     help_request.status = new_status
@@ -549,6 +745,7 @@ def add_volunteer():
         phone=data.get('phone'),
         address=data.get('address')
     )
+    update_coordinates(v, v.address)
     db.session.add(v)
     db.session.commit()
     return jsonify({'id': v.id})
@@ -576,7 +773,9 @@ def update_elder(elder_id):
     elder.name = data.get('name', elder.name)
     elder.email = data.get('email', elder.email)
     elder.phone = data.get('phone', elder.phone)
-    elder.address = data.get('address', elder.address)
+    if data.get('address', elder.address) != elder.address:
+        elder.address = data['address']
+        update_coordinates(elder, elder.address)
     if 'age' in data:
         age = data['age']
         if age < 60:
@@ -599,7 +798,9 @@ def update_volunteer(volunteer_id):
     volunteer.name = data.get('name', volunteer.name)
     volunteer.email = data.get('email', volunteer.email)
     volunteer.phone = data.get('phone', volunteer.phone)
-    volunteer.address = data.get('address', volunteer.address)
+    if data.get('address', volunteer.address) != volunteer.address:
+        volunteer.address = data['address']
+        update_coordinates(volunteer, volunteer.address)
     volunteer.skills = data.get('skills', volunteer.skills)
     volunteer.availability = data.get('availability', volunteer.availability)
     
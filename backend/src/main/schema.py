@@ -0,0 +1,105 @@
+"""
+Versioned schema management.
+
+The schema is owned by the Alembic revisions in ``backend/migrations`` (driven
+through Flask-Migrate). Upgrades run as a deploy step (``python migrate_db.py``),
+never at app startup: ``ensure_schema()`` only compares the database revision
+with the migration head, which is a single-row read.
+"""
+import os
+from alembic import context, op
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+import sqlalchemy as sa
+from src.main.models import db
+
+MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'migrations'))
+
+_script_directory = None
+
+def get_script_directory():
+    """Load the migration scripts once per process."""
+    global _script_directory
+    if _script_directory is None:
+        config = Config()
+        config.set_main_option('script_location', MIGRATIONS_DIR)
+        _script_directory = ScriptDirectory.from_config(config)
+    return _script_directory
+
+def get_head_revisions():
+    """Return the revision(s) the code expects the database to be at."""
+    return frozenset(get_script_directory().get_heads())
+
+def get_current_revisions(connection):
+    """Return the revision(s) recorded in the database's alembic_version table."""
+    return frozenset(MigrationContext.configure(connection).get_current_heads())
+
+def ensure_schema():
+    """Check the database is at the migration head without migrating it.
+
+    A brand-new database (no tables at all) is created directly at head, since there
+    is nothing to lock or migrate. Any other database that is behind is left alone
+    and reported, so schema work never runs on the serving path.
+
+    Returns:
+        True if the schema is at head, False if ``python migrate_db.py`` needs to run.
+    """
+    with db.engine.connect() as connection:
+        current = get_current_revisions(connection)
+        head = get_head_revisions()
+        if current == head:
+            return True
+        if not current and not sa.inspect(connection).get_table_names():
+            db.metadata.create_all(connection)
+            MigrationContext.configure(connection).stamp(get_script_directory(), 'heads')
+            connection.commit()
+            return True
+    print(f"⚠️ Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+          f"expected {', '.join(sorted(head))}. Run `python migrate_db.py` to upgrade.")
+    return False
+
+# Helpers for revision scripts. Our databases predate versioned migrations, so the
+# baseline revision has to reconcile whatever an older create_all()/migrate_db.py left.
+
+def _existing_columns(table_name):
+    """Return the column names of a table, or None if it does not exist yet."""
+    if context.is_offline_mode():
+        return None  # Offline SQL scripts are generated for an empty database
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table_name):
+        return None
+    return {column['name'] for column in inspector.get_columns(table_name)}
+
+def create_or_update_table(table_name, *columns):
+    """Create a table, or add the columns an existing copy of it is missing."""
+    existing = _existing_columns(table_name)
+    if existing is None:
+        op.create_table(table_name, *columns)
+        return
+    for column in columns:
+        if isinstance(column, sa.Column) and column.name not in existing:
+            op.add_column(table_name, column)
+
+def create_index_online(index_name, table_name, columns, unique=False):
+    """Create an index without blocking writes to the table.
+
+    On PostgreSQL this runs ``CREATE INDEX CONCURRENTLY``, which cannot run inside a
+    transaction, so it is issued in an autocommit block. SQLite has no online index
+    build; a plain ``CREATE INDEX`` is used there.
+    """
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(index_name, table_name, columns, unique=unique,
+                            if_not_exists=True, postgresql_concurrently=True)
+    else:
+        op.create_index(index_name, table_name, columns, unique=unique, if_not_exists=True)
+
+def drop_index_online(index_name, table_name):
+    """Drop an index without blocking writes (``DROP INDEX CONCURRENTLY`` on PostgreSQL)."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(index_name, table_name=table_name, if_exists=True,
+                          postgresql_concurrently=True)
+    else:
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
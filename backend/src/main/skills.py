@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from src.main.models import Skill, Volunteer, volunteer_skill, db
+from src.main.utils import MATCHING_SKILLS, parse_skills
+
+_skill = Skill.__table__
+
+def _skill_ids(connection, names: Iterable[str]) -> Dict[str, int]:
+    """Return ids for skill names, creating the skills that don't exist yet."""
+    names = sorted(set(names))
+    if not names:
+        return {}
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        # Concurrent writers may add the same new skill; whoever loses just reads it back
+        connection.execute(insert(_skill).on_conflict_do_nothing(index_elements=['name']),
+                           [{'name': name} for name in names])
+    else:
+        existing = set(connection.execute(select(_skill.c.name).where(_skill.c.name.in_(names))).scalars())
+        missing = [{'name': name} for name in names if name not in existing]
+        if missing:
+            connection.execute(_skill.insert(), missing)
+    rows = connection.execute(select(_skill.c.name, _skill.c.id).where(_skill.c.name.in_(names)))
+    return dict(rows.all())
+
+def _write_volunteer_skills(connection, volunteer_id: int, skills_string: Optional[str]) -> None:
+    """Replace a volunteer's rows in volunteer_skill with the skills parsed from skills_string."""
+    skill_ids = _skill_ids(connection, parse_skills(skills_string))
+    connection.execute(volunteer_skill.delete().where(volunteer_skill.c.volunteer_id == volunteer_id))
+    if skill_ids:
+        connection.execute(volunteer_skill.insert(), [
+            {'volunteer_id': volunteer_id, 'skill_id': skill_id} for skill_id in skill_ids.values()
+        ])
+
+@event.listens_for(Session, 'before_flush')
+def _collect_skill_changes(session, flush_context, instances):
+    """Note volunteers whose skills are being written, and unlink volunteers being deleted."""
+    changed = [obj for obj in session.new if isinstance(obj, Volunteer)]
+    changed += [obj for obj in session.dirty
+                if isinstance(obj, Volunteer) and inspect(obj).attrs.skills.history.has_changes()]
+    session.info['skill_changes'] = changed
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, Volunteer)]
+    if deleted_ids:
+        session.connection().execute(volunteer_skill.delete().where(volunteer_skill.c.volunteer_id.in_(deleted_ids)))
+
+@event.listens_for(Session, 'after_flush')
+def _update_volunteer_skills(session, flush_context):
+    """Rewrite the skill rows of volunteers flushed with new skills, in the same transaction."""
+    changed = session.info.pop('skill_changes', [])
+    if not changed:
+        return
+    connection = session.connection()
+    for volunteer in changed:
+        _write_volunteer_skills(connection, volunteer.id, volunteer.skills)
+
+def volunteers_with_skill_for(request_type: Optional[str]):
+    """Subquery of ids of volunteers listing the request type or a related skill.
+
+    Reads the volunteer_skill index by skill, so it never scans volunteers.
+
+    Args:
+        request_type: Type of help request
+
+    Returns:
+        SELECT of volunteer ids, or None if request_type is empty
+    """
+    request_lower = (request_type or '').lower()
+    if not request_lower:
+        return None
+    names = MATCHING_SKILLS.get(request_lower, frozenset({request_lower}))
+    return (select(volunteer_skill.c.volunteer_id)
+            .join(_skill, _skill.c.id == volunteer_skill.c.skill_id)
+            .where(_skill.c.name.in_(sorted(names))))
+
+def rebuild_volunteer_skills() -> int:
+    """Rebuild every volunteer's skill rows from their skills text and commit.
+
+    Returns:
+        Number of volunteers processed
+    """
+    connection = db.session.connection()
+    rows = connection.execute(select(Volunteer.id, Volunteer.skills)).all()
+    for volunteer_id, skills_string in rows:
+        _write_volunteer_skills(connection, volunteer_id, skills_string)
+    db.session.commit()
+    return len(rows)
@@ -1,8 +1,14 @@
-from typing import List, Tuple, Optional
+from typing import AbstractSet, Iterable, List, Optional, Sequence, Tuple
 from src.main.models import Volunteer, HelpRequest
+from src.main.classifier import request_classifier
+import copy
+import heapq
+import math
 import re
-from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
 
 def calculate_address_similarity(address1: Optional[str], address2: Optional[str]) -> float:
     """Calculate similarity score between two addresses.
@@ -49,6 +55,82 @@ def calculate_address_similarity(address1: Optional[str], address2: Optional[str
     
     return min(1.0, similarity)
 
+def address_fingerprint(address: Optional[str]) -> Optional[str]:
+    """Compute an address' fingerprint: the words calculate_address_similarity compares.
+    
+    Stored alongside addresses (address_fingerprint columns), so comparing two
+    addresses never lowercases or re-tokenizes them.
+    
+    Args:
+        address: Address string
+        
+    Returns:
+        Lowercase address words joined by single spaces ('' if it has none), or None if address is empty
+    """
+    if not address:
+        return None
+    return ' '.join(address.lower().replace(',', ' ').split())
+
+def address_area_keys(fingerprint: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Return the (city, state) keys of an address fingerprint: its second-to-last and last words.
+    
+    These are the words calculate_address_similarity boosts on, and are indexed
+    on volunteers to find those in the same area.
+    """
+    words = fingerprint.split(' ') if fingerprint else []
+    return (words[-2] if len(words) > 1 else None), (words[-1] if words else None)
+
+def fingerprint_similarity(fingerprint1: str, fingerprint2: str) -> float:
+    """calculate_address_similarity of two addresses, from their non-empty fingerprints.
+    
+    Args:
+        fingerprint1: First address fingerprint (see address_fingerprint)
+        fingerprint2: Second address fingerprint
+        
+    Returns:
+        Score between 0.0 and 1.0, the same as calculate_address_similarity's
+    """
+    # The same words in the same order share every word and both area words, so score 1.0 like an exact match
+    if fingerprint1 == fingerprint2:
+        return 1.0
+    
+    addr1_parts = fingerprint1.split(' ')
+    addr2_parts = fingerprint2.split(' ')
+    words1 = set(addr1_parts)
+    words2 = set(addr2_parts)
+    common_words = words1 & words2
+    if not common_words:
+        return 0.2
+    
+    similarity = len(common_words) / len(words1 | words2)
+    if addr1_parts[-1] == addr2_parts[-1]:
+        similarity = min(1.0, similarity + 0.3)
+    if len(addr1_parts) > 1 and len(addr2_parts) > 1:
+        if addr1_parts[-2] == addr2_parts[-2]:
+            similarity = min(1.0, similarity + 0.2)
+    
+    return min(1.0, similarity)
+
+# Skills related to each request type (lowercase)
+SKILL_MAPPING = {
+    'groceries': ['shopping', 'groceries', 'errands', 'delivery'],
+    'medical assistance': ['medical', 'healthcare', 'nursing', 'first aid', 'medicine'],
+    'transportation': ['driving', 'transportation', 'transport', 'vehicle'],
+    'commute assistance': ['driving', 'transportation', 'commute', 'vehicle'],
+    'house shifting': ['moving', 'lifting', 'heavy lifting', 'furniture', 'shifting'],
+    'home maintenance': ['repair', 'maintenance', 'plumbing', 'electrical', 'carpentry', 'handyman'],
+    'companionship': ['companionship', 'social', 'conversation', 'visiting', 'friendly'],
+    'technology help': ['technology', 'computer', 'tech', 'digital', 'smartphone', 'internet']
+}
+
+# Built once from SKILL_MAPPING: request type -> related skills, and request type -> every
+# skill that matches it (the type itself or a related skill), for indexed lookups
+RELATED_SKILLS = {request_type: frozenset(skills) for request_type, skills in SKILL_MAPPING.items()}
+MATCHING_SKILLS = {request_type: skills | {request_type} for request_type, skills in RELATED_SKILLS.items()}
+
+# Request statuses that count towards a volunteer's workload
+ACTIVE_REQUEST_STATUSES = ('pending', 'assigned', 'in_progress')
+
 def parse_skills(skills_string: Optional[str]) -> List[str]:
     """Parse comma-separated skills string into a list.
     
@@ -72,51 +154,55 @@ def calculate_skill_match_score(request_type: str, volunteer_skills: Optional[st
     Returns:
         Score between 0.0 and 1.0 (1.0 = perfect match)
     """
-    if not volunteer_skills:
+    return skill_set_match_score(request_type, frozenset(parse_skills(volunteer_skills)))
+
+def skill_set_match_score(request_type: str, skills: AbstractSet[str]) -> float:
+    """Calculate skill match score from a volunteer's already-parsed skills.
+    
+    Args:
+        request_type: Type of help request
+        skills: Lowercase skill names (see parse_skills, Volunteer.skill_set)
+        
+    Returns:
+        Score between 0.0 and 1.0 (1.0 = perfect match)
+    """
+    if not skills:
         return 0.3  # Base score for volunteers without listed skills
     
     request_lower = request_type.lower()
-    volunteer_skill_list = parse_skills(volunteer_skills)
     
     # Direct match
-    if request_lower in volunteer_skill_list:
+    if request_lower in skills:
         return 1.0
     
-    # Skill mapping for common request types
-    skill_mapping = {
-        'groceries': ['shopping', 'groceries', 'errands', 'delivery'],
-        'medical assistance': ['medical', 'healthcare', 'nursing', 'first aid', 'medicine'],
-        'transportation': ['driving', 'transportation', 'transport', 'vehicle'],
-        'commute assistance': ['driving', 'transportation', 'commute', 'vehicle'],
-        'house shifting': ['moving', 'lifting', 'heavy lifting', 'furniture', 'shifting'],
-        'home maintenance': ['repair', 'maintenance', 'plumbing', 'electrical', 'carpentry', 'handyman'],
-        'companionship': ['companionship', 'social', 'conversation', 'visiting', 'friendly'],
-        'technology help': ['technology', 'computer', 'tech', 'digital', 'smartphone', 'internet']
-    }
-    
     # Check for related skills
-    related_skills = skill_mapping.get(request_lower, [])
-    for skill in volunteer_skill_list:
-        if skill in related_skills:
-            return 0.8  # Good match with related skill
+    if not RELATED_SKILLS.get(request_lower, frozenset()).isdisjoint(skills):
+        return 0.8  # Good match with related skill
     
     # Partial match (contains keyword)
-    for skill in volunteer_skill_list:
+    for skill in skills:
         if skill in request_lower or request_lower in skill:
             return 0.6  # Partial match
     
     return 0.3  # Base score - no specific match but volunteer is available
 
-def calculate_location_score(request_address: Optional[str], volunteer_address: Optional[str]) -> float:
+def calculate_location_score(request_address: Optional[str], volunteer_address: Optional[str],
+                             request_fingerprint: Optional[str] = None,
+                             volunteer_fingerprint: Optional[str] = None) -> float:
     """Calculate location score based on address similarity.
     
     Args:
         request_address: Request address string
         volunteer_address: Volunteer address string
+        request_fingerprint: Stored fingerprint of request_address, if known
+        volunteer_fingerprint: Stored fingerprint of volunteer_address, if known
         
     Returns:
         Score between 0.0 and 1.0 (1.0 = same area, 0.0 = different area)
     """
+    if request_fingerprint and volunteer_fingerprint:
+        return fingerprint_similarity(request_fingerprint, volunteer_fingerprint)
+    # No words to compare (or not fingerprinted): only the raw strings can tell an exact match
     return calculate_address_similarity(request_address, volunteer_address)
 
 def calculate_availability_score(availability: Optional[str]) -> float:
@@ -150,10 +236,8 @@ def calculate_workload_score(volunteer: Volunteer) -> float:
     Returns:
         Score between 0.0 and 1.0 (1.0 = no active requests, 0.0 = many active requests)
     """
-    # Count active requests (pending, assigned, in_progress)
-    active_requests = [req for req in volunteer.assigned_requests 
-                       if req.status in ['pending', 'assigned', 'in_progress']]
-    active_count = len(active_requests)
+    # Active requests (pending, assigned, in_progress), counted as they change (see workload.py)
+    active_count = volunteer.active_request_count or 0
     
     # Score decreases as active requests increase
     # 0 requests = 1.0, 1 request = 0.8, 2 requests = 0.6, 3+ requests = 0.4
@@ -166,6 +250,309 @@ def calculate_workload_score(volunteer: Volunteer) -> float:
     else:
         return 0.4
 
+# Matches scoring at or below this are not suggested
+MIN_MATCH_SCORE = 0.3
+
+def score_volunteer(request_address: Optional[str], request_type: str, volunteer: Volunteer,
+                    request_fingerprint: Optional[str] = None) -> Tuple[float, dict]:
+    """Score one volunteer for a request.
+    
+    Args:
+        request_address: Request address (or the elder's, if the request has none)
+        request_type: Type of help request
+        volunteer: Volunteer with skill_set loaded
+        request_fingerprint: Stored fingerprint of request_address, if known
+        
+    Returns:
+        Tuple of (total_score, score_breakdown)
+    """
+    # Calculate individual scores
+    location_score = calculate_location_score(request_address, volunteer.address,
+                                              request_fingerprint, volunteer.address_fingerprint)
+    skill_score = skill_set_match_score(request_type, frozenset(skill.name for skill in volunteer.skill_set))
+    availability_score = calculate_availability_score(volunteer.availability)
+    workload_score = calculate_workload_score(volunteer)
+    
+    # Weighted total score
+    total_score = (
+        location_score * 0.40 +      # 40% weight on address similarity
+        skill_score * 0.35 +          # 35% weight on skills
+        availability_score * 0.15 +   # 15% weight on availability
+        workload_score * 0.10         # 10% weight on workload
+    )
+    
+    # Store breakdown for debugging/logging
+    score_breakdown = {
+        'location': location_score,
+        'skills': skill_score,
+        'availability': availability_score,
+        'workload': workload_score,
+        'total': round(total_score, 3)
+    }
+    return total_score, score_breakdown
+
+# Candidate lists at least this long are scored with VolunteerFeatures selected from arrays
+# built once for every volunteer (see matching.candidate_features and benchmarks/bench_scoring.py)
+VECTORIZED_SCORING_MIN = 1_000
+
+# Weights of the location, skill, availability and workload scores (as in score_volunteer)
+MATCH_WEIGHTS = np.array([0.40, 0.35, 0.15, 0.10])
+
+def _address_key(address: str, fingerprint: Optional[str]):
+    """Key under which addresses score 1.0 against each other (see fingerprint_similarity)."""
+    # Addresses without words only match when their raw strings do
+    return fingerprint if fingerprint else ('', address.lower().strip())
+
+class VolunteerFeatures:
+    """Volunteer features as NumPy arrays, for scoring many volunteers against a request at once.
+    
+    Addresses are kept as the token ids of their fingerprints (flat arrays of
+    (volunteer, token) pairs, plus each volunteer's last two tokens) and skills
+    as (volunteer, skill id) pairs, so every score in score_volunteer becomes a
+    handful of array operations. Scores are identical to score_volunteer's. Building
+    costs about as much as one score_volunteer loop, so build once and score any
+    number of requests against the same volunteers (with_status() refreshes the
+    cheap, fast-changing availability and workload scores, and select() narrows
+    them to a candidate list).
+    """
+    
+    def __init__(self, addresses: Sequence[Optional[str]], skill_names: Sequence[Iterable[str]],
+                 availabilities: Sequence[Optional[str]], active_counts: Sequence[Optional[int]],
+                 fingerprints: Optional[Sequence[Optional[str]]] = None):
+        """Precompute the features of len(addresses) volunteers.
+        
+        Args:
+            addresses: Each volunteer's address
+            skill_names: Each volunteer's lowercase skill names (see parse_skills)
+            availabilities: Each volunteer's availability
+            active_counts: Each volunteer's active request count
+            fingerprints: Each volunteer's stored address fingerprint; computed from addresses if omitted
+        """
+        size = len(addresses)
+        self.size = size
+        self._address_ids = {}
+        self._token_ids = {}
+        self._skill_ids = {}
+        self._skill_levels = {}
+        
+        address_ids = np.full(size, -1, dtype=np.int64)  # -1: no address
+        last_tokens = np.full(size, -1, dtype=np.int64)  # -1: fewer tokens than that
+        second_last_tokens = np.full(size, -1, dtype=np.int64)
+        token_counts = np.zeros(size, dtype=np.int64)
+        tokens, token_owners = [], []
+        for i, address in enumerate(addresses):
+            if not address:
+                continue
+            fingerprint = fingerprints[i] if fingerprints is not None else None
+            if fingerprint is None:
+                fingerprint = address_fingerprint(address)
+            address_ids[i] = self._address_ids.setdefault(_address_key(address, fingerprint), len(self._address_ids))
+            parts = [self._token_ids.setdefault(part, len(self._token_ids))
+                     for part in fingerprint.split(' ')] if fingerprint else []
+            unique = set(parts)
+            token_counts[i] = len(unique)
+            tokens.extend(unique)
+            token_owners.extend([i] * len(unique))
+            if parts:
+                last_tokens[i] = parts[-1]
+            if len(parts) > 1:
+                second_last_tokens[i] = parts[-2]
+        self._address_id = address_ids
+        self._last_tokens = last_tokens
+        self._second_last_tokens = second_last_tokens
+        self._token_counts = token_counts
+        self._tokens = np.array(tokens, dtype=np.int64)
+        self._token_owners = np.array(token_owners, dtype=np.int64)
+        
+        skills, skill_owners = [], []
+        for i, names in enumerate(skill_names):
+            unique = {self._skill_ids.setdefault(name, len(self._skill_ids)) for name in names}
+            skills.extend(unique)
+            skill_owners.extend([i] * len(unique))
+        self._skills = np.array(skills, dtype=np.int64)
+        self._skill_owners = np.array(skill_owners, dtype=np.int64)
+        
+        self._set_status(availabilities, active_counts)
+    
+    def _set_status(self, availabilities: Sequence[Optional[str]], active_counts: Sequence[Optional[int]]) -> None:
+        """Compute the availability and workload scores."""
+        # Few distinct values: score each once (this runs on every reuse, see with_status)
+        levels = {availability: calculate_availability_score(availability) for availability in set(availabilities)}
+        self._availability_scores = np.fromiter(map(levels.__getitem__, availabilities), dtype=np.float64,
+                                                count=len(availabilities))
+        counts = np.fromiter((count or 0 for count in active_counts), dtype=np.int64, count=len(active_counts))
+        # Same steps as calculate_workload_score
+        self._workload_scores = np.select([counts == 0, counts == 1, counts == 2], [1.0, 0.8, 0.6], 0.4)
+    
+    def with_status(self, volunteers: Sequence[Volunteer]) -> 'VolunteerFeatures':
+        """Copy of these features with availability and workload re-read from volunteers.
+        
+        The address and skill arrays are shared, not copied, so this costs a read of
+        two attributes per volunteer. volunteers must be the ones the features were
+        built from, in the same order.
+        """
+        refreshed = copy.copy(self)
+        refreshed._set_status([volunteer.availability for volunteer in volunteers],
+                              [volunteer.active_request_count for volunteer in volunteers])
+        return refreshed
+    
+    def select(self, rows: Sequence[int]) -> 'VolunteerFeatures':
+        """Features of just the volunteers at rows, in that order.
+        
+        Costs a few array operations over the token and skill pairs, so features
+        built once for every volunteer can score any candidate list. The token,
+        address and skill vocabularies are shared, not copied.
+        
+        Args:
+            rows: Indexes of the volunteers to keep (each at most once)
+            
+        Returns:
+            VolunteerFeatures of len(rows) volunteers
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        new_index = np.full(self.size, -1, dtype=np.int64)
+        new_index[rows] = np.arange(len(rows))
+        selected = copy.copy(self)
+        selected.size = len(rows)
+        for name in ('_address_id', '_last_tokens', '_second_last_tokens', '_token_counts',
+                     '_availability_scores', '_workload_scores'):
+            setattr(selected, name, getattr(self, name)[rows])
+        for values, owners in (('_tokens', '_token_owners'), ('_skills', '_skill_owners')):
+            owner_rows = new_index[getattr(self, owners)]
+            keep = owner_rows >= 0
+            setattr(selected, values, getattr(self, values)[keep])
+            setattr(selected, owners, owner_rows[keep])
+        return selected
+    
+    @classmethod
+    def from_volunteers(cls, volunteers: Sequence[Volunteer]) -> 'VolunteerFeatures':
+        """Precompute the features of volunteers, which must have skill_set loaded."""
+        return cls([volunteer.address for volunteer in volunteers],
+                   [[skill.name for skill in volunteer.skill_set] for volunteer in volunteers],
+                   [volunteer.availability for volunteer in volunteers],
+                   [volunteer.active_request_count for volunteer in volunteers],
+                   [volunteer.address_fingerprint for volunteer in volunteers])
+    
+    def location_scores(self, request_address: Optional[str], request_fingerprint: Optional[str] = None) -> np.ndarray:
+        """calculate_location_score of every volunteer for one request address (and its fingerprint, if stored)."""
+        if not request_address:
+            return np.full(self.size, 0.5)
+        if request_fingerprint is None:
+            request_fingerprint = address_fingerprint(request_address)
+        parts = request_fingerprint.split(' ') if request_fingerprint else []
+        # Tokens no volunteer has can't be shared, but still count towards the union
+        known = [self._token_ids[part] for part in set(parts) if part in self._token_ids]
+        common = np.bincount(self._token_owners[np.isin(self._tokens, known)], minlength=self.size)
+        union = self._token_counts + len(set(parts)) - common
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = common / union
+        if parts:
+            same_last = self._last_tokens == self._token_ids.get(parts[-1], -2)
+            similarity = np.where(same_last, np.minimum(1.0, similarity + 0.3), similarity)
+        if len(parts) > 1:
+            same_second_last = self._second_last_tokens == self._token_ids.get(parts[-2], -2)
+            similarity = np.where(same_second_last, np.minimum(1.0, similarity + 0.2), similarity)
+        exact = self._address_id == self._address_ids.get(_address_key(request_address, request_fingerprint), -2)
+        return np.select([self._address_id < 0, exact, common == 0], [0.5, 1.0, 0.2], np.minimum(1.0, similarity))
+    
+    def skill_scores(self, request_type: str) -> np.ndarray:
+        """skill_set_match_score of every volunteer for one request type."""
+        scores = np.full(self.size, 0.3)  # Also the score of volunteers without listed skills
+        if not len(self._skills):
+            return scores
+        levels = self._skill_levels.get(request_type)
+        if levels is None:
+            # Score each distinct skill once; a volunteer gets their best skill's score
+            levels = np.array([skill_set_match_score(request_type, {name}) for name in self._skill_ids])
+            self._skill_levels[request_type] = levels
+        np.maximum.at(scores, self._skill_owners, levels[self._skills])
+        return scores
+    
+    def score(self, request_address: Optional[str], request_type: str,
+              request_fingerprint: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every volunteer for a request.
+        
+        Args:
+            request_address: Request address (or the elder's, if the request has none)
+            request_type: Type of help request
+            request_fingerprint: Stored fingerprint of request_address, if known
+            
+        Returns:
+            Tuple of (total scores, 4 x size matrix of location, skill, availability and workload scores)
+        """
+        components = np.vstack([
+            self.location_scores(request_address, request_fingerprint),
+            self.skill_scores(request_type),
+            self._availability_scores,
+            self._workload_scores
+        ])
+        # Summed row by row, in the same order as score_volunteer, so totals match it exactly
+        totals = (components * MATCH_WEIGHTS[:, np.newaxis]).sum(axis=0)
+        return totals, components
+    
+    def rank(self, request_address: Optional[str], request_type: str, k: int,
+             request_fingerprint: Optional[str] = None) -> List[Tuple[int, float, dict]]:
+        """Return the k best-scoring volunteers for a request, best first, like rank_volunteers.
+        
+        Args:
+            request_address: Request address (or the elder's, if the request has none)
+            request_type: Type of help request
+            k: Number of matches to return
+            request_fingerprint: Stored fingerprint of request_address, if known
+            
+        Returns:
+            Up to k tuples of (volunteer index, total_score, score_breakdown), each scoring above MIN_MATCH_SCORE
+        """
+        totals, components = self.score(request_address, request_type, request_fingerprint)
+        eligible = np.flatnonzero(totals > MIN_MATCH_SCORE)
+        if k <= 0 or not len(eligible):
+            return []
+        if len(eligible) > k:
+            # Keep everyone tied with the k-th best, so ties can go to the earliest volunteer
+            kth_best = np.partition(totals[eligible], len(eligible) - k)[len(eligible) - k]
+            eligible = eligible[totals[eligible] >= kth_best]
+        best = eligible[np.lexsort((eligible, -totals[eligible]))][:k]
+        location, skills, availability, workload = components[:, best].tolist()
+        return [(int(index), total, {
+            'location': location[i],
+            'skills': skills[i],
+            'availability': availability[i],
+            'workload': workload[i],
+            'total': round(total, 3)
+        }) for i, (index, total) in enumerate(zip(best.tolist(), totals[best].tolist()))]
+
+def rank_volunteers(request: HelpRequest, volunteers: List[Volunteer], k: int,
+                    features: Optional[VolunteerFeatures] = None) -> List[Tuple[Volunteer, float, dict]]:
+    """Return the k best-scoring volunteers for a request, best first, in one pass.
+    
+    Keeps only k candidates at a time (a bounded heap), so ranking costs
+    O(N log k) instead of sorting all N; given prebuilt features, volunteers are
+    scored in NumPy instead, with the same results. Volunteers with equal scores
+    keep their order in volunteers.
+    
+    Args:
+        request: HelpRequest object
+        volunteers: Candidate volunteers (see matching.find_match_candidates)
+        k: Number of matches to return
+        features: VolunteerFeatures of volunteers, in the same order, if already built
+        
+    Returns:
+        Up to k tuples of (volunteer, total_score, score_breakdown), each scoring above MIN_MATCH_SCORE
+    """
+    # Get elder address if available
+    request_address, request_fingerprint = request.address, request.address_fingerprint
+    if not request_address and request.elder:
+        request_address, request_fingerprint = request.elder.address, request.elder.address_fingerprint
+    
+    if features is not None:
+        ranked = features.rank(request_address, request.request_type, k, request_fingerprint)
+        return [(volunteers[index], total, breakdown) for index, total, breakdown in ranked]
+    
+    scored = ((volunteer,) + score_volunteer(request_address, request.request_type, volunteer, request_fingerprint)
+              for volunteer in volunteers)
+    best = heapq.nlargest(k, scored, key=lambda match: match[1])
+    return [match for match in best if match[1] > MIN_MATCH_SCORE]
+
 def smart_match_volunteer(request: HelpRequest, volunteers: List[Volunteer]) -> Optional[Tuple[Volunteer, float, dict]]:
     """Smart matching algorithm to find the best volunteer for a request.
     
@@ -177,62 +564,20 @@ def smart_match_volunteer(request: HelpRequest, volunteers: List[Volunteer]) ->
     
     Args:
         request: HelpRequest object
-        volunteers: List of available volunteers
+        volunteers: List of available volunteers (see matching.find_match_candidates)
         
     Returns:
         Tuple of (best_volunteer, total_score, score_breakdown) or None if no suitable match
     """
-    if not volunteers:
-        return None
-    
-    best_match = None
-    best_score = -1.0
-    best_breakdown = {}
-    
-    # Get elder address if available
-    request_address = request.address
-    if not request_address and request.elder:
-        request_address = request.elder.address
-    
-    for volunteer in volunteers:
-        # Calculate individual scores
-        location_score = calculate_location_score(request_address, volunteer.address)
-        skill_score = calculate_skill_match_score(request.request_type, volunteer.skills)
-        availability_score = calculate_availability_score(volunteer.availability)
-        workload_score = calculate_workload_score(volunteer)
-        
-        # Weighted total score
-        total_score = (
-            location_score * 0.40 +      # 40% weight on address similarity
-            skill_score * 0.35 +          # 35% weight on skills
-            availability_score * 0.15 +   # 15% weight on availability
-            workload_score * 0.10         # 10% weight on workload
-        )
-        
-        # Store breakdown for debugging/logging
-        score_breakdown = {
-            'location': location_score,
-            'skills': skill_score,
-            'availability': availability_score,
-            'workload': workload_score,
-            'total': round(total_score, 3)
-        }
-        
-        if total_score > best_score:
-            best_score = total_score
-            best_match = volunteer
-            best_breakdown = score_breakdown
-    
-    if best_match and best_score > 0.3:  # Minimum threshold
-        return (best_match, best_score, best_breakdown)
-    
-    return None
+    ranked = rank_volunteers(request, volunteers, 1)
+    return ranked[0] if ranked else None
 
 def classify_request_type(description: Optional[str]) -> str:
     """AI-based classification of request type from description.
     
     Uses keyword matching and context analysis to determine the most appropriate
-    request type category.
+    request type category. The keyword tables are compiled once into
+    classifier.request_classifier, which scores every type in one pass.
     
     Args:
         description: Text description of the help request
@@ -240,190 +585,221 @@ def classify_request_type(description: Optional[str]) -> str:
     Returns:
         Request type string (one of the predefined types)
     """
-    if not description:
-        return "Other"
-    
-    description_lower = description.lower()
-    
-    # Check for high-priority phrases first (these override keyword matching)
-    high_priority_phrases = {
-        "Medical Assistance": [
-            "buy medicine", "get medicine", "pick up medicine", "pickup medicine",
-            "buy medication", "get medication", "pick up medication", "pickup medication",
-            "get prescription", "pick up prescription", "pickup prescription",
-            "medical appointment", "doctor appointment", "hospital visit",
-            "medical emergency", "health emergency", "need medical"
-        ],
-        "Transportation": [
-            "need a ride", "need ride", "pick me up", "drop me off",
-            "take me to", "drive me to", "give me a ride"
-        ],
-        "Groceries": [
-            "buy groceries", "get groceries", "grocery shopping", "food shopping",
-            "buy food", "get food", "pick up food", "pickup food"
-        ]
-    }
+    return request_classifier.classify(description)
+
+EARTH_RADIUS_MILES = 3958.7613
+
+def haversine_miles(latitudes, longitudes, origin_latitude: float, origin_longitude: float) -> np.ndarray:
+    """Great-circle distances in miles from one point to many, in a single vectorized pass.
     
-    for req_type, phrases in high_priority_phrases.items():
-        for phrase in phrases:
-            if phrase in description_lower:
-                return req_type
-    
-    # Define keyword patterns for each request type with weights
-    type_patterns = {
-        "Groceries": {
-            "keywords": ["grocery", "groceries", "shopping", "food", "store", "market", "supermarket", 
-                        "milk", "bread", "vegetables", "fruits", "eggs", "meat", "items", "supplies"],
-            "weight": 1.0,
-            "exclude_keywords": ["medicine", "medication", "prescription", "medical", "doctor", "hospital"]  # Exclude medical contexts
-        },
-        "Medical Assistance": {
-            "keywords": ["medical", "doctor", "hospital", "medicine", "medication", "prescription", "health", "healthcare",
-                        "appointment", "clinic", "nurse", "treatment", "symptoms", "pain", "illness", "sick", "unwell",
-                        "emergency", "ambulance", "first aid", "injury", "pharmacy", "pharmacist"],
-            "weight": 1.5,  # Higher weight for medical keywords
-            "priority_keywords": ["medicine", "medication", "prescription", "medical", "doctor", "hospital", "pharmacy"]  # These get extra boost
-        },
-        "Transportation": {
-            "keywords": ["transport", "transportation", "ride", "drive", "car", "vehicle", "taxi", "uber", "lyft",
-                        "airport", "station", "pickup", "drop", "destination", "location", "travel"],
-            "weight": 1.0
-        },
-        "Commute Assistance": {
-            "keywords": ["commute", "commuting", "work", "office", "job", "daily", "routine", "regular", "everyday"],
-            "weight": 0.8
-        },
-        "House Shifting": {
-            "keywords": ["moving", "move", "shift", "shifting", "relocate", "relocation", "pack", "packing", "boxes",
-                        "furniture", "belongings", "new home", "new house", "apartment", "heavy", "lifting"],
-            "weight": 1.0
-        },
-        "Home Maintenance": {
-            "keywords": ["repair", "fix", "maintenance", "broken", "leak", "plumbing", "electrical", "carpentry",
-                        "handyman", "install", "installation", "appliance", "heating", "cooling", "ac", "heater",
-                        "door", "window", "roof", "wall", "painting", "cleaning", "yard", "garden"],
-            "weight": 1.0
-        },
-        "Companionship": {
-            "keywords": ["companion", "companionship", "visit", "visiting", "talk", "conversation", "chat", "social",
-                        "lonely", "loneliness", "friend", "friendship", "spend time", "company", "someone to talk"],
-            "weight": 1.0
-        },
-        "Technology Help": {
-            "keywords": ["computer", "laptop", "phone", "smartphone", "tablet", "internet", "wifi", "email", "app",
-                        "software", "device", "tech", "technology", "digital", "online", "website", "password",
-                        "account", "setup", "configure", "troubleshoot", "help with", "how to"],
-            "weight": 1.0
-        }
-    }
+    Uses the haversine formula on a spherical Earth, which is within about 0.5%
+    of the ellipsoidal geodesic distance.
     
-    # Calculate scores for each type
-    type_scores = {}
-    for req_type, pattern_data in type_patterns.items():
-        score = 0.0
-        keywords = pattern_data["keywords"]
-        weight = pattern_data["weight"]
-        
-        # Check for exclude keywords (if present, reduce score significantly)
-        exclude_keywords = pattern_data.get("exclude_keywords", [])
-        has_exclude = any(exclude in description_lower for exclude in exclude_keywords)
-        if has_exclude and req_type == "Groceries":
-            # If medical keywords are present, heavily penalize Groceries
-            score -= 10.0
-        
-        # Check for priority keywords (these get extra boost)
-        priority_keywords = pattern_data.get("priority_keywords", [])
-        priority_match = any(priority in description_lower for priority in priority_keywords)
-        if priority_match:
-            score += 5.0 * weight  # Significant boost for priority keywords
-        
-        # Count keyword matches
-        for keyword in keywords:
-            # Exact word match (higher weight)
-            if re.search(r'\b' + re.escape(keyword) + r'\b', description_lower):
-                score += 2.0 * weight
-            # Partial match (lower weight)
-            elif keyword in description_lower:
-                score += 1.0 * weight
-        
-        # Boost score for multiple keyword matches
-        matches = sum(1 for keyword in keywords if keyword in description_lower)
-        if matches > 1:
-            score *= (1 + matches * 0.1)  # 10% boost per additional match
+    Args:
+        latitudes: Sequence or array of latitudes in degrees
+        longitudes: Sequence or array of longitudes in degrees
+        origin_latitude: Latitude of the origin point in degrees
+        origin_longitude: Longitude of the origin point in degrees
         
-        type_scores[req_type] = score
+    Returns:
+        Array of distances in miles, aligned with the inputs
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    lat0 = np.radians(origin_latitude)
+    lon0 = np.radians(origin_longitude)
+    
+    a = np.sin((lat - lat0) * 0.5) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lon - lon0) * 0.5) ** 2
+    return 2.0 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def distances_within_radius(latitudes, longitudes, origin_latitude: float, origin_longitude: float,
+                            radius_miles: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute distances from an origin and mask those within a radius.
     
-    # Find the type with highest score
-    if type_scores:
-        best_type = max(type_scores.items(), key=lambda x: x[1])
-        # Only return if score is above threshold, otherwise return "Other"
-        if best_type[1] > 0.5:
-            return best_type[0]
+    Points outside the radius' latitude/longitude bounding box are masked out
+    before any trigonometry, so only the remaining candidates pay for haversine.
     
-    return "Other"
+    Args:
+        latitudes: Sequence or array of latitudes in degrees
+        longitudes: Sequence or array of longitudes in degrees
+        origin_latitude: Latitude of the origin point in degrees
+        origin_longitude: Longitude of the origin point in degrees
+        radius_miles: Maximum distance in miles
+        
+    Returns:
+        Tuple of (distances rounded to 2 decimals, boolean mask of distances <= radius).
+        Points outside the bounding box get a distance of inf.
+    """
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    
+    # One degree of latitude is the same distance everywhere on the sphere
+    max_dlat = np.degrees(radius_miles / EARTH_RADIUS_MILES)
+    candidates = np.flatnonzero(np.abs(lat - origin_latitude) <= max_dlat)
+    
+    # Degrees of longitude shrink with cos(latitude); use the most poleward edge of the band
+    poleward = min(90.0, abs(origin_latitude) + max_dlat)
+    if poleward < 89.0:
+        max_dlon = max_dlat / np.cos(np.radians(poleward))
+        dlon = np.abs((lon[candidates] - origin_longitude + 180.0) % 360.0 - 180.0)
+        candidates = candidates[dlon <= max_dlon]
+    
+    distances = np.full(lat.shape, np.inf)
+    distances[candidates] = np.round(
+        haversine_miles(lat[candidates], lon[candidates], origin_latitude, origin_longitude), 2)
+    return distances, distances <= radius_miles
 
-# Simple in-memory cache for geocoded addresses
-_geocode_cache = {}
-_distance_cache = {}
+# Size of the square grid cells (in degrees) used as a spatial index on requests
+GEO_CELL_DEGREES = 0.5
 
-def calculate_distance_miles(address1: Optional[str], address2: Optional[str]) -> Optional[float]:
-    """Calculate distance between two addresses in miles.
-    
-    Uses geocoding to convert addresses to coordinates, then calculates
-    the great-circle distance using the haversine formula.
-    Uses caching to avoid re-geocoding the same addresses.
+def geo_cell(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    """Return the grid cell key ("row:col") containing a point.
     
     Args:
-        address1: First address string
-        address2: Second address string
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
         
     Returns:
-        Distance in miles, or None if addresses cannot be geocoded
+        Cell key, or None if either coordinate is missing
     """
-    if not address1 or not address2:
+    if latitude is None or longitude is None:
         return None
+    row = math.floor(latitude / GEO_CELL_DEGREES)
+    col = math.floor(((longitude + 180.0) % 360.0 - 180.0) / GEO_CELL_DEGREES)
+    return f"{row}:{col}"
+
+def covering_geo_cells(latitude: float, longitude: float, radius_miles: float) -> Optional[List[str]]:
+    """Return the grid cells that together cover a circle around a point.
     
-    # Check cache first
-    cache_key = f"{address1}|{address2}"
-    if cache_key in _distance_cache:
-        return _distance_cache[cache_key]
+    Every point within radius_miles of (latitude, longitude) lies in one of the
+    returned cells, so a query on these cells reads only nearby candidates.
     
-    try:
-        geolocator = Nominatim(user_agent="senior_smartassist")
-        
-        # Get or cache geocoded locations
-        if address1 not in _geocode_cache:
-            location1 = geolocator.geocode(address1, timeout=5)  # Reduced timeout
-            _geocode_cache[address1] = location1
-        else:
-            location1 = _geocode_cache[address1]
-        
-        if address2 not in _geocode_cache:
-            location2 = geolocator.geocode(address2, timeout=5)  # Reduced timeout
-            _geocode_cache[address2] = location2
-        else:
-            location2 = _geocode_cache[address2]
-        
-        if not location1 or not location2:
-            _distance_cache[cache_key] = None
-            return None
-        
-        # Calculate distance using geodesic (great-circle distance)
-        # This uses the haversine formula to calculate the shortest distance
-        # between two points on the surface of a sphere (Earth)
-        distance_km = geodesic(
-            (location1.latitude, location1.longitude),
-            (location2.latitude, location2.longitude)
-        ).kilometers
+    Args:
+        latitude: Latitude of the center in degrees
+        longitude: Longitude of the center in degrees
+        radius_miles: Radius in miles
         
-        # Convert to miles (1 km = 0.621371 miles)
-        distance_miles = round(distance_km * 0.621371, 2)
+    Returns:
+        List of cell keys, or None if the circle reaches a pole or wraps the
+        globe (then every cell would be needed)
+    """
+    max_dlat = math.degrees(radius_miles / EARTH_RADIUS_MILES)
+    poleward = abs(latitude) + max_dlat
+    if poleward >= 89.0:
+        return None
+    max_dlon = max_dlat / math.cos(math.radians(poleward))
+    
+    column_count = round(360 / GEO_CELL_DEGREES)
+    first_col = math.floor((longitude - max_dlon) / GEO_CELL_DEGREES)
+    last_col = math.floor((longitude + max_dlon) / GEO_CELL_DEGREES)
+    if last_col - first_col + 1 >= column_count:
+        return None
+    
+    # Wrap columns across the antimeridian the same way geo_cell() does
+    half = column_count // 2
+    cols = [(col + half) % column_count - half for col in range(first_col, last_col + 1)]
+    rows = range(math.floor((latitude - max_dlat) / GEO_CELL_DEGREES),
+                 math.floor((latitude + max_dlat) / GEO_CELL_DEGREES) + 1)
+    return [f"{row}:{col}" for row in rows for col in cols]
+
+def bounding_box(latitude: float, longitude: float, radius_miles: float) -> Optional[Tuple[float, float, float, float]]:
+    """Return a latitude/longitude box containing every point within radius_miles of a point.
+    
+    Args:
+        latitude: Latitude of the center in degrees
+        longitude: Longitude of the center in degrees
+        radius_miles: Radius in miles
         
-        # Cache the result
-        _distance_cache[cache_key] = distance_miles
-        return distance_miles
-    except Exception as e:
-        # If geocoding fails, cache None and return None
-        print(f"Error calculating distance: {e}")
-        _distance_cache[cache_key] = None
+    Returns:
+        (min_latitude, max_latitude, min_longitude, max_longitude), or None if the
+        circle reaches a pole or crosses the antimeridian (no single box covers it)
+    """
+    max_dlat = math.degrees(radius_miles / EARTH_RADIUS_MILES)
+    poleward = abs(latitude) + max_dlat
+    if poleward >= 89.0:
         return None
+    max_dlon = max_dlat / math.cos(math.radians(poleward))
+    if longitude - max_dlon < -180.0 or longitude + max_dlon > 180.0:
+        return None
+    return (latitude - max_dlat, latitude + max_dlat, longitude - max_dlon, longitude + max_dlon)
+
+class BoundedCache:
+    """Thread-safe in-memory cache with LRU eviction and a per-entry time to live.
+    
+    Keeps at most maxsize entries; adding one more evicts the least recently
+    used. Entries older than ttl seconds are treated as missing.
+    """
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, stored_at = entry
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key, value) -> None:
+        """Store value for key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+def normalize_address(address: Optional[str]) -> str:
+    """Normalize an address so equivalent spellings share one cache entry.
+    
+    Lowercases, trims, collapses whitespace and normalizes comma spacing.
+    
+    Args:
+        address: Address string
+        
+    Returns:
+        Normalized address ('' if address is empty)
+    """
+    if not address:
+        return ''
+    normalized = re.sub(r'\s+', ' ', address.lower()).strip()
+    normalized = re.sub(r'\s*,\s*', ', ', normalized)
+    return normalized.strip(', ')
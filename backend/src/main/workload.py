@@ -0,0 +1,110 @@
+from typing import Dict, Optional
+from collections import Counter
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from src.main.models import HelpRequest, Volunteer, db
+from src.main.utils import ACTIVE_REQUEST_STATUSES
+
+_volunteer = Volunteer.__table__
+_help_request = HelpRequest.__table__
+
+def _active_volunteer(volunteer_id: Optional[int], status: Optional[str]) -> Optional[int]:
+    """The volunteer a request with these values counts against, if any."""
+    if volunteer_id is not None and status in ACTIVE_REQUEST_STATUSES:
+        return volunteer_id
+    return None
+
+def _stored_active_volunteer(session, request_id: int) -> Optional[int]:
+    """Read a request's stored assignment, locking the row until the transaction ends.
+
+    Reading under the lock (rather than from the object's loaded state) means two
+    transactions changing the same request one after the other each see the
+    other's result, so a change is never counted twice.
+    """
+    connection = session.connection()
+    if connection.dialect.name == 'sqlite':
+        # No row locks (FOR UPDATE is ignored): take the database write lock with a no-op UPDATE first
+        connection.execute(_help_request.update().where(_help_request.c.id == request_id)
+                           .values(id=_help_request.c.id))
+    row = connection.execute(
+        select(_help_request.c.volunteer_id, _help_request.c.status)
+        .where(_help_request.c.id == request_id)
+        .with_for_update()
+    ).one_or_none()
+    return _active_volunteer(row.volunteer_id, row.status) if row else None
+
+def _flush_deltas(session) -> Dict[int, int]:
+    """Net change to each volunteer's active request count from the objects about to be flushed."""
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, HelpRequest):
+            volunteer_id = _active_volunteer(obj.volunteer_id, obj.status or 'pending')
+            if volunteer_id is not None:
+                deltas[volunteer_id] += 1
+    for obj in session.deleted:
+        if isinstance(obj, HelpRequest):
+            volunteer_id = _stored_active_volunteer(session, obj.id)
+            if volunteer_id is not None:
+                deltas[volunteer_id] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, HelpRequest):
+            continue
+        state = inspect(obj)
+        if not (state.attrs.volunteer_id.history.has_changes() or state.attrs.status.history.has_changes()):
+            continue
+        old = _stored_active_volunteer(session, obj.id)
+        new = _active_volunteer(obj.volunteer_id, obj.status)
+        if old != new:
+            if old is not None:
+                deltas[old] -= 1
+            if new is not None:
+                deltas[new] += 1
+    return {volunteer_id: delta for volunteer_id, delta in deltas.items() if delta}
+
+def adjust_active_request_count(volunteer_id: int, delta: int) -> None:
+    """Add delta to a volunteer's active request count in SQL, in the current transaction.
+
+    Only needed after bulk UPDATEs that bypass the ORM (see accept_request);
+    ORM writes to HelpRequest are counted automatically.
+    """
+    db.session.execute(
+        _volunteer.update().where(_volunteer.c.id == volunteer_id).values(
+            active_request_count=_volunteer.c.active_request_count + delta
+        )
+    )
+
+@event.listens_for(Session, 'before_flush')
+def _collect_workload_changes(session, flush_context, instances):
+    """Work out how this flush changes volunteers' workloads while the old rows are still readable."""
+    session.info['workload_deltas'] = _flush_deltas(session)
+
+@event.listens_for(Session, 'after_flush')
+def _update_workloads(session, flush_context):
+    """Apply assignment changes written in this flush to the volunteers' counters, in the same transaction."""
+    deltas = session.info.pop('workload_deltas', {})
+    if not deltas:
+        return
+    connection = session.connection()
+    # Increment in SQL so concurrent writers never overwrite each other's counts
+    for volunteer_id, delta in sorted(deltas.items()):
+        connection.execute(
+            _volunteer.update().where(_volunteer.c.id == volunteer_id).values(
+                active_request_count=_volunteer.c.active_request_count + delta
+            )
+        )
+
+def rebuild_active_request_counts() -> int:
+    """Recompute every volunteer's active request count from the HelpRequest table and commit.
+
+    Returns:
+        Number of volunteers whose count was corrected
+    """
+    actual = select(func.count(_help_request.c.id)).where(
+        _help_request.c.volunteer_id == _volunteer.c.id,
+        _help_request.c.status.in_(ACTIVE_REQUEST_STATUSES)
+    ).scalar_subquery()
+    result = db.session.execute(
+        _volunteer.update().where(_volunteer.c.active_request_count != actual).values(active_request_count=actual)
+    )
+    db.session.commit()
+    return result.rowcount
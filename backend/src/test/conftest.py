@@ -1,6 +1,13 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pytest
+from sqlalchemy import event, text
 from src.main.app import create_app
 from src.main.models import db, Volunteer, Elder, HelpRequest
+from src.main.geocoding import StaticGeocoder
+from src.main.matching import clear_match_rankings
 
 @pytest.fixture
 def app():
@@ -8,7 +15,11 @@ def app():
     app, socketio = create_app({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-        'SQLALCHEMY_TRACK_MODIFICATIONS': False
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        # Never call the real geocoder from tests; geocode on demand with drain()
+        'GEOCODER': StaticGeocoder(),
+        'GEOCODE_WORKER_THREAD': False,
+        'GEOCODE_MIN_INTERVAL': 0
     })
     
     with app.app_context():
@@ -17,6 +28,55 @@ def app():
         yield app
         db.session.remove()
         db.drop_all()
+        # Ids are reused by the next test's fresh database
+        clear_match_rankings()
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def concurrent_app(request, tmp_path):
+    """App on a real database, so parallel threads each get their own connection.
+    
+    The PostgreSQL variant runs only when TEST_DATABASE_URL points at a scratch database.
+    """
+    if request.param == 'postgresql':
+        database_uri = os.getenv('TEST_DATABASE_URL')
+        if not database_uri:
+            pytest.skip('TEST_DATABASE_URL is not set')
+    else:
+        database_uri = f"sqlite:///{tmp_path / 'concurrent.db'}"
+    app, socketio = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': database_uri,
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'GEOCODING_ENABLED': False
+    })
+    
+    yield app
+    
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.session.execute(text('DROP TABLE IF EXISTS alembic_version'))
+        db.session.commit()
+        db.engine.dispose()
+
+@pytest.fixture
+def run_in_parallel(concurrent_app):
+    """Send API calls from parallel threads, each thread with its own test client."""
+    def _run(calls, workers=16):
+        # calls: list of (method, url, payload); returns [(status_code, json_body)] in order
+        barrier = threading.Barrier(min(workers, len(calls)))
+        
+        def _call(call):
+            method, url, payload = call
+            with concurrent_app.test_client() as client:
+                if len(calls) <= workers:
+                    barrier.wait()  # One thread per call: release them all at the same instant
+                response = getattr(client, method)(url, data=json.dumps(payload), content_type='application/json')
+                return response.status_code, json.loads(response.data)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_call, calls))
+    return _run
 
 @pytest.fixture
 def client(app):
@@ -37,3 +97,22 @@ def sample_volunteers(app):
         db.session.add_all([v1, v2])
         db.session.commit()
         return [v1, v2]
+
+@pytest.fixture
+def query_counter(app):
+    """Count SQL statements executed against the test database."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', _record)
+
+@pytest.fixture
+def geocoding_worker(app):
+    """Background geocoding worker for the test app (runs only when drained)."""
+    return app.extensions['geocoding_worker']
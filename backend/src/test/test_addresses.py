@@ -0,0 +1,87 @@
+import random
+from src.main.addresses import rebuild_address_fingerprints, volunteers_in_area
+from src.main.matching import find_match_candidates
+from src.main.models import db, Elder, Volunteer, HelpRequest
+from src.main.utils import (address_area_keys, address_fingerprint, calculate_address_similarity,
+                            calculate_location_score)
+
+ADDRESS_WORDS = ['1', '12', 'Main', 'main', 'St', 'st,', 'Oak', 'Ave', 'San', 'Jose', 'CA', ',', ' ']
+
+def test_address_fingerprint():
+    """Test fingerprints keep the lowercase words and area keys are the last two words."""
+    assert address_fingerprint('  12 Main St,San Jose,  CA ') == '12 main st san jose ca'
+    assert address_fingerprint(' , ') == ''
+    assert address_fingerprint(None) is None
+    assert address_area_keys('12 main st san jose ca') == ('jose', 'ca')
+    assert address_area_keys('ca') == (None, 'ca')
+    assert address_area_keys('') == (None, None)
+
+def test_fingerprint_similarity_matches_address_similarity():
+    """Test scoring from fingerprints gives exactly the scores of comparing the raw addresses."""
+    rng = random.Random(3)
+    addresses = [None, '', '  ', ',', '1 Main St', '1 main st', '1 Main St,', 'CA']
+    addresses += [''.join(rng.choice(ADDRESS_WORDS) + rng.choice([' ', ', ', ''])
+                          for _ in range(rng.randint(1, 6))) for _ in range(150)]
+    for address1 in addresses:
+        for address2 in addresses:
+            assert calculate_location_score(address1, address2, address_fingerprint(address1),
+                                            address_fingerprint(address2)) == \
+                calculate_address_similarity(address1, address2), (address1, address2)
+
+def test_fingerprints_follow_address_writes(app):
+    """Test every model fingerprints its address when created and when the address changes."""
+    with app.app_context():
+        elder = Elder(name='Elder', email='elder@addr.com', age=70, address='5 Oak Ave, Austin, TX')
+        volunteer = Volunteer(name='Vol', email='vol@addr.com', address='1 Main St, San Jose, CA')
+        help_request = HelpRequest(address='9 Pine St', status='pending')
+        db.session.add_all([elder, volunteer, help_request])
+        db.session.commit()
+        assert elder.address_fingerprint == '5 oak ave austin tx'
+        assert help_request.address_fingerprint == '9 pine st'
+        assert (volunteer.address_city, volunteer.address_state) == ('jose', 'ca')
+        
+        volunteer.address = '2 Elm Rd, Austin, TX'
+        help_request.address = None
+        db.session.commit()
+        assert (volunteer.address_fingerprint, volunteer.address_city, volunteer.address_state) == \
+            ('2 elm rd austin tx', 'austin', 'tx')
+        assert help_request.address_fingerprint is None
+
+def test_candidates_in_address_area_without_coordinates(app):
+    """Test a request not geocoded yet prefers volunteers sharing its city and state words."""
+    with app.app_context():
+        for name, address in [('SameCity', '1 Main St, San Jose, CA'), ('SameState', '2 Oak Ave, Fresno, CA'),
+                              ('Elsewhere', '3 Elm Rd, Austin, TX')]:
+            db.session.add(Volunteer(name=name, email=f'{name.lower()}@addr.com', skills='Groceries',
+                                     address=address, availability='available'))
+        elder = Elder(name='Elder', email='elder@addr.com', age=70, address='9 Pine St, San Jose, CA')
+        help_request = HelpRequest(request_type='Groceries', status='pending', elder=elder)
+        db.session.add(help_request)
+        db.session.commit()
+        assert sorted(v.name for v in find_match_candidates(help_request)) == ['SameCity']
+
+def test_street_address_has_no_area(app):
+    """Test an address without a city and state falls through to the skill stage."""
+    for fingerprint in ['1 main st', 'main st', '12 main st 4', 'oak ave springfield', 'ca']:
+        assert volunteers_in_area(fingerprint) is None, fingerprint
+    assert volunteers_in_area('9 pine st san jose ca 95112') is not None
+    with app.app_context():
+        for name, skills, address in [('Shopper', 'Groceries', '5 Oak Ave, Fresno, CA'),
+                                      ('Plumber1', 'Plumbing', '2 Elm St'), ('Plumber2', 'Plumbing', '3 Pine St')]:
+            db.session.add(Volunteer(name=name, email=f'{name.lower()}@addr.com', skills=skills,
+                                     address=address, availability='available'))
+        help_request = HelpRequest(request_type='Groceries', status='pending', address='1 Main St')
+        db.session.add(help_request)
+        db.session.commit()
+        assert [v.name for v in find_match_candidates(help_request)] == ['Shopper']
+
+def test_rebuild_address_fingerprints(app):
+    """Test the rebuild fingerprints addresses written without the ORM."""
+    with app.app_context():
+        db.session.add(Volunteer(name='Vol', email='vol@addr.com', address='1 Main St'))
+        db.session.commit()
+        db.session.execute(Volunteer.__table__.update().values(address='7 Lake Dr, Reno, NV'))
+        db.session.commit()
+        assert rebuild_address_fingerprints() == 1
+        volunteer = Volunteer.query.one()
+        assert (volunteer.address_fingerprint, volunteer.address_state) == ('7 lake dr reno nv', 'nv')
@@ -0,0 +1,51 @@
+from src.main.utils import BoundedCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction():
+    """The least recently used entry is evicted when the cache is full."""
+    cache = BoundedCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 1
+
+def test_ttl_expiration():
+    """Entries older than the TTL are treated as missing and dropped."""
+    clock = FakeClock()
+    cache = BoundedCache(maxsize=10, ttl=60, clock=clock)
+    cache.set('a', 1)
+    clock.now = 59
+    assert cache.get('a') == 1
+    clock.now = 61
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    assert cache.stats()['expirations'] == 1
+
+def test_counters_and_cached_none():
+    """Hits and misses are counted, and None is a cacheable value."""
+    cache = BoundedCache(maxsize=10)
+    missing = object()
+    assert cache.get('x', missing) is missing
+    cache.set('x', None)
+    assert cache.get('x', missing) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+def test_cache_metrics_route(app, client):
+    """The match caches' counters are served over HTTP."""
+    response = client.get('/api/seniorsmartassist/metrics/caches')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert set(data) == {'rankings', 'features'}
+    assert {'size', 'maxsize', 'hits', 'misses', 'evictions', 'expirations'} <= set(data['rankings'])
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+from geopy.distance import geodesic
+from src.main.utils import haversine_miles, distances_within_radius, geo_cell, covering_geo_cells
+
+SAN_FRANCISCO = (37.7749, -122.4194)
+OAKLAND = (37.8044, -122.2712)
+LOS_ANGELES = (34.0522, -118.2437)
+
+def test_haversine_matches_geodesic():
+    """Vectorized haversine agrees with geopy's geodesic within 0.5%."""
+    points = [OAKLAND, LOS_ANGELES, (40.7128, -74.0060)]
+    miles = haversine_miles([p[0] for p in points], [p[1] for p in points], *SAN_FRANCISCO)
+    for point, distance in zip(points, miles):
+        expected = geodesic(SAN_FRANCISCO, point).miles
+        assert distance == pytest.approx(expected, rel=0.005)
+
+def test_haversine_same_point_is_zero():
+    """The distance from a point to itself is zero."""
+    assert haversine_miles([SAN_FRANCISCO[0]], [SAN_FRANCISCO[1]], *SAN_FRANCISCO)[0] == 0.0
+
+def test_distances_within_radius_mask():
+    """Only points inside the radius are kept by the mask."""
+    distances, mask = distances_within_radius(
+        [OAKLAND[0], LOS_ANGELES[0]], [OAKLAND[1], LOS_ANGELES[1]], *SAN_FRANCISCO, 100)
+    assert mask.tolist() == [True, False]
+    assert 8 < distances[0] < 9
+    assert distances[1] > 300
+
+def test_distances_within_radius_large_batch():
+    """A large batch is filtered in one call with a result per input."""
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(32, 42, 100_000)
+    longitudes = rng.uniform(-124, -114, 100_000)
+    distances, mask = distances_within_radius(latitudes, longitudes, *SAN_FRANCISCO, 100)
+    assert distances.shape == mask.shape == (100_000,)
+    assert np.all(distances[mask] <= 100)
+    assert np.all(distances[~mask] > 100)
+
+def test_geo_cell_keys():
+    """Points map to stable grid cells, wrapping at the antimeridian."""
+    assert geo_cell(37.7749, -122.4194) == geo_cell(37.9, -122.1)
+    assert geo_cell(37.7749, -122.4194) != geo_cell(34.05, -118.24)
+    assert geo_cell(10.0, 180.0) == geo_cell(10.0, -180.0)
+    assert geo_cell(None, -122.0) is None
+
+@pytest.mark.parametrize('center', [SAN_FRANCISCO, (-33.87, 151.21), (64.0, -21.0), (0.0, 179.9)])
+def test_covering_geo_cells_contain_every_point_in_radius(center):
+    """Every point within the radius falls in one of the covering cells."""
+    rng = np.random.default_rng(7)
+    latitudes = center[0] + rng.uniform(-3, 3, 5000)
+    longitudes = (center[1] + rng.uniform(-6, 6, 5000) + 180.0) % 360.0 - 180.0
+    distances = haversine_miles(latitudes, longitudes, *center)
+    cells = set(covering_geo_cells(*center, 100))
+    for latitude, longitude, distance in zip(latitudes, longitudes, distances):
+        if distance <= 100:
+            assert geo_cell(latitude, longitude) in cells
+
+def test_covering_geo_cells_near_pole():
+    """Circles that reach a pole cannot be covered by a bounded cell list."""
+    assert covering_geo_cells(88.5, 0.0, 100) is None
@@ -0,0 +1,108 @@
+import json
+import time
+from src.main.app import create_app
+from src.main.models import db, Elder, HelpRequest, Volunteer
+from src.main.realtime import FileQueueManager
+
+SF = (37.7749, -122.4194)
+LA = (34.0522, -118.2437)
+
+def _volunteer(name, skills, location=None):
+    latitude, longitude = location or (None, None)
+    volunteer = Volunteer(name=name, email=f'{name.lower()}@events.com', skills=skills,
+                          latitude=latitude, longitude=longitude)
+    db.session.add(volunteer)
+    db.session.commit()
+    return volunteer.id
+
+def _created(client):
+    return [event['args'][0] for event in client.get_received() if event['name'] == 'request_created']
+
+def test_new_request_reaches_nearby_skilled_volunteers(app):
+    """Test request_created goes only to volunteers near the request whose skills fit its type."""
+    socketio = app.extensions['socketio']
+    elder = Elder(name='Elder', email='elder@events.com', age=70, latitude=SF[0], longitude=SF[1])
+    db.session.add(elder)
+    db.session.commit()
+    volunteer_ids = {
+        'Near': _volunteer('Near', 'Shopping', SF),
+        'Far': _volunteer('Far', 'Groceries', LA),
+        'Plumber': _volunteer('Plumber', 'Plumbing', SF),
+        'Unlocated': _volunteer('Unlocated', 'Groceries'),
+        'Generalist': _volunteer('Generalist', 'Knitting', SF),
+    }
+    clients = {name: socketio.test_client(app, auth={'volunteer_id': volunteer_id})
+               for name, volunteer_id in volunteer_ids.items()}
+    elder_client = socketio.test_client(app)
+    
+    elder_client.emit('new_request', {'type': 'Groceries', 'description': 'Milk', 'elder_id': elder.id})
+    received = {name for name, client in clients.items() if _created(client)}
+    assert received == {'Near', 'Unlocated', 'Generalist'}
+    assert _created(elder_client) == []
+    
+    # Requests without a location yet reach every volunteer with a matching skill
+    elder_client.emit('new_request', {'type': 'Groceries', 'description': 'Bread'})
+    received = {name for name, client in clients.items() if _created(client)}
+    assert received == {'Near', 'Far', 'Unlocated', 'Generalist'}
+    
+    elder_client.emit('new_request', {'type': 'Knitting lessons', 'elder_id': elder.id})
+    received = {name for name, client in clients.items() if _created(client)}
+    assert received == {'Near', 'Plumber', 'Unlocated', 'Generalist'}
+
+def test_subscribe_requests_after_connecting(app):
+    """Test volunteers can subscribe after connecting, by query string or event."""
+    socketio = app.extensions['socketio']
+    volunteer_id = _volunteer('Near', 'Groceries', SF)
+    by_query = socketio.test_client(app, query_string=f'volunteer_id={volunteer_id}')
+    by_event = socketio.test_client(app)
+    by_event.emit('subscribe_requests', {'volunteer_id': volunteer_id})
+    by_event.emit('subscribe_requests', {'volunteer_id': volunteer_id})  # Resubscribing doesn't duplicate
+    
+    socketio.test_client(app).emit('new_request', {'type': 'Groceries'})
+    assert len(_created(by_query)) == 1
+    assert len(_created(by_event)) == 1
+
+def test_message_queue_shares_rooms_between_workers(tmp_path):
+    """Test emits from one worker reach room members connected to another, through the file queue."""
+    config = {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'workers.db'}",
+        'GEOCODING_ENABLED': False,
+        'SOCKETIO_MESSAGE_QUEUE': f"file://{tmp_path / 'queue'}"
+    }
+    app_a, socketio_a = create_app(config)
+    app_b, socketio_b = create_app(config)
+    assert isinstance(socketio_b.server.manager, FileQueueManager)
+    with app_a.app_context():
+        elder = Elder(name='Elder', email='elder@events.com', age=70)
+        db.session.add(elder)
+        db.session.flush()
+        help_request = HelpRequest(elder_id=elder.id, status='pending')
+        db.session.add(help_request)
+        db.session.commit()
+        elder_id, request_id = elder.id, help_request.id
+    
+    # A client of worker B in the request's chat room (the Socket.IO test client refuses message queues)
+    server_b = socketio_b.server
+    sent = []
+    server_b._send_eio_packet = lambda eio_sid, eio_packet: sent.append(
+        (eio_sid, server_b.packet_class(encoded_packet=eio_packet.data).data))
+    server_b.manager.initialize()
+    sid = server_b.manager.connect('client-eio-sid', '/')
+    server_b.enter_room(sid, f'request_{request_id}')
+    
+    # The chat message is posted to worker A
+    response = app_a.test_client().post(f'/api/seniorsmartassist/chat/{request_id}/send', data=json.dumps({
+        'sender_id': elder_id, 'sender_type': 'elder', 'message': 'Hello'
+    }), content_type='application/json')
+    assert response.status_code == 201
+    
+    deadline = time.monotonic() + 5
+    while not sent and time.monotonic() < deadline:
+        socketio_b.sleep(0.02)
+    assert [(eio_sid, event, message['message']) for eio_sid, (event, message) in sent] == \
+        [('client-eio-sid', 'new_message', 'Hello')]
+    
+    for app in (app_a, app_b):
+        with app.app_context():
+            db.engine.dispose()
@@ -0,0 +1,248 @@
+import pytest
+import inspect
+import json
+import time
+from sqlalchemy.exc import OperationalError
+from src.main.models import db, GeocodeCache, Volunteer, HelpRequest
+from src.main.geocoding import (normalize_address, lookup_cached_coordinates,
+                                Geocoder, GeocodingWorker, StaticGeocoder)
+
+def _cache(address, latitude, longitude):
+    db.session.add(GeocodeCache(address_key=normalize_address(address),
+                                latitude=latitude, longitude=longitude))
+    db.session.commit()
+
+def _post(client, url, payload):
+    response = client.post(url, data=json.dumps(payload), content_type='application/json')
+    return json.loads(response.data)
+
+class FlakyGeocoder(Geocoder):
+    """Fails a fixed number of times before answering."""
+
+    def __init__(self, failures, coordinates):
+        self.failures = failures
+        self.coordinates = coordinates
+        self.calls = 0
+
+    def geocode(self, address):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TimeoutError('geocoder timed out')
+        return self.coordinates
+
+def test_normalize_address():
+    """Equivalent spellings of an address normalize to the same key."""
+    assert normalize_address('  123 Main St ,San Francisco,  CA ') == '123 main st, san francisco, ca'
+    assert normalize_address('123 MAIN ST, San Francisco, CA') == '123 main st, san francisco, ca'
+    assert normalize_address(None) == ''
+
+def test_lookup_cached_coordinates(app):
+    """Cached addresses resolve from the table; cached misses return None."""
+    with app.app_context():
+        _cache('123 Main St, San Francisco, CA', 37.79, -122.40)
+        _cache('Nowhere', None, None)
+        assert lookup_cached_coordinates('123 main st,  San Francisco, CA') == (37.79, -122.40)
+        assert lookup_cached_coordinates('Nowhere') is None
+        assert lookup_cached_coordinates('Unknown') is None
+
+def test_registration_uses_cached_coordinates(app, client, geocoding_worker):
+    """An already geocoded address is stored immediately, without queueing."""
+    with app.app_context():
+        _cache('123 Main St, San Francisco, CA', 37.79, -122.40)
+    volunteer = _post(client, '/api/seniorsmartassist/register/volunteer',
+                      {'name': 'Geo', 'email': 'geo@test.com', 'address': '123 Main St, San Francisco, CA'})
+    assert geocoding_worker.pending() == 0
+    with app.app_context():
+        volunteer = Volunteer.query.get(volunteer['id'])
+        assert (volunteer.latitude, volunteer.longitude) == (37.79, -122.40)
+
+def test_registration_queues_uncached_address(app, client, geocoding_worker):
+    """Uncached addresses are geocoded once, by the worker, after the response."""
+    geocoding_worker.geocoder.add('9 Oak St, Oakland, CA', (37.80, -122.27))
+    first = _post(client, '/api/seniorsmartassist/register/volunteer',
+                  {'name': 'A', 'email': 'a@test.com', 'address': '9 Oak St, Oakland, CA'})
+    second = _post(client, '/api/seniorsmartassist/register/volunteer',
+                   {'name': 'B', 'email': 'b@test.com', 'address': '9 oak st, oakland, ca'})
+    
+    # Both rows wait on a single deduplicated job
+    assert geocoding_worker.pending() == 1
+    with app.app_context():
+        assert Volunteer.query.get(first['id']).latitude is None
+    
+    geocoding_worker.drain()
+    assert geocoding_worker.geocoder.calls == 1
+    with app.app_context():
+        for volunteer_id in (first['id'], second['id']):
+            volunteer = Volunteer.query.get(volunteer_id)
+            assert (volunteer.latitude, volunteer.longitude) == (37.80, -122.27)
+        assert lookup_cached_coordinates('9 Oak St, Oakland, CA') == (37.80, -122.27)
+
+def test_request_without_address_gets_elder_coordinates(app, client, geocoding_worker):
+    """Requests without an address pick up the elder's location once it is geocoded."""
+    geocoding_worker.geocoder.add('5 Elm St, Berkeley, CA', (37.87, -122.27))
+    elder = _post(client, '/api/seniorsmartassist/register/elder',
+                  {'name': 'E', 'email': 'e@test.com', 'age': 70, 'address': '5 Elm St, Berkeley, CA'})
+    created = _post(client, '/api/seniorsmartassist/request', {'type': 'Groceries', 'elder_id': elder['id']})
+    
+    geocoding_worker.drain()
+    with app.app_context():
+        help_request = HelpRequest.query.get(created['id'])
+        assert (help_request.latitude, help_request.longitude) == (37.87, -122.27)
+
+def test_failed_lookups_are_retried(app):
+    """Geocoder errors are retried with backoff until they succeed."""
+    geocoder = FlakyGeocoder(failures=2, coordinates=(40.0, -75.0))
+    worker = GeocodingWorker(app, geocoder, min_interval=0, backoff_seconds=0, start_thread=False)
+    with app.app_context():
+        volunteer = Volunteer(name='R', email='r@test.com', address='1 Retry Rd')
+        db.session.add(volunteer)
+        db.session.commit()
+        worker.enqueue(volunteer.address, 'Volunteer', volunteer.id)
+        worker.drain()
+
+        assert geocoder.calls == 3
+        db.session.expire_all()  # The worker wrote through its own session
+        assert Volunteer.query.get(volunteer.id).latitude == 40.0
+
+def test_failed_lookups_give_up_after_max_retries(app):
+    """A permanently failing address is dropped and not cached."""
+    geocoder = FlakyGeocoder(failures=100, coordinates=None)
+    worker = GeocodingWorker(app, geocoder, min_interval=0, max_retries=2,
+                             backoff_seconds=0, start_thread=False)
+    with app.app_context():
+        worker.enqueue('1 Down St', 'Volunteer', 1)
+        worker.drain()
+        assert geocoder.calls == 3
+        assert worker.pending() == 0
+        assert GeocodeCache.query.count() == 0
+
+class FailingQuery:
+    """Replaces a model's query attribute, failing a fixed number of times as if the database were down."""
+
+    def __init__(self, failures, query):
+        self.failures = failures
+        self.query = query
+
+    def __get__(self, obj, cls):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError('SELECT', {}, Exception('database is unavailable'))
+        return self.query.__get__(obj, cls)
+
+def test_cache_lookup_errors_are_retried(app):
+    """A job whose cache lookup fails stays queued and is geocoded on a later attempt."""
+    worker = GeocodingWorker(app, StaticGeocoder({'3 Flaky Ln': (41.0, -73.0)}), min_interval=0,
+                             backoff_seconds=0, start_thread=False)
+    with app.app_context():
+        volunteer = Volunteer(name='D', email='d@test.com', address='3 Flaky Ln')
+        db.session.add(volunteer)
+        db.session.commit()
+        GeocodeCache.query = FailingQuery(1, inspect.getattr_static(GeocodeCache, 'query'))
+        try:
+            worker.enqueue(volunteer.address, 'Volunteer', volunteer.id)
+            worker.drain()
+        finally:
+            del GeocodeCache.query
+
+        assert worker.pending() == 0
+        db.session.expire_all()
+        assert Volunteer.query.get(volunteer.id).latitude == 41.0
+
+def test_worker_rate_limits_geocoder_calls(app):
+    """Consecutive geocoder calls are spaced by min_interval."""
+    worker = GeocodingWorker(app, StaticGeocoder(), min_interval=0.05, start_thread=False)
+    with app.app_context():
+        for i in range(3):
+            worker.enqueue(f'{i} Slow St', 'Volunteer', i)
+        started = time.monotonic()
+        worker.drain()
+        assert time.monotonic() - started >= 0.1
+
+def test_worker_thread_processes_queue(app):
+    """With its thread started the worker empties the queue in the background."""
+    geocoder = StaticGeocoder({'7 Bay St': (37.0, -122.0)})
+    worker = GeocodingWorker(app, geocoder, min_interval=0)
+    with app.app_context():
+        worker.enqueue('7 Bay St', 'Volunteer', 1)
+    deadline = time.monotonic() + 5
+    while worker.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert worker.pending() == 0
+    with app.app_context():
+        assert lookup_cached_coordinates('7 Bay St') == (37.0, -122.0)
+
+def test_request_feed_uses_stored_coordinates(app, client):
+    """Distances in the volunteer feed come from stored coordinates."""
+    with app.app_context():
+        _cache('1 Near St, San Francisco, CA', 37.80, -122.41)
+        _cache('2 Far St, Los Angeles, CA', 34.05, -118.24)
+        _cache('3 Home St, San Francisco, CA', 37.77, -122.42)
+    
+    volunteer = _post(client, '/api/seniorsmartassist/register/volunteer',
+                      {'name': 'V', 'email': 'v@test.com', 'address': '3 Home St, San Francisco, CA'})
+    elder = _post(client, '/api/seniorsmartassist/register/elder',
+                  {'name': 'E', 'email': 'e@test.com', 'age': 70, 'address': '1 Near St, San Francisco, CA'})
+    near = _post(client, '/api/seniorsmartassist/request', {'type': 'Groceries', 'elder_id': elder['id']})
+    _post(client, '/api/seniorsmartassist/request', {'type': 'Groceries', 'elder_id': elder['id'],
+                                                     'address': '2 Far St, Los Angeles, CA'})
+    
+    response = client.get(f"/api/seniorsmartassist/requests?volunteer_id={volunteer['id']}")
+    data = json.loads(response.data)
+    assert [r['id'] for r in data] == [near['id']]
+    assert 1.0 < data[0]['distance_miles'] < 3.0
+
+def _near_me_setup(app, client):
+    """A volunteer in San Francisco and pending requests at increasing distances."""
+    places = {
+        '3 Home St, San Francisco, CA': (37.77, -122.42),
+        '1 Oak St, Oakland, CA': (37.80, -122.27),
+        '2 Main St, San Jose, CA': (37.34, -121.89),
+        '4 Sea St, Monterey, CA': (36.60, -121.89),
+        '5 Far St, Los Angeles, CA': (34.05, -118.24),
+    }
+    with app.app_context():
+        for address, (latitude, longitude) in places.items():
+            _cache(address, latitude, longitude)
+    volunteer = _post(client, '/api/seniorsmartassist/register/volunteer',
+                      {'name': 'V', 'email': 'v@test.com', 'address': '3 Home St, San Francisco, CA'})
+    requests = {}
+    for address in list(places)[1:]:
+        created = _post(client, '/api/seniorsmartassist/request', {'type': 'Groceries', 'address': address})
+        requests[address.split(',')[1].strip()] = created['id']
+    return volunteer['id'], requests
+
+def test_request_coordinates_set_geo_cell(app, client):
+    """Stored request coordinates are indexed by grid cell."""
+    from src.main.utils import geo_cell
+    _, requests = _near_me_setup(app, client)
+    with app.app_context():
+        help_request = HelpRequest.query.get(requests['Oakland'])
+        assert help_request.geo_cell == geo_cell(37.80, -122.27)
+
+def test_radius_query(app, client):
+    """radius_miles returns only pending requests inside the radius."""
+    volunteer_id, requests = _near_me_setup(app, client)
+    response = client.get(f'/api/seniorsmartassist/requests?volunteer_id={volunteer_id}&radius_miles=60')
+    data = json.loads(response.data)
+    assert sorted(r['id'] for r in data) == sorted([requests['Oakland'], requests['San Jose']])
+    assert all(r['distance_miles'] <= 60 for r in data)
+
+def test_nearest_query(app, client):
+    """nearest returns the N closest pending requests, nearest first."""
+    volunteer_id, requests = _near_me_setup(app, client)
+    response = client.get(f'/api/seniorsmartassist/requests?volunteer_id={volunteer_id}&nearest=3')
+    data = json.loads(response.data)
+    assert [r['id'] for r in data] == [requests['Oakland'], requests['San Jose'], requests['Monterey']]
+
+def test_radius_query_requires_located_volunteer(client):
+    """Radius queries need a volunteer with stored coordinates."""
+    response = client.get('/api/seniorsmartassist/requests?radius_miles=10')
+    assert response.status_code == 400
+
+def test_geocoder_subclass_must_implement_geocode():
+    """A geocoder without geocode() fails when constructed, not inside the worker."""
+    class IncompleteGeocoder(Geocoder):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteGeocoder()
@@ -0,0 +1,196 @@
+import json
+import pytest
+from sqlalchemy.exc import IntegrityError
+from src.main.ledger import LEDGER_ID, assign_reward, get_balance, rebuild_ledger
+from src.main.models import db, Elder, Volunteer, HelpRequest, Contribution, Reward, DonationLedger
+
+def _contribute(client, amount, volunteer_id=None):
+    payload = {'contributor_name': 'Donor', 'contributor_email': 'donor@test.com', 'amount': amount}
+    if volunteer_id:
+        payload['volunteer_id'] = volunteer_id
+    response = client.post('/api/seniorsmartassist/contribution',
+                           data=json.dumps(payload), content_type='application/json')
+    assert response.status_code == 201
+
+def _assigned_request(volunteer, request_type='Groceries'):
+    elder = Elder(name='Mary', email=f'mary{volunteer.id}-{request_type}@test.com', age=70)
+    db.session.add(elder)
+    db.session.flush()
+    help_request = HelpRequest(elder_id=elder.id, volunteer_id=volunteer.id,
+                               request_type=request_type, status='in_progress')
+    db.session.add(help_request)
+    db.session.commit()
+    return help_request.id
+
+def _complete(client, request_id):
+    response = client.put(f'/api/seniorsmartassist/request/{request_id}/status',
+                          data=json.dumps({'status': 'completed', 'wants_reward': True}),
+                          content_type='application/json')
+    assert response.status_code == 200
+    return json.loads(response.data)
+
+def test_balance_tracks_contributions_and_rewards(app, client, sample_volunteers):
+    """Test the balance reflects general contributions minus rewards paid out."""
+    with app.app_context():
+        volunteer = Volunteer.query.filter_by(email='alice@test.com').one()
+        _contribute(client, 100)
+        _contribute(client, 50)
+        _contribute(client, 25, volunteer_id=volunteer.id)  # Goes to the volunteer, not the pool
+        result = _complete(client, _assigned_request(volunteer))
+        assert result['reward_assigned'] is True
+
+        response = client.get('/api/seniorsmartassist/contributions/balance')
+        data = json.loads(response.data)
+        assert data['total_donations'] == 150.0
+        assert data['total_rewards_given'] == result['reward_amount']
+        assert data['available_balance'] == round(150.0 - result['reward_amount'], 2)
+
+def test_reward_not_assigned_without_balance(app, client, sample_volunteers):
+    """Test completing a request assigns no reward when the pool can't cover it."""
+    with app.app_context():
+        volunteer = Volunteer.query.filter_by(email='alice@test.com').one()
+        _contribute(client, 1)
+        result = _complete(client, _assigned_request(volunteer))
+        assert result['reward_assigned'] is False
+        assert Reward.query.count() == 0
+        assert get_balance()['total_rewards_given'] == 0.0
+
+def test_balance_check_is_constant_time(app, client, sample_volunteers, query_counter):
+    """Test reading the balance touches only the ledger row, never the history tables."""
+    with app.app_context():
+        for _ in range(20):
+            _contribute(client, 10)
+        query_counter.clear()
+        response = client.get('/api/seniorsmartassist/contributions/balance')
+        assert json.loads(response.data)['total_donations'] == 200.0
+        assert len(query_counter) == 1
+        assert 'donation_ledger' in query_counter[0]
+        assert not any('FROM contribution' in s or 'FROM reward' in s for s in query_counter)
+
+def test_ledger_follows_direct_orm_writes(app, sample_volunteers):
+    """Test rows written outside the routes, including updates and deletes, keep the ledger in sync."""
+    with app.app_context():
+        volunteer = Volunteer.query.filter_by(email='alice@test.com').one()
+        contribution = Contribution(contributor_name='A', contributor_email='a@test.com', amount=40.0)
+        db.session.add(contribution)
+        db.session.commit()
+        request_id = _assigned_request(volunteer)
+        reward = Reward(request_id=request_id, volunteer_id=volunteer.id, amount=15.0)
+        db.session.add(reward)
+        db.session.commit()
+        assert get_balance()['available_balance'] == 25.0
+
+        contribution.amount = 60.0
+        db.session.commit()
+        assert get_balance()['total_donations'] == 60.0
+
+        contribution.volunteer_id = volunteer.id  # Redirected to one volunteer: leaves the pool
+        db.session.commit()
+        assert get_balance()['total_donations'] == 0.0
+
+        db.session.delete(reward)
+        db.session.commit()
+        assert get_balance()['total_rewards_given'] == 0.0
+
+def test_rolled_back_writes_leave_ledger_unchanged(app):
+    """Test the ledger update is part of the same transaction as the contribution."""
+    with app.app_context():
+        db.session.add(Contribution(contributor_name='A', contributor_email='a@test.com', amount=10.0))
+        db.session.commit()
+        db.session.add(Contribution(contributor_name='B', contributor_email='b@test.com', amount=99.0))
+        db.session.flush()
+        db.session.rollback()
+        assert get_balance()['total_donations'] == 10.0
+
+def test_missing_ledger_is_rebuilt_with_sql_sum(app, sample_volunteers):
+    """Test a missing or drifted ledger row is recomputed from the history tables."""
+    with app.app_context():
+        db.session.add_all([
+            Contribution(contributor_name='A', contributor_email='a@test.com', amount=30.0),
+            Contribution(contributor_name='B', contributor_email='b@test.com', amount=12.5),
+        ])
+        db.session.commit()
+        db.session.execute(DonationLedger.__table__.delete())
+        db.session.commit()
+        assert db.session.get(DonationLedger, LEDGER_ID) is None
+
+        assert get_balance()['total_donations'] == pytest.approx(42.5)
+        assert db.session.get(DonationLedger, LEDGER_ID) is not None
+
+        db.session.execute(DonationLedger.__table__.update().values(total_donations=0.0))
+        db.session.commit()
+        assert rebuild_ledger().total_donations == pytest.approx(42.5)
+
+def _seed_assigned_requests(count, pool):
+    """One volunteer with count in-progress $10 requests, and pool dollars of general donations."""
+    volunteer = Volunteer(name='Alice', email='alice@test.com')
+    elder = Elder(name='Mary', email='mary@test.com', age=70)
+    db.session.add_all([volunteer, elder])
+    db.session.flush()
+    requests = [HelpRequest(elder_id=elder.id, volunteer_id=volunteer.id, request_type='Groceries',
+                            status='in_progress') for _ in range(count)]
+    db.session.add_all(requests)
+    db.session.add(Contribution(contributor_name='Donor', contributor_email='donor@test.com', amount=pool))
+    db.session.commit()
+    return [r.id for r in requests]
+
+def test_reward_is_part_of_the_outer_transaction(concurrent_app):
+    """Test rolling back the caller's transaction also undoes the reward and its ledger debit."""
+    with concurrent_app.app_context():
+        request_id, = _seed_assigned_requests(1, pool=100.0)
+        volunteer_id = db.session.get(HelpRequest, request_id).volunteer_id
+        db.session.commit()
+        
+        assert assign_reward(request_id, volunteer_id, 10.0) is not None
+        db.session.rollback()
+        
+        assert Reward.query.count() == 0
+        assert get_balance()['available_balance'] == pytest.approx(100.0)
+
+def test_concurrent_completions_never_overspend(concurrent_app, run_in_parallel):
+    """Test hundreds of parallel completions pay out exactly what the pool holds."""
+    with concurrent_app.app_context():
+        request_ids = _seed_assigned_requests(200, pool=500.0)  # Enough for 50 rewards
+
+    results = run_in_parallel([
+        ('put', f'/api/seniorsmartassist/request/{request_id}/status', {'status': 'completed', 'wants_reward': True})
+        for request_id in request_ids
+    ])
+
+    assert all(status == 200 for status, _ in results)
+    assert sum(1 for _, data in results if data['reward_assigned']) == 50
+    with concurrent_app.app_context():
+        assert Reward.query.count() == 50
+        assert HelpRequest.query.filter_by(status='completed').count() == 200
+        assert db.session.query(db.func.sum(Reward.amount)).scalar() == pytest.approx(500.0)
+        balance = get_balance()
+        assert balance['total_rewards_given'] == pytest.approx(500.0)
+        assert balance['available_balance'] == pytest.approx(0.0)
+
+def test_concurrent_completions_of_one_request_pay_once(concurrent_app, run_in_parallel):
+    """Test racing completions of the same request create a single reward."""
+    with concurrent_app.app_context():
+        request_id, = _seed_assigned_requests(1, pool=1000.0)
+
+    results = run_in_parallel([
+        ('put', f'/api/seniorsmartassist/request/{request_id}/status', {'status': 'completed', 'wants_reward': True})
+    ] * 16)
+
+    assert all(status == 200 and data['reward_assigned'] for status, data in results)
+    assert {data['reward_amount'] for _, data in results} == {10.0}
+    with concurrent_app.app_context():
+        assert Reward.query.filter_by(request_id=request_id).count() == 1
+        assert get_balance()['total_rewards_given'] == pytest.approx(10.0)
+
+def test_duplicate_reward_rejected_by_database(app, sample_volunteers):
+    """Test the unique index rejects a second reward row for a request."""
+    with app.app_context():
+        volunteer = Volunteer.query.filter_by(email='alice@test.com').one()
+        request_id = _assigned_request(volunteer)
+        db.session.add(Reward(request_id=request_id, volunteer_id=volunteer.id, amount=10.0))
+        db.session.commit()
+        db.session.add(Reward(request_id=request_id, volunteer_id=volunteer.id, amount=10.0))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+        assert get_balance()['total_rewards_given'] == 10.0
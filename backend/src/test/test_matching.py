@@ -0,0 +1,311 @@
+import json
+import random
+from types import SimpleNamespace
+from sqlalchemy import select
+import src.main.matching as matching
+from src.main.matching import candidate_features, find_match_candidates, match_volunteer, rank_matches
+from src.main.models import db, Volunteer, HelpRequest, Skill, volunteer_skill
+from src.main.utils import (MIN_MATCH_SCORE, VolunteerFeatures, address_fingerprint, rank_volunteers,
+                            score_volunteer, smart_match_volunteer)
+
+SF = (37.7749, -122.4194)
+LA = (34.0522, -118.2437)
+
+def _volunteer(name, skills, location=None, availability='available', address='1 Main St'):
+    latitude, longitude = location or (None, None)
+    volunteer = Volunteer(name=name, email=f'{name.lower()}@match.com', skills=skills, address=address,
+                          availability=availability, latitude=latitude, longitude=longitude)
+    db.session.add(volunteer)
+    return volunteer
+
+def _request(request_type, location=SF, address='1 Main St'):
+    help_request = HelpRequest(request_type=request_type, status='pending', address=address,
+                               latitude=location[0], longitude=location[1])
+    db.session.add(help_request)
+    db.session.commit()
+    return help_request
+
+def _names(volunteers):
+    return sorted(v.name for v in volunteers)
+
+def test_candidates_are_available_nearby_and_skilled(app):
+    """Test only available volunteers near the request with a related skill are scored."""
+    with app.app_context():
+        _volunteer('Near', 'Shopping, Errands', SF)
+        _volunteer('Far', 'Groceries', LA)
+        _volunteer('Unskilled', 'Plumbing', SF)
+        _volunteer('Busy', 'Groceries', SF, availability='busy')
+        _volunteer('Away', 'Groceries', SF, availability='unavailable')
+        help_request = _request('Groceries')
+        assert _names(find_match_candidates(help_request)) == ['Near']
+
+def test_candidates_widen_when_nobody_qualifies(app):
+    """Test the skill and then the area condition are dropped when they leave no candidates."""
+    with app.app_context():
+        _volunteer('Unskilled', 'Plumbing', SF)
+        _volunteer('Far', 'Groceries', LA)
+        _volunteer('Busy', 'Groceries', SF, availability='busy')
+        help_request = _request('Groceries')
+        assert _names(find_match_candidates(help_request)) == ['Unskilled']
+        
+        db.session.delete(Volunteer.query.filter_by(name='Unskilled').one())
+        db.session.commit()
+        assert _names(find_match_candidates(help_request)) == ['Far']
+        
+        unknown_type = _request('Knitting', location=LA)
+        assert _names(find_match_candidates(unknown_type)) == ['Far']
+
+def test_candidates_without_request_location(app):
+    """Test a request with no coordinates is matched on skills alone."""
+    with app.app_context():
+        _volunteer('Skilled', 'Driving', LA)
+        _volunteer('Unskilled', 'Plumbing')
+        help_request = HelpRequest(request_type='Transportation', status='pending')
+        db.session.add(help_request)
+        db.session.commit()
+        assert _names(find_match_candidates(help_request)) == ['Skilled']
+
+def test_skill_filter_escapes_like_wildcards(app):
+    """Test a request type containing LIKE wildcards is matched literally."""
+    with app.app_context():
+        _volunteer('Literal', '100% effort', SF)
+        _volunteer('Other', '100 percent', SF)
+        help_request = _request('100% effort')
+        assert _names(find_match_candidates(help_request)) == ['Literal']
+
+def test_match_does_not_load_request_history(app, query_counter):
+    """Test matching runs a fixed number of queries, however long volunteers' histories are."""
+    with app.app_context():
+        for i in range(5):
+            volunteer = _volunteer(f'Vol{i}', 'Groceries', SF)
+            db.session.flush()
+            for _ in range(20):
+                db.session.add(HelpRequest(volunteer_id=volunteer.id, status='completed'))
+            db.session.add(HelpRequest(volunteer_id=volunteer.id, status='in_progress'))
+        help_request = _request('Groceries')
+        db.session.refresh(help_request)
+        
+        query_counter.clear()
+        best, score, breakdown = match_volunteer(help_request)
+        assert best.name.startswith('Vol')
+        assert breakdown['workload'] == 0.8  # One active request each
+        assert len(query_counter) == 2  # Candidates and their skills; workload is a column
+
+def test_smart_match_route_uses_candidates(app, client):
+    """Test the smart-match and assign routes pick among available candidates only."""
+    with app.app_context():
+        _volunteer('Away', 'Groceries', SF, availability='unavailable', address='1 Main St')
+        _volunteer('Near', 'Groceries', SF, address='9 Other Rd')
+        request_id = _request('Groceries').id
+    
+    response = client.post(f'/api/seniorsmartassist/request/{request_id}/smart-match')
+    assert response.status_code == 200
+    assert json.loads(response.data)['volunteer_name'] == 'Near'
+    
+    response = client.post(f'/api/seniorsmartassist/request/{request_id}/assign',
+                           data=json.dumps({}), content_type='application/json')
+    assert response.status_code == 200
+    assert json.loads(response.data)['volunteer_name'] == 'Near'
+
+def test_smart_match_route_without_available_volunteers(app, client):
+    """Test smart matching reports no match when every volunteer is unavailable."""
+    with app.app_context():
+        _volunteer('Away', 'Groceries', SF, availability='unavailable')
+        request_id = _request('Groceries').id
+    response = client.post(f'/api/seniorsmartassist/request/{request_id}/smart-match')
+    assert response.status_code == 404
+
+def test_rank_volunteers_matches_full_sort(app):
+    """Test the top-k heap returns the same ranking as sorting every scored volunteer."""
+    with app.app_context():
+        skills = ['Groceries', 'Shopping', 'Driving', 'Plumbing', 'Cooking']
+        addresses = ['1 Main St', '1 Main Street', '9 Other Rd', '12 Main St']
+        volunteers = [_volunteer(f'Vol{i}', skills[i % 5], SF, address=addresses[i % 4]) for i in range(30)]
+        help_request = _request('Groceries')
+        for i, volunteer in enumerate(volunteers):
+            volunteer.active_request_count = i % 4
+        
+        scored = [(v,) + score_volunteer(help_request.address, help_request.request_type, v) for v in volunteers]
+        expected = [entry for entry in sorted(scored, key=lambda entry: entry[1], reverse=True)
+                    if entry[1] > MIN_MATCH_SCORE]
+        for k in (1, 5, 30):
+            assert rank_volunteers(help_request, volunteers, k) == expected[:k]
+        assert smart_match_volunteer(help_request, volunteers) == expected[0]
+
+def test_ranking_is_cached_until_availability_changes(app, query_counter):
+    """Test asking again for a request's matches skips the candidate query until a volunteer changes."""
+    with app.app_context():
+        for i in range(3):
+            _volunteer(f'Vol{i}', 'Groceries', SF, address=f'{i} Main St')
+        help_request = _request('Groceries')
+        db.session.refresh(help_request)
+        
+        first = rank_matches(help_request)
+        assert len(first) == 3
+        query_counter.clear()
+        again = rank_matches(help_request)
+        assert [m[0].id for m in again] == [m[0].id for m in first]
+        assert len(query_counter) == 1  # Just the ranked volunteers, by id
+        
+        first[0][0].availability = 'busy'
+        db.session.commit()
+        remaining = rank_matches(help_request)
+        assert first[0][0].id not in [m[0].id for m in remaining]
+        assert len(remaining) == 2
+
+def test_ranking_excludes_declined_volunteers(app):
+    """Test excluded volunteers are skipped and the next best is returned."""
+    with app.app_context():
+        for i in range(3):
+            _volunteer(f'Vol{i}', 'Groceries', SF, address=f'{i} Main St')
+        help_request = _request('Groceries')
+        ranking = [m[0].id for m in rank_matches(help_request)]
+        assert match_volunteer(help_request, exclude=ranking[:1])[0].id == ranking[1]
+        assert match_volunteer(help_request, exclude=ranking) is None
+
+def test_excluding_every_first_stage_candidate_widens_the_search(app):
+    """Test declines by everyone nearby with the skill fall back to other available volunteers."""
+    with app.app_context():
+        skilled = _volunteer('Skilled', 'Groceries', SF)
+        other = _volunteer('Other', 'Cooking', SF, address='2 Main St')
+        help_request = _request('Groceries')
+        db.session.commit()
+        assert _names(find_match_candidates(help_request, exclude=[skilled.id])) == ['Other']
+        assert match_volunteer(help_request)[0].id == skilled.id
+        assert match_volunteer(help_request, exclude=[skilled.id])[0].id == other.id
+        assert match_volunteer(help_request, exclude=[skilled.id, other.id]) is None
+
+def test_smart_match_route_top_matches(app, client):
+    """Test the smart-match route returns the best N matches with their breakdowns."""
+    with app.app_context():
+        for i in range(3):
+            _volunteer(f'Vol{i}', 'Groceries', SF, address=f'{i} Main St')
+        request_id = _request('Groceries').id
+    
+    response = client.post(f'/api/seniorsmartassist/request/{request_id}/smart-match?top=2')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['request_id'] == request_id
+    assert len(data['matches']) == 2
+    assert data['matches'][0]['match_score'] >= data['matches'][1]['match_score']
+    assert set(data['matches'][0]['match_breakdown']) == {'location', 'skills', 'availability', 'workload', 'total'}
+    
+    response = client.post(f'/api/seniorsmartassist/request/{request_id}/smart-match?top=0')
+    assert response.status_code == 400
+    
+    best = data['matches'][0]['volunteer_id']
+    response = client.post(f'/api/seniorsmartassist/request/{request_id}/assign',
+                           data=json.dumps({'exclude_volunteer_ids': [best]}), content_type='application/json')
+    assert response.status_code == 200
+    assert json.loads(response.data)['volunteer_id'] == data['matches'][1]['volunteer_id']
+
+FEATURE_WORDS = ['1', '12', 'main', 'st', 'st,', 'oak', 'ave', 'san', 'francisco', 'ca', ',', '']
+FEATURE_SKILLS = ['groceries', 'shopping', 'driving', 'medical', 'gro', 'plumbing', 'medical assistance']
+
+def _random_address(rng):
+    if rng.random() < 0.1:
+        return rng.choice([None, '', '   '])
+    return ' '.join(rng.choice(FEATURE_WORDS) for _ in range(rng.randint(0, 5)))
+
+def _feature_volunteers(count, seed=7):
+    rng = random.Random(seed)
+    addresses = [_random_address(rng) for _ in range(count)]
+    return [SimpleNamespace(
+        address=address,
+        address_fingerprint=address_fingerprint(address),
+        skill_set=[SimpleNamespace(name=name) for name in rng.sample(FEATURE_SKILLS, rng.randint(0, 3))],
+        availability=rng.choice(['available', 'Busy', 'unavailable', None, 'away']),
+        active_request_count=rng.choice([None, 0, 1, 2, 5])
+    ) for address in addresses]
+
+def test_volunteer_features_match_score_volunteer():
+    """Test the vectorized scores equal score_volunteer's exactly, component by component."""
+    volunteers = _feature_volunteers(500)
+    features = VolunteerFeatures.from_volunteers(volunteers)
+    rng = random.Random(11)
+    for _ in range(40):
+        request_address = _random_address(rng)
+        request_type = rng.choice(['Groceries', 'Medical Assistance', 'Transportation', 'gro', 'Other'])
+        totals, components = features.score(request_address, request_type)
+        for i, volunteer in enumerate(volunteers):
+            total, breakdown = score_volunteer(request_address, request_type, volunteer,
+                                               address_fingerprint(request_address))
+            assert totals[i] == total
+            assert components[:, i].tolist() == [breakdown['location'], breakdown['skills'],
+                                                 breakdown['availability'], breakdown['workload']]
+
+def test_volunteer_features_rank_like_heap():
+    """Test candidates ranked in NumPy get the same results and tie order as the heap."""
+    volunteers = _feature_volunteers(300)
+    request = SimpleNamespace(address='12 main st, san francisco', address_fingerprint='12 main st san francisco',
+                              request_type='Groceries', elder=None)
+    features = VolunteerFeatures.from_volunteers(volunteers)
+    for k in (1, 10, 300):
+        assert rank_volunteers(request, volunteers, k, features) == rank_volunteers(request, volunteers, k)
+    rows = list(range(299, 0, -3))  # A subset, in a different order
+    subset = [volunteers[row] for row in rows]
+    for k in (1, 10, 100):
+        assert rank_volunteers(request, subset, k, features.select(rows)) == rank_volunteers(request, subset, k)
+    assert VolunteerFeatures.from_volunteers([]).rank('1 Main St', 'Groceries', 10) == []
+
+def _count_feature_builds(monkeypatch):
+    """Count how often the every-volunteer feature arrays are built."""
+    builds = []
+    build = matching._build_volunteer_features
+    monkeypatch.setattr(matching, '_build_volunteer_features', lambda: builds.append(1) or build())
+    return builds
+
+def test_candidate_features_are_shared_across_candidate_lists(app, monkeypatch):
+    """Test requests with different candidates select from the same arrays, built once."""
+    monkeypatch.setattr(matching, 'VECTORIZED_SCORING_MIN', 2)
+    with app.app_context():
+        for i in range(3):
+            _volunteer(f'Shopper{i}', 'Groceries', SF, address=f'{i} Main St')
+            _volunteer(f'Plumber{i}', 'Plumbing', SF, address=f'{i} Oak Ave')
+        groceries, plumbing = _request('Groceries'), _request('Home Maintenance')
+        builds = _count_feature_builds(monkeypatch)
+        for help_request in (groceries, plumbing, groceries):
+            candidates = find_match_candidates(help_request)
+            assert len(candidates) == 3
+            assert rank_volunteers(help_request, candidates, 3, candidate_features(candidates)) == \
+                rank_volunteers(help_request, candidates, 3)
+        assert len(builds) == 1
+        assert matching.get_cache_stats()['features']['hits'] >= 2
+        assert candidate_features(candidates[:1]) is None
+
+def test_candidate_features_refresh_status_and_follow_edits(app, monkeypatch):
+    """Test workloads are re-read on reuse, and skill edits or new volunteers rebuild the arrays."""
+    monkeypatch.setattr(matching, 'VECTORIZED_SCORING_MIN', 2)
+    with app.app_context():
+        volunteers = [_volunteer(f'Vol{i}', 'Groceries', SF, address=f'{i} Main St') for i in range(3)]
+        help_request = _request('Groceries')
+        candidates = find_match_candidates(help_request)
+        builds = _count_feature_builds(monkeypatch)
+        candidate_features(candidates)
+        
+        volunteers[0].active_request_count = 3
+        reused = candidate_features(candidates)
+        assert rank_volunteers(help_request, candidates, 3, reused) == rank_volunteers(help_request, candidates, 3)
+        assert len(builds) == 1
+        
+        volunteers[1].skills = 'Plumbing'
+        db.session.commit()
+        candidate_features(find_match_candidates(help_request))
+        assert len(builds) == 2
+        
+        # Registered by another process: no ORM events clear the arrays here
+        newcomer_id = db.session.execute(Volunteer.__table__.insert().values(
+            name='Newcomer', email='newcomer@match.com', address='9 Main St', address_fingerprint='9 main st',
+            availability='available', latitude=SF[0], longitude=SF[1], active_request_count=0)).inserted_primary_key[0]
+        groceries_id = db.session.execute(select(Skill.id).where(Skill.name == 'groceries')).scalar_one()
+        db.session.execute(volunteer_skill.insert().values(volunteer_id=newcomer_id, skill_id=groceries_id))
+        db.session.commit()
+        candidates = find_match_candidates(help_request)
+        assert newcomer_id in [v.id for v in candidates]
+        assert rank_volunteers(help_request, candidates, 3, candidate_features(candidates)) == \
+            rank_volunteers(help_request, candidates, 3)
+        assert len(builds) == 3
+        
+        matching.clear_match_rankings()
+        expected = rank_volunteers(help_request, find_match_candidates(help_request), 3)
+        assert rank_matches(help_request, 3) == expected
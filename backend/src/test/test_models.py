@@ -1,5 +1,5 @@
 import pytest
-from src.main.models import db, Volunteer, HelpRequest
+from src.main.models import db, Volunteer, HelpRequest, ChatMessage, Reward, Contribution, volunteer_skill
 
 def test_volunteer_creation(app):
     """Test creating a volunteer."""
@@ -48,3 +48,65 @@ def test_query_volunteers(app, sample_volunteers):
         assert len(volunteers) == 2
         assert volunteers[0].name == "Alice"
         assert volunteers[1].name == "Bob"
+
+def _query_plan(query):
+    """Return SQLite's EXPLAIN QUERY PLAN output for an ORM query as one string."""
+    sql = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+    return ' | '.join(row[-1] for row in rows)
+
+def test_indexes_are_declared(app):
+    """Test the hot query columns are covered by the expected indexes."""
+    with app.app_context():
+        indexes = {
+            name: columns
+            for table in ('help_request', 'chat_message', 'reward', 'contribution', 'volunteer', 'volunteer_skill')
+            for name, columns in (
+                (index['name'], tuple(index['column_names']))
+                for index in db.inspect(db.engine).get_indexes(table)
+            )
+        }
+        assert indexes['ix_help_request_status_timestamp'] == ('status', 'timestamp')
+        assert indexes['ix_help_request_timestamp'] == ('timestamp',)
+        assert indexes['ix_help_request_status_priority'] == ('status', 'priority')
+        assert indexes['ix_help_request_elder_id'] == ('elder_id',)
+        assert indexes['ix_help_request_volunteer_status'] == ('volunteer_id', 'status')
+        assert indexes['ix_chat_message_request_timestamp'] == ('request_id', 'timestamp')
+        assert indexes['uq_reward_request_id'] == ('request_id',)
+        assert indexes['ix_reward_volunteer_id'] == ('volunteer_id',)
+        assert indexes['ix_contribution_volunteer_timestamp'] == ('volunteer_id', 'timestamp')
+        assert indexes['ix_volunteer_availability_latitude'] == ('availability', 'latitude')
+        assert indexes['ix_volunteer_skill_skill_id'] == ('skill_id',)
+
+@pytest.mark.parametrize('build_query, index_name', [
+    (lambda: HelpRequest.query.filter_by(status='pending').order_by(HelpRequest.timestamp.desc()),
+     'ix_help_request_status_timestamp'),
+    (lambda: HelpRequest.query.order_by(HelpRequest.timestamp.desc()),
+     'ix_help_request_timestamp'),
+    (lambda: HelpRequest.query.filter(HelpRequest.status == 'pending', HelpRequest.priority.in_(['Urgent', 'High'])),
+     'ix_help_request_status_priority'),
+    (lambda: HelpRequest.query.filter_by(elder_id=1),
+     'ix_help_request_elder_id'),
+    (lambda: HelpRequest.query.filter_by(volunteer_id=1, status='completed'),
+     'ix_help_request_volunteer_status'),
+    (lambda: ChatMessage.query.filter_by(request_id=1).order_by(ChatMessage.timestamp.asc()),
+     'ix_chat_message_request_timestamp'),
+    (lambda: Reward.query.filter_by(request_id=1),
+     'uq_reward_request_id'),
+    (lambda: Reward.query.filter_by(volunteer_id=1),
+     'ix_reward_volunteer_id'),
+    (lambda: Contribution.query.filter_by(volunteer_id=1).order_by(Contribution.timestamp.desc()),
+     'ix_contribution_volunteer_timestamp'),
+    (lambda: Contribution.query.filter_by(volunteer_id=None),
+     'ix_contribution_volunteer_timestamp'),
+    (lambda: Volunteer.query.filter(Volunteer.availability == 'available', Volunteer.latitude.between(37.0, 38.0)),
+     'ix_volunteer_availability_latitude'),
+    (lambda: db.session.query(volunteer_skill.c.volunteer_id).filter(volunteer_skill.c.skill_id.in_([1, 2])),
+     'ix_volunteer_skill_skill_id'),
+])
+def test_hot_queries_use_indexes(app, build_query, index_name):
+    """Test the query planner picks an index instead of scanning the table."""
+    with app.app_context():
+        plan = _query_plan(build_query())
+        assert index_name in plan
+        assert 'TEMP B-TREE' not in plan  # Ordering comes from the index, not a sort step
@@ -411,3 +411,242 @@ def test_contribution_validation(client):
                           }),
                           content_type='application/json')
     assert response.status_code == 400
+
+def _seed_completed_requests(start, stop):
+    """Create an elder, a volunteer and a completed, rewarded request per index."""
+    from src.main.models import db, Elder, Volunteer, HelpRequest, Reward
+    for i in range(start, stop):
+        elder = Elder(name=f'Elder {i}', email=f'elder{i}@feed.com', age=70)
+        volunteer = Volunteer(name=f'Vol {i}', email=f'vol{i}@feed.com')
+        db.session.add_all([elder, volunteer])
+        db.session.flush()
+        help_request = HelpRequest(elder_id=elder.id, volunteer_id=volunteer.id,
+                                   request_type='Groceries', description='Buy milk',
+                                   status='completed')
+        db.session.add(help_request)
+        db.session.flush()
+        db.session.add(Reward(request_id=help_request.id, volunteer_id=volunteer.id, amount=10.0))
+    db.session.commit()
+
+def test_get_requests_query_count_is_constant(app, client, query_counter):
+    """The request feed issues the same number of queries for 2 rows as for 40."""
+    with app.app_context():
+        _seed_completed_requests(0, 2)
+    query_counter.clear()
+    response = client.get('/api/seniorsmartassist/requests')
+    assert response.status_code == 200
+    small_count = len(query_counter)
+
+    with app.app_context():
+        _seed_completed_requests(2, 40)
+    query_counter.clear()
+    response = client.get('/api/seniorsmartassist/requests')
+    data = json.loads(response.data)
+    assert len(data) == 40
+    assert all(r['reward_amount'] == 10.0 for r in data)
+    assert all(r['elder_name'] and r['volunteer_name'] for r in data)
+    assert len(query_counter) == small_count
+
+def _seed_pending_requests(count):
+    """Create `count` pending requests with increasing timestamps."""
+    from datetime import datetime, timedelta
+    from src.main.models import db, HelpRequest
+    base = datetime(2025, 1, 1)
+    for i in range(count):
+        db.session.add(HelpRequest(request_type='Groceries' if i % 2 else 'Transportation',
+                                   description=f'Request {i}', status='pending',
+                                   timestamp=base + timedelta(minutes=i)))
+    db.session.commit()
+
+def test_get_requests_keyset_pagination(app, client):
+    """Paging with limit/cursor returns every request exactly once, newest first."""
+    with app.app_context():
+        _seed_pending_requests(7)
+    
+    seen = []
+    cursor = None
+    while True:
+        url = '/api/seniorsmartassist/requests?limit=3'
+        if cursor:
+            url += f'&cursor={cursor}'
+        response = client.get(url)
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data['requests']) <= 3
+        seen.extend(r['description'] for r in data['requests'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    
+    assert seen == [f'Request {i}' for i in range(6, -1, -1)]
+
+def test_get_requests_server_side_filters(app, client):
+    """Status and request_type filters are applied by the server."""
+    with app.app_context():
+        _seed_pending_requests(4)
+        from src.main.models import db, HelpRequest
+        db.session.add(HelpRequest(request_type='Groceries', status='completed'))
+        db.session.commit()
+    
+    response = client.get('/api/seniorsmartassist/requests?status=pending&request_type=Groceries')
+    data = json.loads(response.data)
+    assert len(data) == 2
+    assert all(r['status'] == 'pending' and r['request_type'] == 'Groceries' for r in data)
+    
+    response = client.get('/api/seniorsmartassist/requests?status=completed,cancelled')
+    data = json.loads(response.data)
+    assert [r['status'] for r in data] == ['completed']
+
+def test_priority_is_stored_and_updated(app, client):
+    """Priority is calculated once when a request is written, not on every read."""
+    response = client.post('/api/seniorsmartassist/request',
+                           data=json.dumps({'description': 'Need groceries today', 'type': 'Groceries'}),
+                           content_type='application/json')
+    request_id = json.loads(response.data)['id']
+    assert json.loads(response.data)['priority'] == 'Medium'
+    
+    url = f'/api/seniorsmartassist/request/{request_id}'
+    response = client.put(url, data=json.dumps({'description': 'Urgent: fridge is empty'}),
+                          content_type='application/json')
+    assert json.loads(response.data)['priority'] == 'High'
+    response = client.put(url, data=json.dumps({'priority': 'Urgent'}), content_type='application/json')
+    assert json.loads(response.data)['priority'] == 'Urgent'
+    response = client.put(url, data=json.dumps({'priority': 'Soon'}), content_type='application/json')
+    assert response.status_code == 400
+    
+    with app.app_context():
+        from src.main.models import HelpRequest
+        assert HelpRequest.query.get(request_id).priority == 'Urgent'
+
+def test_get_requests_priority_filter_and_sort(app, client, monkeypatch):
+    """The feed filters and sorts by the stored priority without recalculating it."""
+    import src.main.routes as routes
+    with app.app_context():
+        _seed_pending_requests(3)
+        from src.main.models import db, HelpRequest
+        db.session.add_all([
+            HelpRequest(description='Need a ride right now', status='pending'),
+            HelpRequest(description='Need a ride', status='pending', priority='Urgent'),
+            HelpRequest(description='Groceries needed', status='pending'),
+        ])
+        db.session.commit()
+    
+    def fail(description):
+        raise AssertionError('priority recalculated on read')
+    monkeypatch.setattr(routes, 'calculate_request_priority', fail)
+    
+    response = client.get('/api/seniorsmartassist/requests?priority=Urgent,High')
+    data = json.loads(response.data)
+    assert sorted(r['priority'] for r in data) == ['High', 'Urgent']
+    
+    response = client.get('/api/seniorsmartassist/requests?sort=priority')
+    data = json.loads(response.data)
+    assert [r['priority'] for r in data] == ['Urgent', 'High', 'Medium', 'Normal', 'Normal', 'Normal']
+    assert [r['description'] for r in data[3:]] == ['Request 2', 'Request 1', 'Request 0']
+    
+    assert client.get('/api/seniorsmartassist/requests?sort=priority&limit=2').status_code == 400
+    assert client.get('/api/seniorsmartassist/requests?sort=distance').status_code == 400
+
+def test_get_requests_invalid_cursor(client):
+    """A malformed cursor is rejected."""
+    response = client.get('/api/seniorsmartassist/requests?limit=5&cursor=not-a-cursor')
+    assert response.status_code == 400
+
+def _seed_volunteers(count):
+    """Create `count` volunteers and return their ids."""
+    from src.main.models import db, Volunteer
+    volunteers = [Volunteer(name=f'Vol {i}', email=f'vol{i}@accept.com') for i in range(count)]
+    db.session.add_all(volunteers)
+    db.session.commit()
+    return [v.id for v in volunteers]
+
+def test_accept_request(app, client):
+    """A pending request is assigned to the first volunteer; later accepts get 409."""
+    with app.app_context():
+        _seed_pending_requests(1)
+        first, second = _seed_volunteers(2)
+    
+    response = client.post('/api/seniorsmartassist/request/1/accept',
+                           data=json.dumps({'volunteer_id': first}), content_type='application/json')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data == {'id': 1, 'status': 'assigned', 'volunteer_id': first}
+    
+    response = client.post('/api/seniorsmartassist/request/1/accept',
+                           data=json.dumps({'volunteer_id': second}), content_type='application/json')
+    assert response.status_code == 409
+    assert json.loads(response.data)['status'] == 'assigned'
+    
+    with app.app_context():
+        from src.main.models import db, HelpRequest
+        help_request = db.session.get(HelpRequest, 1)
+        assert help_request.volunteer_id == first
+        assert help_request.assigned_at is not None
+
+def test_accept_request_not_found(client):
+    """Accepting a request that doesn't exist returns 404."""
+    response = client.post('/api/seniorsmartassist/request/999/accept',
+                           data=json.dumps({'volunteer_id': 1}), content_type='application/json')
+    assert response.status_code == 404
+
+def test_accept_request_has_one_winner_under_contention(concurrent_app, run_in_parallel):
+    """200 volunteers accepting the same request at once: exactly one wins, the rest get 409."""
+    with concurrent_app.app_context():
+        _seed_pending_requests(1)
+        volunteer_ids = _seed_volunteers(200)
+    
+    results = run_in_parallel([
+        ('post', '/api/seniorsmartassist/request/1/accept', {'volunteer_id': volunteer_id})
+        for volunteer_id in volunteer_ids
+    ], workers=200)
+    
+    winners = [data['volunteer_id'] for status, data in results if status == 200]
+    assert len(winners) == 1
+    assert sorted(status for status, _ in results) == [200] + [409] * 199
+    with concurrent_app.app_context():
+        from src.main.models import db, HelpRequest
+        assert db.session.get(HelpRequest, 1).volunteer_id == winners[0]
+
+def test_classify_request_batch(client):
+    """The batch endpoint streams one NDJSON line per description, in order."""
+    descriptions = ['Need a ride to the airport', 'my laptop wifi is broken', None, 'Buy groceries']
+    response = client.post('/api/seniorsmartassist/classify-request/batch',
+                           data=json.dumps({'descriptions': descriptions}), content_type='application/json')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert lines == [
+        {'index': 0, 'request_type': 'Transportation'},
+        {'index': 1, 'request_type': 'Technology Help'},
+        {'index': 2, 'request_type': 'Other'},
+        {'index': 3, 'request_type': 'Groceries'},
+    ]
+
+def test_classify_request_batch_uses_process_pool_for_large_batches(app, client, monkeypatch):
+    """Large batches are handed to the process pool when CLASSIFY_PROCESSES is set."""
+    import src.main.classifier as classifier
+    import src.main.routes as routes
+    calls = []
+    def fake_classify_many(descriptions, processes=0):
+        calls.append(processes)
+        return iter(['Other'] * len(descriptions))
+    monkeypatch.setattr(classifier, 'classify_many', fake_classify_many)
+    monkeypatch.setattr(routes, 'CLASSIFY_PARALLEL_MIN_BATCH', 3)
+    app.config['CLASSIFY_PROCESSES'] = 4
+    
+    for count in (2, 3):
+        response = client.post('/api/seniorsmartassist/classify-request/batch',
+                               data=json.dumps({'descriptions': ['x'] * count}), content_type='application/json')
+        assert len(response.data.decode().splitlines()) == count
+    assert calls == [0, 4]
+
+def test_classify_request_batch_validation(client, monkeypatch):
+    """The batch endpoint rejects malformed and oversized input."""
+    import src.main.routes as routes
+    url = '/api/seniorsmartassist/classify-request/batch'
+    for payload in ({}, {'descriptions': 'text'}, {'descriptions': ['ok', 5]}):
+        response = client.post(url, data=json.dumps(payload), content_type='application/json')
+        assert response.status_code == 400
+    monkeypatch.setattr(routes, 'MAX_CLASSIFY_BATCH', 2)
+    response = client.post(url, data=json.dumps({'descriptions': ['a', 'b', 'c']}), content_type='application/json')
+    assert response.status_code == 400
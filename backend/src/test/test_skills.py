@@ -0,0 +1,115 @@
+import json
+import random
+from src.main.models import db, Skill, Volunteer, volunteer_skill
+from src.main.skills import rebuild_volunteer_skills, volunteers_with_skill_for
+from src.main.utils import SKILL_MAPPING, calculate_skill_match_score, parse_skills
+
+def reference_calculate_skill_match_score(request_type, volunteer_skills):
+    """The original skill scorer, kept verbatim to check the set-based one against."""
+    if not volunteer_skills:
+        return 0.3  # Base score for volunteers without listed skills
+    
+    request_lower = request_type.lower()
+    volunteer_skill_list = parse_skills(volunteer_skills)
+    
+    # Direct match
+    if request_lower in volunteer_skill_list:
+        return 1.0
+    
+    # Skill mapping for common request types
+    skill_mapping = {
+        'groceries': ['shopping', 'groceries', 'errands', 'delivery'],
+        'medical assistance': ['medical', 'healthcare', 'nursing', 'first aid', 'medicine'],
+        'transportation': ['driving', 'transportation', 'transport', 'vehicle'],
+        'commute assistance': ['driving', 'transportation', 'commute', 'vehicle'],
+        'house shifting': ['moving', 'lifting', 'heavy lifting', 'furniture', 'shifting'],
+        'home maintenance': ['repair', 'maintenance', 'plumbing', 'electrical', 'carpentry', 'handyman'],
+        'companionship': ['companionship', 'social', 'conversation', 'visiting', 'friendly'],
+        'technology help': ['technology', 'computer', 'tech', 'digital', 'smartphone', 'internet']
+    }
+    
+    # Check for related skills
+    related_skills = skill_mapping.get(request_lower, [])
+    for skill in volunteer_skill_list:
+        if skill in related_skills:
+            return 0.8  # Good match with related skill
+    
+    # Partial match (contains keyword)
+    for skill in volunteer_skill_list:
+        if skill in request_lower or request_lower in skill:
+            return 0.6  # Partial match
+    
+    return 0.3  # Base score - no specific match but volunteer is available
+
+def _skill_names(volunteer_id):
+    return sorted(name for name, in db.session.query(Skill.name)
+                  .join(volunteer_skill, volunteer_skill.c.skill_id == Skill.id)
+                  .filter(volunteer_skill.c.volunteer_id == volunteer_id))
+
+def test_skill_scores_match_original():
+    """Test set lookups score every mix of request type and skills exactly as before."""
+    rng = random.Random(18)
+    request_types = [t.title() for t in SKILL_MAPPING] + ['Other', 'Pet Care', 'Tech']
+    vocabulary = sorted({s for skills in SKILL_MAPPING.values() for s in skills}) + \
+        ['Groceries', 'Transportation', 'pets', 'help', ' ', '']
+    for _ in range(3000):
+        skills = ', '.join(rng.choice(vocabulary).upper() if rng.random() < 0.2 else rng.choice(vocabulary)
+                           for _ in range(rng.randint(0, 5)))
+        request_type = rng.choice(request_types)
+        assert calculate_skill_match_score(request_type, skills) == \
+            reference_calculate_skill_match_score(request_type, skills), (request_type, skills)
+
+def test_skills_are_normalized_on_write(app, client):
+    """Test registering and editing a volunteer keeps their skill rows in sync with the text."""
+    response = client.post('/api/seniorsmartassist/register/volunteer', data=json.dumps({
+        'name': 'Alice', 'email': 'alice@skills.com', 'phone': '555-0001', 'skills': 'Driving, Shopping , driving'
+    }), content_type='application/json')
+    volunteer_id = json.loads(response.data)['id']
+    with app.app_context():
+        assert _skill_names(volunteer_id) == ['driving', 'shopping']
+    
+    client.put(f'/api/seniorsmartassist/volunteer/{volunteer_id}', data=json.dumps({'skills': 'Plumbing'}),
+               content_type='application/json')
+    with app.app_context():
+        assert _skill_names(volunteer_id) == ['plumbing']
+        assert Skill.query.count() == 3  # Unused skills stay in the taxonomy
+
+def test_skills_are_shared_between_volunteers(app):
+    """Test each skill name is stored once, however many volunteers list it."""
+    with app.app_context():
+        alice = Volunteer(name='Alice', email='alice@skills.com', skills='Driving, Cooking')
+        bob = Volunteer(name='Bob', email='bob@skills.com', skills='driving')
+        db.session.add_all([alice, bob])
+        db.session.commit()
+        assert sorted(skill.name for skill in Skill.query) == ['cooking', 'driving']
+        assert [s.name for s in bob.skill_set] == ['driving']
+        
+        db.session.delete(alice)
+        db.session.commit()
+        assert db.session.query(volunteer_skill).count() == 1
+
+def test_volunteers_with_skill_for_request_type(app):
+    """Test the indexed lookup finds volunteers listing the type itself or a related skill."""
+    with app.app_context():
+        volunteers = [
+            Volunteer(name='Type', email='type@skills.com', skills='Groceries'),
+            Volunteer(name='Related', email='related@skills.com', skills='Errands, Cooking'),
+            Volunteer(name='Partial', email='partial@skills.com', skills='Grocery'),
+            Volunteer(name='None', email='none@skills.com'),
+        ]
+        db.session.add_all(volunteers)
+        db.session.commit()
+        ids = set(db.session.execute(volunteers_with_skill_for('Groceries')).scalars())
+        assert ids == {volunteers[0].id, volunteers[1].id}
+        assert volunteers_with_skill_for(None) is None
+
+def test_rebuild_volunteer_skills(app):
+    """Test skill rows are rebuilt from the text after a write that bypassed the ORM."""
+    with app.app_context():
+        volunteer = Volunteer(name='Alice', email='alice@skills.com', skills='Driving')
+        db.session.add(volunteer)
+        db.session.commit()
+        db.session.execute(Volunteer.__table__.update().values(skills='Nursing, Driving'))
+        db.session.commit()
+        assert rebuild_volunteer_skills() == 1
+        assert _skill_names(volunteer.id) == ['driving', 'nursing']
@@ -0,0 +1,108 @@
+import json
+from src.main.models import db, Volunteer, HelpRequest
+from src.main.workload import rebuild_active_request_counts
+
+def _volunteer(name='Alice'):
+    volunteer = Volunteer(name=name, email=f'{name.lower()}@workload.com')
+    db.session.add(volunteer)
+    db.session.commit()
+    return volunteer.id
+
+def _active_count(volunteer_id):
+    return db.session.query(Volunteer.active_request_count).filter_by(id=volunteer_id).scalar()
+
+def _pending_request():
+    help_request = HelpRequest(request_type='Groceries', status='pending')
+    db.session.add(help_request)
+    db.session.commit()
+    return help_request.id
+
+def _put(client, url, payload):
+    return client.put(url, data=json.dumps(payload), content_type='application/json')
+
+def test_count_follows_request_lifecycle(app, client):
+    """Test accept, assign, release, status changes and cancellation keep the counter exact."""
+    with app.app_context():
+        alice, bob = _volunteer('Alice'), _volunteer('Bob')
+        first, second, third = _pending_request(), _pending_request(), _pending_request()
+    
+    client.post(f'/api/seniorsmartassist/request/{first}/accept', data=json.dumps({'volunteer_id': alice}),
+                content_type='application/json')
+    client.post(f'/api/seniorsmartassist/request/{second}/assign', data=json.dumps({'volunteer_id': alice}),
+                content_type='application/json')
+    client.post(f'/api/seniorsmartassist/request/{third}/accept', data=json.dumps({'volunteer_id': bob}),
+                content_type='application/json')
+    with app.app_context():
+        assert (_active_count(alice), _active_count(bob)) == (2, 1)
+    
+    _put(client, f'/api/seniorsmartassist/request/{first}/status', {'status': 'in_progress'})
+    _put(client, f'/api/seniorsmartassist/request/{first}', {'description': 'Milk and eggs'})
+    with app.app_context():
+        assert _active_count(alice) == 2
+    
+    _put(client, f'/api/seniorsmartassist/request/{first}/status', {'status': 'completed'})
+    _put(client, f'/api/seniorsmartassist/request/{second}/status', {'status': 'pending'})  # Released
+    _put(client, f'/api/seniorsmartassist/request/{third}/status', {'status': 'cancelled'})
+    with app.app_context():
+        assert (_active_count(alice), _active_count(bob)) == (0, 0)
+        assert rebuild_active_request_counts() == 0  # Nothing drifted
+
+def test_count_follows_direct_orm_writes(app):
+    """Test requests created, reassigned and deleted outside the routes are counted."""
+    with app.app_context():
+        alice, bob = _volunteer('Alice'), _volunteer('Bob')
+        help_request = HelpRequest(volunteer_id=alice, status='assigned')
+        db.session.add_all([help_request, HelpRequest(volunteer_id=alice)])  # Default status is pending
+        db.session.commit()
+        assert _active_count(alice) == 2
+        
+        help_request.volunteer_id = bob
+        db.session.commit()
+        assert (_active_count(alice), _active_count(bob)) == (1, 1)
+        
+        db.session.delete(help_request)
+        db.session.commit()
+        assert _active_count(bob) == 0
+
+def test_rolled_back_changes_leave_count_unchanged(app):
+    """Test the counter update is part of the same transaction as the request change."""
+    with app.app_context():
+        alice = _volunteer()
+        db.session.add(HelpRequest(volunteer_id=alice, status='assigned'))
+        db.session.flush()
+        db.session.rollback()
+        assert _active_count(alice) == 0
+
+def test_rebuild_corrects_drift(app):
+    """Test a drifted counter is recomputed from the requests table."""
+    with app.app_context():
+        alice = _volunteer()
+        db.session.add(HelpRequest(volunteer_id=alice, status='in_progress'))
+        db.session.commit()
+        db.session.execute(Volunteer.__table__.update().values(active_request_count=7))
+        db.session.commit()
+        assert rebuild_active_request_counts() == 1
+        assert _active_count(alice) == 1
+
+def _seed_assigned(count):
+    volunteer = Volunteer(name='Alice', email='alice@workload.com')
+    db.session.add(volunteer)
+    db.session.flush()
+    requests = [HelpRequest(volunteer_id=volunteer.id, status='in_progress') for _ in range(count)]
+    db.session.add_all(requests)
+    db.session.commit()
+    return volunteer.id, [r.id for r in requests]
+
+def test_concurrent_status_changes_keep_count_exact(concurrent_app, run_in_parallel):
+    """Test parallel completions of one volunteer's requests, and of the same request, count once each."""
+    with concurrent_app.app_context():
+        volunteer_id, request_ids = _seed_assigned(20)
+    
+    calls = [('put', f'/api/seniorsmartassist/request/{request_id}/status', {'status': 'completed'})
+             for request_id in request_ids[1:]]
+    calls += [('put', f'/api/seniorsmartassist/request/{request_ids[0]}/status', {'status': 'completed'})] * 8
+    results = run_in_parallel(calls)
+    
+    assert all(status == 200 for status, _ in results)
+    with concurrent_app.app_context():
+        assert _active_count(volunteer_id) == 0
@@ -1,2 +1,2 @@
 #!/bin/bash
-python run.py
+python migrate_db.py && exec gunicorn -c gunicorn.conf.py wsgi:app
@@ -0,0 +1,17 @@
+"""
+SeniorSmartAssist WSGI entry point for production servers
+
+Usage (from the backend directory):
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+import sys
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, backend_dir)
+
+from src.main.app import create_app
+
+# Socket.IO is served by the same app: Flask-SocketIO wraps app.wsgi_app
+app, socketio = create_app()
@@ -169,7 +169,13 @@ const RequestList: React.FC<RequestListProps> = ({ isVolunteerView = false, curr
       const volunteerIdForDistance = (isVolunteerView && !showMyRequests && currentVolunteerId) 
         ? currentVolunteerId 
         : undefined;
-      const reqRes = await getRequests(volunteerIdForDistance);
+      // Let the server drop rows this view never shows
+      const filters = !isVolunteerView
+        ? {}
+        : showMyRequests
+          ? { status: 'assigned,in_progress,completed', assigned_volunteer_id: currentVolunteerId }
+          : { status: 'pending', max_distance: maxDistance };
+      const reqRes = await getRequests(volunteerIdForDistance, filters);
       let filteredRequests = reqRes.data;
       
       // For volunteer view
@@ -287,7 +293,13 @@ const RequestList: React.FC<RequestListProps> = ({ isVolunteerView = false, curr
       setTimeout(() => setSuccess(''), 3000);
     } catch (err: any) {
       console.error('Error accepting request:', err);
-      setError(err.response?.data?.error || err.message || 'Failed to accept request. Please try again.');
+      if (err.response?.status === 409) {
+        // Another volunteer accepted it first; refresh so it leaves the list
+        setError('This request was just accepted by another volunteer.');
+        await loadData();
+      } else {
+        setError(err.response?.data?.error || err.message || 'Failed to accept request. Please try again.');
+      }
       setTimeout(() => setError(''), 5000);
     }
   };
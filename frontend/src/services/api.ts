@@ -146,10 +146,18 @@ export const getElders = () => API.get<Elder[]>('/elders');
 export const getVolunteers = () => API.get<Volunteer[]>('/volunteers');
 
 // Help Requests
-export const getRequests = (volunteerId?: number) => {
-  const url = volunteerId ? `/requests?volunteer_id=${volunteerId}` : '/requests';
-  return API.get<HelpRequest[]>(url);
-};
+export interface RequestFilters {
+  status?: string;  // Comma-separated statuses
+  request_type?: string;
+  elder_id?: number;
+  assigned_volunteer_id?: number;
+  max_distance?: number;
+}
+
+export const getRequests = (volunteerId?: number, filters: RequestFilters = {}) =>
+  API.get<HelpRequest[]>('/requests', {
+    params: { ...filters, volunteer_id: volunteerId }
+  });
 export const classifyRequest = (description: string) => 
   API.post<{ request_type: string; description: string }>('/classify-request', { description });
 